@@ -0,0 +1,245 @@
+"""API HTTP local (JSON) del motor de calculo CEN-2004, sin Streamlit.
+
+Uso (desde la raiz del repositorio):
+
+    python api.py                          # escucha en 127.0.0.1:8502
+    python api.py --puerto 9000 --procesos-pdf 4
+
+Endpoints (POST con cuerpo JSON, salvo /health). Los que reciben un calibre aceptan ademas "conductores"
+("CEN" | "Cu" | "Al", por defecto la tabla historica CEN) y "aislamiento" ("THHN" | "XHHW" | "USE"):
+
+    GET  /health         estado del servicio
+    POST /ampacity       {carga_va, voltaje, sistema, calibre, num_conductores, temperatura}
+    POST /voltage-drop   {carga_va, voltaje, distancia, k_factor, fp, calibre}
+    POST /conduit        {n_hilos, calibre | area_uni, material, tubo}
+    POST /short-circuit  {calibre, t_despeje, icc_a}
+    POST /batch          {"circuitos": [{columnas del Cuadro de Cargas}, ...]} o {"circuitos": {columna: [valores]}}
+    POST /report         {columnas del Cuadro de Cargas para un circuito, "tubo" opcional} -> application/pdf
+
+Solo usa la biblioteca estandar para el servidor; numpy/pandas se importan en un hilo al arrancar (el
+servidor ya acepta conexiones mientras tanto) y fpdf solo en los procesos que generan PDF.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import json
+import os
+import signal
+import sys
+
+MAX_CUERPO = int(os.environ.get("CEN_API_MAX_CUERPO", str(64 * 1024 * 1024)))
+MENSAJES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+@functools.lru_cache(maxsize=None)
+def motor():
+    # Importacion diferida del motor de calculo (numpy, pandas, catalogo)
+    import calculos
+    return calculos
+
+
+def _json_default(valor):
+    # numpy/pandas -> tipos nativos de JSON
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    if hasattr(valor, "item"):
+        return valor.item()
+    raise TypeError(f"No serializable: {type(valor).__name__}")
+
+
+def _campos(datos, *nombres):
+    faltantes = [n for n in nombres if n not in datos]
+    if faltantes:
+        raise ErrorHTTP(400, f"Faltan campos: {', '.join(faltantes)}")
+    return [datos[n] for n in nombres]
+
+
+def _conductores(datos):
+    # Tabla de conductores opcional de la peticion (ValueError -> 400 si no se reconoce)
+    return motor().tabla_conductores(datos.get("conductores", "CEN"), datos.get("aislamiento", "THHN"))
+
+
+# =========================================================
+# ENDPOINTS (funciones puras: dict de entrada -> dict de salida)
+# =========================================================
+def ampacidad(datos):
+    carga_va, voltaje, sistema, *resto = _campos(datos, "carga_va", "voltaje", "sistema", "calibre", "num_conductores", "temperatura")
+    return motor().calculo_ampacidad(carga_va, voltaje, motor().etiqueta_sistema(sistema), *resto, _conductores(datos))
+
+
+def caida(datos):
+    return motor().calculo_caida(*_campos(datos, "carga_va", "voltaje", "distancia", "k_factor", "fp", "calibre"), _conductores(datos))
+
+
+def canalizacion(datos):
+    area_uni = datos["area_uni"] if "area_uni" in datos else motor().datos_calibre(_campos(datos, "calibre")[0], _conductores(datos))["area"]
+    return motor().calculo_canalizacion(_campos(datos, "n_hilos")[0], area_uni, *_campos(datos, "material", "tubo"))
+
+
+def cortocircuito(datos):
+    return motor().calculo_cortocircuito(*_campos(datos, "calibre", "t_despeje", "icc_a"), _conductores(datos))
+
+
+def lote(datos):
+    import pandas as pd
+
+    circuitos = _campos(datos, "circuitos")[0]
+    resultado = motor().evaluar_cuadro(pd.DataFrame(circuitos), _conductores(datos))
+    # tolist() por columna: mucho mas rapido que DataFrame.to_dict, que convierte celda por celda
+    columnas = {c: resultado[c].tolist() for c in resultado}
+    # NaN (p. ej. breaker_a sin interruptor disponible) no es JSON valido: se envia null
+    for c in resultado.columns[resultado.isna().any()]:
+        columnas[c] = [None if v != v else v for v in columnas[c]]
+    if not isinstance(circuitos, dict):
+        columnas = [dict(zip(columnas, fila)) for fila in zip(*columnas.values())]
+    return {"n": len(resultado), "resultados": columnas}
+
+
+def pdf_circuito(datos):
+    # Corre en un proceso del pool: fpdf se importa alli, no en el servidor
+    from reporte import argumentos_circuito, memoria_pdf
+
+    circuito = {**motor().COLUMNAS_CUADRO, **datos}
+    return memoria_pdf(*argumentos_circuito(circuito, datos.get("tubo"), _conductores(datos)))
+
+
+RUTAS = {
+    "/ampacity": ampacidad,
+    "/voltage-drop": caida,
+    "/conduit": canalizacion,
+    "/short-circuit": cortocircuito,
+}
+
+
+# =========================================================
+# SERVIDOR HTTP/1.1 (asyncio, conexiones persistentes)
+# =========================================================
+class Servidor:
+    def __init__(self, procesos_pdf=None):
+        self.procesos_pdf = procesos_pdf
+        self._pool_pdf = None
+
+    @property
+    def pool_pdf(self):
+        if self._pool_pdf is None:
+            self._pool_pdf = concurrent.futures.ProcessPoolExecutor(max_workers=self.procesos_pdf)
+        return self._pool_pdf
+
+    async def despachar(self, metodo, ruta, cuerpo):
+        # Devuelve (estado, tipo de contenido, bytes)
+        if ruta == "/health":
+            return 200, "application/json", b'{"estado": "ok"}'
+        if ruta not in RUTAS and ruta not in ("/batch", "/report"):
+            raise ErrorHTTP(404, f"Ruta desconocida: {ruta}")
+        if metodo != "POST":
+            raise ErrorHTTP(405, "Use POST")
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except json.JSONDecodeError as e:
+            raise ErrorHTTP(400, f"JSON invalido: {e}")
+        if not isinstance(datos, dict):
+            raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON")
+
+        loop = asyncio.get_running_loop()
+        if ruta == "/report":
+            return 200, "application/pdf", await loop.run_in_executor(self.pool_pdf, pdf_circuito, datos)
+        # El calculo corre en un hilo: ni la importacion del motor ni un lote grande bloquean las demas
+        # conexiones (NumPy libera el GIL en las operaciones por columna)
+        resultado = await loop.run_in_executor(None, lote if ruta == "/batch" else RUTAS[ruta], datos)
+        return 200, "application/json", json.dumps(resultado, default=_json_default).encode("utf-8")
+
+    async def atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    break
+                cabeceras = {}
+                while (cab := await lector.readline()) not in (b"\r\n", b"\n", b""):
+                    nombre, _, valor = cab.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                mantener = cabeceras.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                leido = False # sin leer el cuerpo no se sabe donde empieza la peticion siguiente: se cierra
+                try:
+                    largo = cabeceras.get("content-length", "0")
+                    if not (largo.isascii() and largo.isdigit()):
+                        raise ErrorHTTP(400, f"Content-Length invalido: {largo!r}")
+                    largo = int(largo)
+                    if largo > MAX_CUERPO:
+                        raise ErrorHTTP(413, f"Cuerpo mayor a {MAX_CUERPO} bytes")
+                    cuerpo = await lector.readexactly(largo) if largo else b""
+                    leido = True
+                    estado, tipo, respuesta = await self.despachar(metodo, ruta.split("?")[0], cuerpo)
+                except ErrorHTTP as e:
+                    estado, tipo, respuesta = e.estado, "application/json", json.dumps({"error": str(e)}).encode("utf-8")
+                    mantener = mantener and leido
+                except KeyError as e:
+                    estado, tipo, respuesta = 400, "application/json", json.dumps({"error": f"Valor no reconocido: {e}"}).encode("utf-8")
+                except (ValueError, TypeError) as e:
+                    estado, tipo, respuesta = 400, "application/json", json.dumps({"error": str(e)}).encode("utf-8")
+                except Exception as e:
+                    estado, tipo, respuesta = 500, "application/json", json.dumps({"error": repr(e)}).encode("utf-8")
+
+                escritor.write(
+                    f"HTTP/1.1 {estado} {MENSAJES[estado]}\r\nContent-Type: {tipo}\r\nContent-Length: {len(respuesta)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1") + respuesta
+                )
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host, puerto, listo=None):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        # SIGTERM cancela la tarea igual que Ctrl+C (SIGINT): el finally cierra el pool de PDF y sus procesos
+        # no quedan huerfanos (en Windows no hay add_signal_handler)
+        loop = asyncio.get_running_loop()
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        # Precarga del motor en un hilo: la primera peticion de calculo no paga la importacion de numpy/pandas
+        loop.run_in_executor(None, motor)
+        if listo:
+            listo(servidor)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if self._pool_pdf is not None:
+                self._pool_pdf.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP local CEN-2004")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8502)
+    parser.add_argument("--procesos-pdf", type=int, default=2, help="Procesos para generar PDF")
+    args = parser.parse_args(argv)
+
+    def listo(servidor):
+        print(f"API CEN-2004 en http://{args.host}:{servidor.sockets[0].getsockname()[1]}", file=sys.stderr)
+
+    try:
+        asyncio.run(Servidor(args.procesos_pdf).servir(args.host, args.puerto, listo))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,19 @@
-import streamlit as st
+import functools
+import time
+
 import numpy as np
-from fpdf import FPDF
-import base64
-import datetime
+import pandas as pd
+import streamlit as st
+
+from calculos import (
+    db_cables, db_temp_factors, lista_tuberias, lista_calibres, lista_materiales, dimensionar, lista_aislamientos, lista_tablas_conductores, tabla_conductores,
+    calculo_corriente, calculo_ampacidad, calculo_caida, calculo_canalizacion, calculo_cortocircuito,
+)
+from coordinacion import lista_interruptores, tiempo_despeje as tiempo_despeje_interruptor
+from reporte import memoria_pdf
+import metricas
+
+inicio_corrida = time.perf_counter()
 
 # --- 1. CONFIGURACIÓN DE PÁGINA Y ESTILOS ---
 st.set_page_config(page_title="CEN-2004: Protocolo de Dimensionamiento Electrico", layout="wide", page_icon="⚡")
@@ -27,51 +38,69 @@ st.title("⚡ CEN-2004: Protocolo de Dimensionamiento Electrico")
 st.caption("Herramienta de Dimensionamiento conforme al Codigo Electrico Nacional (CEN-2004)")
 
 # --- 2. BASES DE DATOS DE INGENIERÍA ---
-# Se usan ampacidades de 75°C (Limite Terminal) y 90°C (Base para Correcion)
-db_cables = {
-    "14 AWG":      {"area": 2.08,  "diam": 2.80, "R": 10.17, "X": 0.190, "amp_75": 25, "amp_90": 30, "kcmil": 4.107},
-    "12 AWG":      {"area": 3.31,  "diam": 3.86, "R": 6.56,  "X": 0.177, "amp_75": 30, "amp_90": 35, "kcmil": 6.530},
-    "10 AWG":      {"area": 5.26,  "diam": 4.10, "R": 3.94,  "X": 0.164, "amp_75": 40, "amp_90": 50, "kcmil": 10.380},
-    "8 AWG":       {"area": 8.37,  "diam": 5.50, "R": 2.56,  "X": 0.171, "amp_75": 55, "amp_90": 70, "kcmil": 16.510},
-    "6 AWG":       {"area": 13.3,  "diam": 6.80, "R": 1.61,  "X": 0.167, "amp_75": 75, "amp_90": 95, "kcmil": 26.240},
-    "4 AWG":       {"area": 21.2,  "diam": 8.40, "R": 1.02,  "X": 0.157, "amp_75": 95, "amp_90": 120, "kcmil": 41.740},
-    "2 AWG":       {"area": 33.6,  "diam": 10.5, "R": 0.62,  "X": 0.148, "amp_75": 130, "amp_90": 170, "kcmil": 66.360},
-    "1/0 AWG":     {"area": 53.5,  "diam": 13.0, "R": 0.39,  "X": 0.144, "amp_75": 150, "amp_90": 210, "kcmil": 105.5},
-    "2/0 AWG":     {"area": 67.4,  "diam": 14.4, "R": 0.31,  "X": 0.141, "amp_75": 175, "amp_90": 240, "kcmil": 133.1},
-    "4/0 AWG":     {"area": 107.2, "diam": 17.8, "R": 0.219, "X": 0.135, "amp_75": 230, "amp_90": 320, "kcmil": 211.6},
-}
-
-db_breakers = [15, 20, 25, 30, 40, 50, 60, 70, 100, 125, 150, 175, 200, 225, 250]
-
-db_temp_factors = {
-    "21-25 C (1.04)": 1.04, "26-30 C (Base 1.00)": 1.00, "31-35 C (0.96)": 0.96,
-    "36-40 C (0.91)": 0.91, "41-45 C (0.87)": 0.87, "46-50 C (0.82)": 0.82,
+# Las tablas (db_cables, db_breakers, db_temp_factors, db_tuberias_full) viven en calculos.py
+# para que el modo Cuadro de Cargas y cualquier proceso por lotes las compartan.
+
+
+
+# --- GRAFO DE DEPENDENCIAS ---
+# Cada modulo es un fragmento que se re-ejecuta solo cuando cambian sus propios widgets.
+# Un cambio en la configuracion comun (c_va, v_ser, sist) re-ejecuta toda la app, y los
+# modulos cuyas entradas no cambiaron salen de la cache (memoizados por hash de entradas).
+CONFIG_COMUN = ("c_va", "v_ser", "sist")
+DEPENDENCIAS = {
+    "ampacidad":      CONFIG_COMUN + ("c_sel", "n_cond", "temp_factor_key"),
+    "caida":          CONFIG_COMUN + ("dist", "k_mode_final", "fp_v", "v_cal"),
+    "canalizaciones": ("mat_sel", "t_cal", "n_hilos_canal", "override_area", "custom_area_uni", "tubo_verif"),
+    "cortocircuito":  ("cc_cal_final", "i_cap_int", "cc_proteccion", "t_despeje"),
+    # Bloque fuera de los fragmentos: consume entradas de varios modulos
+    "dimensionamiento": CONFIG_COMUN + ("n_cond", "temp_factor_key", "dist", "k_mode_final", "fp_v",
+                                        "mat_sel", "n_hilos_canal", "i_cap_int", "cc_proteccion", "t_despeje"),
 }
-
-# Base de datos de tuberías ampliada hasta 6"
-db_tuberias_full = {
-    "1/2\"": {"PVC40": 184, "EMT": 196, "ARG": 192}, "3/4\"": {"PVC40": 327, "EMT": 353, "ARG": 346},
-    "1\"":   {"PVC40": 568, "EMT": 595, "ARG": 583}, "1 1/4\"": {"PVC40": 986, "EMT": 1026, "ARG": 1005},
-    "1 1/2\"": {"PVC40": 1338, "EMT": 1391, "ARG": 1362}, "2\"":   {"PVC40": 2186, "EMT": 2275, "ARG": 2228},
-    "2 1/2\"": {"PVC40": 3315, "EMT": 3447, "ARG": 3377}, "3\"":   {"PVC40": 4656, "EMT": 4837, "ARG": 4738},
-    "3 1/2\"": {"PVC40": 6397, "EMT": 6625, "ARG": 6492}, "4\"":   {"PVC40": 8392, "EMT": 8708, "ARG": 8530},
-    "5\"":   {"PVC40": 12850, "EMT": 13320, "ARG": 13050}, "6\"":   {"PVC40": 17940, "EMT": 18600, "ARG": 18210},
-}
-lista_tuberias = list(db_tuberias_full.keys())
+MODULOS = ("ampacidad", "caida", "canalizaciones", "cortocircuito")
+
+# Calculos memoizados por el hash de sus entradas (cache compartida entre sesiones)
+calc_ampacidad = st.cache_data(max_entries=512, show_spinner=False)(calculo_ampacidad)
+calc_caida = st.cache_data(max_entries=512, show_spinner=False)(calculo_caida)
+calc_canalizacion = st.cache_data(max_entries=512, show_spinner=False)(calculo_canalizacion)
+calc_cortocircuito = st.cache_data(max_entries=512, show_spinner=False)(calculo_cortocircuito)
+
+# Resultados de cada modulo (los fragmentos actualizan este mismo dict en sus re-ejecuciones parciales)
+resultados = st.session_state.setdefault("resultados", {})
+st.session_state._corrida_completa = True
+
+
+def propagar_cambios(modulo):
+    # Si en una re-ejecucion parcial del fragmento cambio una entrada que otro bloque consume,
+    # se re-ejecuta la app completa para que ese bloque no quede desactualizado.
+    claves = [k for k in DEPENDENCIAS[modulo] if k not in CONFIG_COMUN
+              and any(k in deps for otro, deps in DEPENDENCIAS.items() if otro != modulo)]
+    actual = tuple(st.session_state.get(k) for k in claves)
+    previo = st.session_state.get(f"_entradas_{modulo}")
+    st.session_state[f"_entradas_{modulo}"] = actual
+    if not st.session_state._corrida_completa:
+        st.session_state._widget_fragmento = metricas.refrescar_previos(st.session_state, DEPENDENCIAS[modulo])
+        if previo is not None and actual != previo:
+            st.rerun(scope="app")
+
+
+def cronometrar_modulo(modulo):
+    # Tiempo del modulo. En una re-ejecucion parcial solo corre el fragmento, asi que ese tiempo es tambien
+    # el de la re-ejecucion: se registra en rerun_total_s con el widget que la disparo (el final del script,
+    # donde se registran las corridas completas, no se alcanza).
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter()
+            with metricas.medir(f"modulo_{modulo}_s"):
+                funcion(*args, **kwargs)
+            if metricas.ACTIVO and not st.session_state._corrida_completa:
+                metricas.registrar("rerun_total_s", time.perf_counter() - inicio, alcance="fragmento",
+                                   widget=st.session_state.get("_widget_fragmento", "ninguno"))
+        return envoltura
+    return decorador
 
 
-# Inicialización de variables (solo para scope inicial)
-carga_va, voltaje, sistema, calibre_sel, num_conductores, amp_real, i_diseno = 1260.0, 120, "Monofásico (1F)", "12 AWG", 3, 22.0, 13.12
-percent_drop = 1.83
-v_drop = 2.2
-tubo_sel, porcentaje, limite = "3/4\"", 40.0, 40
-tubo_recomendado = "1\""
-area_kcmil_min = 6.53 
-calibre_min_cc = "12 AWG"
-K_FINAL = 5.0 
-i_cc_max_permitida = 0.0
-fc_agrup = 1.0 # Variable inicializada para scope del PDF
-
 # --- INTERFAZ DE ENTRADA (Módulo de Configuración Común) ---
 st.header("1. Configuracion del Sistema")
 col_cfg1, col_cfg2, col_cfg3 = st.columns(3)
@@ -91,7 +120,9 @@ col3, col4 = st.columns(2)
 # =========================================================
 # MÓDULO 1: AMPACIDAD (col1)
 # =========================================================
-with col1:
+@st.fragment
+@cronometrar_modulo("ampacidad")
+def modulo_ampacidad(carga_va, voltaje, sistema):
     st.markdown('<div class="module-box">', unsafe_allow_html=True)
     st.markdown('<p class="header-style">1. Capacidad y Proteccion (CEN 310.15)</p>', unsafe_allow_html=True)
     
@@ -109,52 +140,24 @@ with col1:
         index=3, 
         key="temp_factor_key"
     )
+    propagar_cambios("ampacidad")
     
-    # CÁLCULOS RIGUROSOS
-    fc_temp = db_temp_factors[temp_factor_key]
-    
-    # Determinar el denominador correcto para I_carga
-    if "Monofásico" in sistema:
-        denom = voltaje 
-    else: # Trifásico
-        denom = voltaje * 1.732 
-        
-    corriente_carga = carga_va / denom
-    
-    # CÁLCULO DEL FACTOR DE AGRUPAMIENTO (FA)
-    fc_agrup = 1.0
-    if 4 <= num_conductores <= 6: fc_agrup = 0.8
-    elif 7 <= num_conductores <= 9: fc_agrup = 0.7
-    elif 10 <= num_conductores <= 20: fc_agrup = 0.5
-    elif num_conductores > 20: fc_agrup = 0.45 
-    
-    # Ampacidad Base usada para corrección (columna 90°C)
-    amp_base_90 = db_cables[calibre_sel]["amp_90"]
-    # Ampacidad Máxima Permitida por terminales (columna 75°C)
-    amp_max_75 = db_cables[calibre_sel]["amp_75"]
-    
-    # AMPACIDAD CORREGIDA (Cálculo a partir de 90°C)
-    amp_corregida = amp_base_90 * fc_temp * fc_agrup
-    
-    # AMPACIDAD REAL LIMITADA por la temperatura del terminal (CEN 110.14(C))
-    amp_real = min(amp_corregida, amp_max_75)
-    
-    # Corriente de Diseño (125% de la carga)
-    i_diseno = corriente_carga * 1.25
-    
-    # SELECCIÓN DEL INTERRUPTOR: Regla de redondeo CEN 240.4(B)
-    breaker_ideal = next((b for b in db_breakers if b >= i_diseno), 20)
+    # CÁLCULOS RIGUROSOS (ver calculos.calculo_ampacidad)
+    r = calc_ampacidad(carga_va, voltaje, sistema, calibre_sel, num_conductores, temp_factor_key)
+    resultados["ampacidad"] = {**r, "calibre_sel": calibre_sel, "num_conductores": num_conductores, "temp_factor_key": temp_factor_key}
     
     # Mostrar Resultados Ampacidad
     st.markdown("---")
     res_a1, res_a2 = st.columns(2)
-    res_a1.metric("Corriente Diseno (Ireq)", f"{i_diseno:.2f} A")
-    res_a2.metric("Ampacidad Limite (75°C)", f"{amp_max_75:.2f} A")
+    res_a1.metric("Corriente Diseno (Ireq)", f"{r['i_diseno']:.2f} A")
+    res_a2.metric("Ampacidad Limite (75°C)", f"{r['amp_max_75']:.2f} A")
     
-    st.metric("Ampacidad Corregida (Final)", f"{amp_real:.2f} A", f"FC Agrupamiento: {fc_agrup:.2f}")
+    st.metric("Ampacidad Corregida (Final)", f"{r['amp_real']:.2f} A", f"FC Agrupamiento: {r['fc_agrup']:.2f}")
 
-    if amp_real >= i_diseno:
-        st.markdown(f'<div class="success-box-final">✅ CUMPLE: Cable es apto. (Proteccion sugerida: {breaker_ideal}A)</div>', unsafe_allow_html=True)
+    if r["breaker_ideal"] is None:
+        st.markdown('<div class="fail-box-final">❌ FALLA: Ningun interruptor de la tabla protege la corriente de diseño.</div>', unsafe_allow_html=True)
+    elif r["amp_real"] >= r["i_diseno"]:
+        st.markdown(f'<div class="success-box-final">✅ CUMPLE: Cable es apto. (Proteccion sugerida: {r["breaker_ideal"]}A)</div>', unsafe_allow_html=True)
     else:
         st.markdown('<div class="fail-box-final">❌ FALLA: El calibre es insuficiente.</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
@@ -162,7 +165,9 @@ with col1:
 # =========================================================
 # MÓDULO 2: CAÍDA DE TENSIÓN (col2)
 # =========================================================
-with col2:
+@st.fragment
+@cronometrar_modulo("caida")
+def modulo_caida(carga_va, voltaje, sistema):
     st.markdown('<div class="module-box">', unsafe_allow_html=True)
     st.markdown('<p class="header-style">2. Caida de Tension</p>', unsafe_allow_html=True)
     
@@ -170,13 +175,11 @@ with col2:
     with col2a:
         distancia = st.number_input("Longitud (metros)", value=20.0, key="dist")
     with col2b:
-        corriente_calc = st.number_input("Corriente (A)", value=corriente_carga, key="i_calc") 
+        corriente_calc = st.number_input("Corriente (A)", value=calculo_corriente(carga_va, voltaje, sistema), key="i_calc") 
     
     st.caption("Factor K de su Metodologia de Calculo (Debe ser Coherente con Módulo 1)")
     
     # COHERENCIA CRÍTICA: K se establece automáticamente según la selección del sistema.
-    K_FINAL_DEFAULT = 5.0 if "Monofásico" in sistema else 10.0
-    
     k_mode_key = st.selectbox("Sistema de Fases y Factor K", 
                               ["Monofasico (K=5.0)", "Trifasico (K=10.0)"], 
                               index=0 if "Monofásico" in sistema else 1,
@@ -187,33 +190,19 @@ with col2:
     
     fp_v = st.slider("Factor Potencia", 0.8, 1.0, 0.90, key="fp_v")
     calibre_v = st.selectbox("Calibre para calculo", list(db_cables.keys()), index=1, key="v_cal")
+    propagar_cambios("caida")
     
-    # CÁLCULOS (Fórmula de componentes de impedancia)
-    datos = db_cables[calibre_v]
-    R, X = datos["R"], datos["X"]
-    theta = np.arccos(fp_v)
-    L_km = distancia / 1000.0
-    
-    # Ze = R*cosθ + X*sinθ
-    impedancia = (R * fp_v) + (X * np.sin(theta))
-    
-    # Aplicación de su formula: (kVA*L*Ze) / (K * kV²)
-    kVA_calc = carga_va / 1000.0
-    kV_calc = voltaje / 1000.0
-    
-    # Formula para obtener la Caída de Tensión PORCENTUAL directamente
-    percent_drop = (kVA_calc * L_km * impedancia) / (K_FINAL * kV_calc**2) * 100 
-    
-    # Caída de Tensión en Voltios
-    v_drop = (percent_drop / 100.0) * voltaje
+    # CÁLCULOS (ver calculos.calculo_caida)
+    r = calc_caida(carga_va, voltaje, distancia, K_FINAL, fp_v, calibre_v)
+    resultados["caida"] = {**r, "distancia": distancia, "K_FINAL": K_FINAL, "fp_v": fp_v, "calibre_v": calibre_v}
     
     st.markdown("---")
     st.subheader("📊 Resultados")
     res_v1, res_v2 = st.columns(2)
     res_v1.metric("Factor K Utilizado", f"{K_FINAL:.1f}")
-    res_v2.metric("% Caida de Tension", f"{percent_drop:.2f} %")
+    res_v2.metric("% Caida de Tension", f"{r['percent_drop']:.2f} %")
     
-    if percent_drop <= 3.0:
+    if r["percent_drop"] <= 3.0:
          st.markdown('<div class="success-box-final">✅ CUMPLE: Caida inferior al 3% (Recomendación CEN 210.19).</div>', unsafe_allow_html=True)
     else:
          st.markdown('<div class="fail-box-final">❌ NO CUMPLE: Caida excesiva.</div>', unsafe_allow_html=True)
@@ -222,7 +211,9 @@ with col2:
 # =========================================================
 # MÓDULO 3: CANALIZACIONES (col3)
 # =========================================================
-with col3:
+@st.fragment
+@cronometrar_modulo("canalizaciones")
+def modulo_canalizaciones():
     st.markdown('<div class="module-box">', unsafe_allow_html=True)
     st.markdown('<p class="header-style">3. Canalizaciones (CEN Cap. 9)</p>', unsafe_allow_html=True)
     
@@ -248,49 +239,35 @@ with col3:
         area_uni = area_default
     
     st.caption(f"Area Unitaria Usada: **{area_uni:.2f} mm²**")
+    tubo_a_verificar = st.session_state.get("tubo_verif", lista_tuberias[1])
+    propagar_cambios("canalizaciones")
 
-    # CÁLCULOS
-    area_ocup = n_hilos_canal * area_uni
-    
-    # FIX CONCEPTUAL: Se ajusta el límite de llenado según el número de hilos (CEN Cap. 9 Tabla 1)
-    if n_hilos_canal == 1:
-        limite = 53
-    elif n_hilos_canal == 2:
-        limite = 31
-    else:
-        limite = 40 # Para más de dos conductores
-        
-    area_necesaria_100 = area_ocup * 100 / limite
-    tubo_recomendado = "No disponible"
-    
-    for size, areas in db_tuberias_full.items():
-        area_disponible = areas[material_sel]
-        if area_disponible >= area_necesaria_100:
-            tubo_recomendado = size
-            break
+    # CÁLCULOS (ver calculos.calculo_canalizacion)
+    r = calc_canalizacion(n_hilos_canal, area_uni, material_sel, tubo_a_verificar)
             
     # Módulo de Verificación
     st.markdown("---")
-    st.markdown(f'<div class="recommendation-box">✅ Diametro Minimo Requerido ({material_sel}): <b>{tubo_recomendado}</b></div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="recommendation-box">✅ Diametro Minimo Requerido ({material_sel}): <b>{r["tubo_recomendado"]}</b></div>', unsafe_allow_html=True)
     
     tubo_a_verificar = st.selectbox("Verificar Diametro", lista_tuberias, index=1, key="tubo_verif")
-    
-    area_tubo_verif = db_tuberias_full[tubo_a_verificar][material_sel]
-    porc_verif = (area_ocup / area_tubo_verif) * 100
+    resultados["canalizaciones"] = {
+        **r, "material_sel": material_sel, "calibre_t": calibre_t, "n_hilos_canal": n_hilos_canal,
+        "area_uni": area_uni, "tubo_sel": tubo_a_verificar,
+    }
+    porc_verif, limite = r["porc_verif"], r["limite"]
     
     if porc_verif <= limite:
         st.markdown(f'<div class="success-box-final">✅ Ocupacion {porc_verif:.2f}% (Max {limite}% - CEN Cap. 9).</div>', unsafe_allow_html=True)
     else:
         st.markdown(f'<div class="fail-box-final">❌ SATURADO: Ocupacion {porc_verif:.2f}% (Max {limite}%).</div>', unsafe_allow_html=True)
-        
-    tubo_sel = tubo_a_verificar
-    porcentaje = porc_verif
     st.markdown('</div>', unsafe_allow_html=True)
 
 # =========================================================
 # MÓDULO 4: CORTOCIRCUITO (col4)
 # =========================================================
-with col4:
+@st.fragment
+@cronometrar_modulo("cortocircuito")
+def modulo_cortocircuito():
     st.markdown('<div class="module-box">', unsafe_allow_html=True)
     st.markdown('<p class="header-style">4. Cortocircuito (Calculo Automatico Termico IEEE 242)</p>', unsafe_allow_html=True)
     
@@ -299,18 +276,19 @@ with col4:
     
     st.caption("Parametros de Falla")
     i_cap_interrupcion = st.number_input("Capacidad de Interrupcion del Tablero (kA)", value=10.0, step=0.5, key="i_cap_int") * 1000 # Convertir a Amps
-    tiempo_despeje = st.number_input("Tiempo de Despeje (t, segundos)", value=0.5, key="t_despeje")
-
-    
-    K_CONST = 105.0 # Constante para Cobre
-    area_real_kcmil = db_cables[calibre_cc]['kcmil']
-    
-    # CÁLCULO AUTOMÁTICO DE Icc MÁXIMA PERMITIDA
-    # Icc = (K * Area kcmil) / sqrt(t)
-    if area_real_kcmil > 0 and tiempo_despeje > 0:
-        i_cc_max_permitida = (K_CONST * area_real_kcmil) / np.sqrt(tiempo_despeje)
+    # El tiempo de despeje se indica a mano o sale de la curva del interruptor a la corriente de falla
+    proteccion = st.selectbox("Interruptor (Curva Tiempo-Corriente)", ["Manual"] + [f"{i} A" for i in lista_interruptores], key="cc_proteccion")
+    if proteccion == "Manual":
+        tiempo_despeje = st.number_input("Tiempo de Despeje (t, segundos)", value=0.5, key="t_despeje")
     else:
-        i_cc_max_permitida = 0.0
+        tiempo_despeje = float(tiempo_despeje_interruptor(float(proteccion.split()[0]), i_cap_interrupcion))
+        st.caption(f"Tiempo de despeje del interruptor {proteccion} a {i_cap_interrupcion/1000:.1f} kA (curva maxima): {tiempo_despeje:.3f} s")
+    propagar_cambios("cortocircuito")
+
+    # CÁLCULO AUTOMÁTICO DE Icc MÁXIMA PERMITIDA (ver calculos.calculo_cortocircuito)
+    r = calc_cortocircuito(calibre_cc, tiempo_despeje, i_cap_interrupcion)
+    resultados["cortocircuito"] = {**r, "calibre_cc": calibre_cc, "i_cap_interrupcion": i_cap_interrupcion, "tiempo_despeje": tiempo_despeje}
+    i_cc_max_permitida = r["i_cc_max_permitida"]
 
     st.markdown("---")
     st.subheader("📊 Resultados de la Capacidad")
@@ -324,126 +302,108 @@ with col4:
         st.markdown('<div class="fail-box-final">❌ FALLA TERMICA: El cable podria fundirse ante la falla maxima del tablero.</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+
+with col1:
+    modulo_ampacidad(carga_va, voltaje, sistema)
+with col2:
+    modulo_caida(carga_va, voltaje, sistema)
+with col3:
+    modulo_canalizaciones()
+with col4:
+    modulo_cortocircuito()
+
 # =========================================================
-# 5. GENERADOR PDF (Reporte Simplificado)
+# DIMENSIONAMIENTO AUTOMÁTICO (Calibre Minimo que cumple los 3 criterios)
 # =========================================================
-def create_pdf(carga, vol, sist, cal_amp, temp_key, area_uni_mm2, amp, i_dis, v_dp, v_pct, tub, porc_tub, tubo_rec, i_cc_max_cond, i_cc_tablero, k_factor_utilizado, cal_v, R_v, X_v, fp_v, I_carga, amp_base_val_90, i_breaker_val, num_cond_portadores, calibre_t, distancia_metros, tiempo_despeje_seg, material_seleccionado, fc_agrup_val, amp_max_75_val, limite_ocupacion):
-    
-    class PDF(FPDF):
-        def header(self):
-            self.set_font('Arial', 'B', 14)
-            self.cell(0, 10, 'PROTOCOLO DE DIMENSIONAMIENTO ELECTRICO (CEN-2004)', 0, 1, 'C') 
-            self.ln(5)
-            self.set_font('Arial', 'I', 10)
-            if 'current_date' in st.session_state:
-                self.cell(0, 5, f"Fecha de Generacion: {st.session_state.current_date}", 0, 1, 'R')
-            self.ln(2)
-
-    if 'current_date' not in st.session_state:
-         st.session_state.current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    pdf = FPDF(unit='mm')
-    pdf.add_page()
-    pdf.set_font("Arial", size=10)
-    
-    
-    # ----------------------------------------------------
-    # SECCION DE PARAMETROS DE ENTRADA
-    # ----------------------------------------------------
-    pdf.set_fill_color(220, 220, 220)
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 7, "1. PARAMETROS DE ENTRADA", 1, 1, 'L', 1)
-    pdf.set_font("Arial", size=10)
-    
-    pdf.cell(0, 5, f"Carga (VA): {carga:.2f} | Voltaje (V): {vol:.1f} | Sistema: {sist}", ln=True)
-    pdf.cell(0, 5, f"Calibre Analizado: {cal_amp} | Longitud (m): {distancia_metros:.1f} | Factor K: {k_factor_utilizado:.1f}", ln=True)
-    pdf.cell(0, 5, f"Temp. Ambiente: {temp_key} | Cond. Activos: {num_cond_portadores:.0f}", ln=True)
-    pdf.cell(0, 5, f"Cap. Interrupcion Tablero (kA): {i_cc_tablero/1000:.1f} | T. Despeje (s): {tiempo_despeje_seg:.2f}", ln=True)
-    pdf.ln(5)
-
-    # ----------------------------------------------------
-    # RESUMEN DE RESULTADOS (PRINCIPAL)
-    # ----------------------------------------------------
-    pdf.set_fill_color(220, 220, 220)
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 7, "2. RESUMEN DE RESULTADOS Y VERIFICACIONES", 1, 1, 'L', 1)
-    pdf.set_font("Arial", size=10)
-    
-    res_amp = "CUMPLE" if amp >= i_dis else "FALLA"
-    res_v = "CUMPLE (<3%)" if v_pct <= 3 else "FALLA (>3%)"
-    res_t = "CUMPLE (<40%)" if porc_tub <= limite_ocupacion else "FALLA (>40%)"
-    res_cc = "CUMPLE" if i_cc_max_cond >= i_cc_tablero else "FALLA"
-
-    # Resultados Ampacidad
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 5, "2.1. AMPACIDAD Y PROTECCION (CEN 310.15)", 0, 1, 'L')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 5, f"I_Diseno (125%): {i_dis:.2f} A | Ampacidad Base (90C): {amp_base_val_90:.2f} A", ln=True)
-    pdf.cell(0, 5, f"FC Temp: {db_temp_factors[temp_key]:.2f} | FC Agrupamiento: {fc_agrup_val:.2f}", ln=True)
-    pdf.cell(0, 5, f"I_Max_Terminal (75C): {amp_max_75_val:.2f} A | I_Corregida (Final): {amp:.2f} A", ln=True)
-    pdf.cell(0, 5, f"Proteccion Sugerida: {i_breaker_val:.1f} A | Estado: {res_amp}", ln=True)
-    pdf.ln(2)
-
-    # Resultados Caída de Tensión
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 5, "2.2. CAIDA DE TENSION (CEN 210.19)", 0, 1, 'L')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 5, f"Caida de Tension: {v_dp:.2f} V ({v_pct:.2f}%)", ln=True)
-    pdf.cell(0, 5, f"Estado: {res_v}", ln=True)
-    pdf.ln(2)
-
-    # Resultados Canalizaciones
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 5, "2.3. CANALIZACIONES (CEN Cap. 9)", 0, 1, 'L')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 5, f"Tuberia Verificada: {tub} ({material_seleccionado}) | Ocupacion: {porc_tub:.2f}% (Max {limite_ocupacion}%)", ln=True)
-    pdf.cell(0, 5, f"Diametro Minimo Requerido: {tubo_rec}", ln=True)
-    pdf.cell(0, 5, f"Estado: {res_t}", ln=True)
-    pdf.ln(2)
-    
-    # Resultados Cortocircuito
-    pdf.set_font("Arial", 'B', 10)
-    pdf.cell(0, 5, "2.4. CORTOCIRCUITO (IEEE 242)", 0, 1, 'L')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(0, 5, f"Icc Max. Soportada por {cal_amp}: {i_cc_max_cond/1000:.2f} kA", ln=True)
-    pdf.cell(0, 5, f"Icc del Tablero (Ref.): {i_cc_tablero/1000:.1f} kA", ln=True)
-    pdf.cell(0, 5, f"Estado: {res_cc}", ln=True)
+st.markdown("---")
+st.markdown('<p class="header-style">Dimensionamiento Automatico (Ampacidad 75°C + Caida 3% + IEEE 242)</p>', unsafe_allow_html=True)
+
+dt1, dt2 = st.columns(2)
+material_cond = dt1.selectbox("Tabla de Conductores", lista_tablas_conductores, key="auto_tabla",
+                              format_func=lambda m: "CEN (Cu, tabla historica)" if m == "CEN" else f"Catalogo {m}")
+aislamiento = dt2.selectbox("Aislamiento", lista_aislamientos, key="auto_ais", disabled=material_cond == "CEN")
+conductores = tabla_conductores(material_cond, aislamiento)
+calibres_auto = conductores["calibres"]
+sin_calibre = len(calibres_auto)
+
+amp_r, caida_r, canal_r, cc_r = (resultados[m] for m in MODULOS)
+auto = dimensionar(
+    carga_va, voltaje, "Trifásico" in sistema, caida_r["distancia"], caida_r["fp_v"], caida_r["K_FINAL"], amp_r["fc_temp"],
+    amp_r["num_conductores"], canal_r["n_hilos_canal"], lista_materiales.index(canal_r["material_sel"]),
+    cc_r["tiempo_despeje"], cc_r["i_cap_interrupcion"], conductores,
+)
+idx_auto = int(auto["idx_calibre"])
+if idx_auto < sin_calibre:
+    calibre_auto = calibres_auto[idx_auto]
+    tubo_auto = (lista_tuberias + ["No disponible"])[int(auto["idx_tubo"])]
+    ad1, ad2, ad3, ad4 = st.columns(4)
+    ad1.metric("Calibre Minimo", calibre_auto)
+    ad2.metric("Por Ampacidad / Caida / Termico",
+               " / ".join(calibres_auto[min(int(auto[k]), sin_calibre - 1)] for k in ("idx_ampacidad", "idx_caida", "idx_termico")))
+    ad3.metric("Proteccion", f"{int(auto['breaker'])} A")
+    ad4.metric(f"Tuberia ({canal_r['material_sel']}, {canal_r['n_hilos_canal']} hilos)", tubo_auto)
+else:
+    st.markdown('<div class="fail-box-final">❌ Ningun calibre de la tabla cumple simultaneamente los tres criterios.</div>', unsafe_allow_html=True)
+
+# =========================================================
+# 5. GENERADOR PDF (Reporte Simplificado, ver reporte.py)
+# =========================================================
+def argumentos_pdf(resultados):
+    # Los ~30 argumentos de create_pdf a partir de los resultados vigentes de cada modulo
+    amp_r, caida_r, canal_r, cc_r = (resultados[m] for m in MODULOS)
+    calibre_sel, calibre_v = amp_r["calibre_sel"], caida_r["calibre_v"]
+    return (
+        resultados["config"]["carga_va"], resultados["config"]["voltaje"], resultados["config"]["sistema"],
+        calibre_sel, amp_r["temp_factor_key"], canal_r["area_uni"],
+        amp_r["amp_real"], amp_r["i_diseno"],
+        caida_r["v_drop"], caida_r["percent_drop"], canal_r["tubo_sel"], canal_r["porc_verif"], canal_r["tubo_recomendado"],
+        cc_r["i_cc_max_permitida"], cc_r["i_cap_interrupcion"], caida_r["K_FINAL"],
+        calibre_v, caida_r["R"], caida_r["X"], caida_r["fp_v"], amp_r["corriente_carga"], amp_r["amp_base_90"], amp_r["breaker_ideal"],
+        amp_r["num_conductores"], calibre_sel,
+        # Argumentos finales pasados a la función PDF
+        caida_r["distancia"], cc_r["tiempo_despeje"], canal_r["material_sel"],
+        amp_r["fc_agrup"], amp_r["amp_max_75"], canal_r["limite"],
+    )
 
-    return pdf.output(dest='S')
 
 # --- BARRA LATERAL (DESCARGA) ---
 st.sidebar.markdown("---")
 st.sidebar.header("📄 Reportes")
 
-if 'amp_real' in locals():
-    # Variables a pasar al PDF
-    I_carga = corriente_carga
-    amp_base_val_90 = amp_base_90
-    i_breaker_val = breaker_ideal
-    
-    # Valores de los widgets obtenidos de st.session_state (la forma más segura)
-    distancia_val = st.session_state.get('dist', 20.0) 
-    tiempo_despeje_val = st.session_state.get('t_despeje', 0.5)
-    material_sel_val = st.session_state.get('mat_sel', 'PVC40')
-    
-    # Usar el valor actual del estado
-    area_uni_final = locals().get('area_uni', db_cables[calibre_sel]["area"])
-    K_FINAL_REPORT = locals().get('K_FINAL', 5.0) 
-    
-    # Nuevos valores de Ampacidad para el PDF
-    fc_agrup_val = locals().get('fc_agrup', 1.0)
-    amp_max_75_val = locals().get('amp_max_75', 0.0)
-    limite_ocupacion = locals().get('limite', 40)
-    
-    pdf_bytes = create_pdf(
-        carga_va, voltaje, sistema, calibre_sel, temp_factor_key, area_uni_final,
-        amp_real, i_diseno, 
-        v_drop, percent_drop, tubo_sel, porcentaje, tubo_recomendado, 
-        i_cc_max_permitida, i_cap_interrupcion, K_FINAL_REPORT,
-        calibre_v, db_cables[calibre_v]["R"], db_cables[calibre_v]["X"], fp_v, I_carga, amp_base_val_90, i_breaker_val, 
-        num_conductores, calibre_sel, 
-        # Argumentos finales pasados a la función PDF
-        distancia_val, tiempo_despeje_val, material_sel_val,
-        fc_agrup_val, amp_max_75_val, limite_ocupacion
-    )
-    st.sidebar.download_button("📥 Descargar Memoria PDF", pdf_bytes, "protocolo_dimensionamiento_cen.pdf", "application/pdf")
+resultados["config"] = {"carga_va": carga_va, "voltaje": voltaje, "sistema": sistema}
+# El PDF solo se genera al pulsar el boton (data diferida), con los resultados vigentes en ese momento,
+# y queda memoizado por sus argumentos en reporte.memoria_pdf.
+st.sidebar.download_button(
+    "📥 Descargar Memoria PDF", lambda: memoria_pdf(*argumentos_pdf(resultados)),
+    "protocolo_dimensionamiento_cen.pdf", "application/pdf",
+)
+
+# =========================================================
+# MÉTRICAS DE RENDIMIENTO (opt-in: CEN_METRICAS=1; panel con ?admin=<CEN_METRICAS_TOKEN>)
+# =========================================================
+if metricas.ACTIVO:
+    claves_widgets = sorted({k for deps in DEPENDENCIAS.values() for k in deps})
+    metricas.registrar("rerun_total_s", time.perf_counter() - inicio_corrida, alcance="app",
+                       widget=metricas.cambio_detectado(st.session_state, claves_widgets))
+
+    if metricas.admin_autorizado(st.query_params.get("admin")):
+        st.sidebar.markdown("---")
+        st.sidebar.header("⏱️ Metricas (Admin)")
+        resumen = metricas.resumen()
+        if resumen:
+            tabla = pd.DataFrame(resumen)
+            tabla["etiquetas"] = tabla["etiquetas"].map(lambda e: ", ".join(f"{k}={v}" for k, v in e.items()))
+            st.sidebar.dataframe(tabla.round(4), hide_index=True)
+
+            series = metricas.series()
+            nombres = sorted({f"{n} {dict(e)}" if e else n for n, e in series})
+            elegida = st.sidebar.selectbox("Histograma", nombres, key="metricas_hist")
+            valores = next(v for (n, e), v in series.items() if (f"{n} {dict(e)}" if e else n) == elegida)
+            cuentas, bordes = np.histogram(valores, bins=min(20, max(1, len(valores))))
+            st.sidebar.bar_chart(pd.DataFrame({"muestras": cuentas}, index=[f"{b:.4g}" for b in bordes[:-1]]))
+
+        st.sidebar.download_button("📥 Exportar (Prometheus)", metricas.exportar_prometheus(), "metricas_cen.prom", "text/plain")
+        if st.sidebar.button(f"💾 Escribir JSONL ({metricas.ARCHIVO_JSONL})", key="metricas_jsonl"):
+            st.sidebar.caption(f"{metricas.exportar_jsonl()} muestras escritas.")
+
+st.session_state._corrida_completa = False
@@ -0,0 +1,43 @@
+import numpy as np
+
+from calculos import CONDUCTORES_CEN, LIMITE_CAIDA, db_temp_factors
+
+# =========================================================
+# BARRIDOS PARAMETRICOS (grillas por broadcasting)
+# =========================================================
+# Ejes de las grillas; el eje de calibres es el orden de la tabla de conductores (por defecto la historica)
+LONGITUDES_M = np.arange(5.0, 505.0, 5.0)
+FACTORES_POTENCIA = np.round(np.arange(0.80, 1.0001, 0.01), 2)
+FACTORES_TEMPERATURA = np.array(list(db_temp_factors.values()))
+FACTORES_AGRUPAMIENTO = np.array([1.0, 0.8, 0.7, 0.5, 0.45])
+
+CARGA_REFERENCIA_VA = 1000.0 # Las grillas de caida se calculan por kVA; la carga real solo escala
+
+
+def impedancia_efectiva(fps=FACTORES_POTENCIA, conductores=None):
+    # Ze[calibre, fp] = R*cosθ + X*sinθ
+    tabla = conductores or CONDUCTORES_CEN
+    fps = np.asarray(fps, dtype=float)
+    return tabla["R"][:, None] * fps[None, :] + tabla["X"][:, None] * np.sin(np.arccos(fps))[None, :]
+
+
+def grilla_caida(voltajes, k_factor, longitudes=LONGITUDES_M, fps=FACTORES_POTENCIA, conductores=None):
+    # % caida [voltaje, calibre, longitud, fp] por cada kVA de carga (formula del Modulo 2)
+    kV = np.atleast_1d(np.asarray(voltajes, dtype=float)) / 1000.0
+    L_km = np.asarray(longitudes, dtype=float) / 1000.0
+    ze = impedancia_efectiva(fps, conductores)
+    return (CARGA_REFERENCIA_VA / 1000.0) * L_km[None, None, :, None] * ze[None, :, None, :] / (k_factor * kV[:, None, None, None]**2) * 100
+
+
+def longitud_maxima(voltajes, k_factor, carga_va, fps=FACTORES_POTENCIA, limite=LIMITE_CAIDA, conductores=None):
+    # Longitud (m) [voltaje, calibre, fp] a la que la caida alcanza el limite: despeje de L en la formula
+    kV = np.atleast_1d(np.asarray(voltajes, dtype=float)) / 1000.0
+    ze = impedancia_efectiva(fps, conductores)
+    return limite * k_factor * kV[:, None, None]**2 / ((carga_va / 1000.0) * ze[None, :, :] * 100) * 1000.0
+
+
+def grilla_ampacidad(fc_temp=FACTORES_TEMPERATURA, fc_agrup=FACTORES_AGRUPAMIENTO, conductores=None):
+    # Ampacidad real [calibre, FC temperatura, FC agrupamiento] = min(amp_90 * FCt * FCa, amp_75)
+    tabla = conductores or CONDUCTORES_CEN
+    corregida = tabla["amp_90"][:, None, None] * np.asarray(fc_temp)[None, :, None] * np.asarray(fc_agrup)[None, None, :]
+    return np.minimum(corregida, tabla["amp_75"][:, None, None])
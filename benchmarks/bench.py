@@ -0,0 +1,211 @@
+"""Benchmarks de los kernels de calculo, la re-ejecucion completa de app.py y la generacion del PDF.
+
+Uso (desde la raiz del repositorio):
+
+    python -m benchmarks.bench                         # corre todo y escribe benchmarks/resultados.json
+    python -m benchmarks.bench --rapido                # omite 1M circuitos y reduce repeticiones
+    python -m benchmarks.bench --base otra_corrida.json --tolerancia 0.25
+
+Sale con codigo 1 si alguna medicion supera su umbral (benchmarks/umbrales.json) o si es mas lenta
+que la corrida base en mas de la tolerancia indicada.
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from calculos import (
+    AREA_MM2, calculo_ampacidad, calculo_caida, calculo_canalizacion, calculo_cortocircuito, caida_tension,
+    corriente_carga, db_temp_factors, evaluar_cuadro, lista_calibres, lista_materiales, lista_sistemas, lista_tuberias,
+    ocupacion_canalizacion, verificacion_termica, verificar_ampacidad,
+)
+from reporte import create_pdf
+
+RAIZ = pathlib.Path(__file__).resolve().parent.parent
+UMBRALES = pathlib.Path(__file__).resolve().parent / "umbrales.json"
+SALIDA = pathlib.Path(__file__).resolve().parent / "resultados.json"
+
+TAMANOS = [1, 1_000, 100_000, 1_000_000]
+MAX_ESCALAR = 100_000 # El bucle por circuito por encima de este tamaño solo mide el tiempo del bucle de Python
+
+
+def circuitos_aleatorios(n, semilla=0):
+    # Cuadro de cargas reproducible con la misma distribucion de entradas para todas las corridas
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        "circuito": [f"C-{i}" for i in range(n)],
+        "carga_va": rng.uniform(100.0, 30000.0, n),
+        "voltaje": rng.choice([120.0, 208.0, 480.0], n),
+        "sistema": rng.choice(lista_sistemas, n),
+        "longitud_m": rng.uniform(1.0, 100.0, n),
+        "calibre": rng.choice(lista_calibres, n),
+        "n_conductores": rng.integers(2, 25, n),
+        "temperatura": rng.choice(list(db_temp_factors), n),
+        "fp": rng.uniform(0.8, 1.0, n),
+        "material": rng.choice(lista_materiales, n),
+        "n_hilos": rng.integers(1, 30, n),
+        "t_despeje": rng.uniform(0.01, 1.0, n),
+        "icc_tablero_ka": rng.uniform(1.0, 25.0, n),
+    })
+
+
+def medir(funcion, repeticiones):
+    # Mediana y minimo de varias ejecuciones (s)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"mediana_s": statistics.median(tiempos), "min_s": min(tiempos), "repeticiones": repeticiones}
+
+
+# =========================================================
+# KERNELS: por circuito (funciones del dashboard) y por lotes (NumPy)
+# =========================================================
+def bench_escalar(cuadro):
+    filas = cuadro.to_dict("records")
+    def correr():
+        for c in filas:
+            calculo_ampacidad(c["carga_va"], c["voltaje"], c["sistema"], c["calibre"], c["n_conductores"], c["temperatura"])
+            calculo_caida(c["carga_va"], c["voltaje"], c["longitud_m"], 5.0 if "Monofásico" in c["sistema"] else 10.0, c["fp"], c["calibre"])
+            calculo_canalizacion(c["n_hilos"], AREA_MM2[lista_calibres.index(c["calibre"])], c["material"], lista_tuberias[-1])
+            calculo_cortocircuito(c["calibre"], c["t_despeje"], c["icc_tablero_ka"] * 1000)
+    return correr
+
+
+def bench_lote(cuadro):
+    # Mismas cuatro verificaciones sobre columnas ya convertidas a arreglos
+    idx_cal = pd.Index(lista_calibres).get_indexer(cuadro["calibre"])
+    idx_mat = pd.Index(lista_materiales).get_indexer(cuadro["material"])
+    carga, voltaje = cuadro["carga_va"].to_numpy(), cuadro["voltaje"].to_numpy()
+    trifasico = cuadro["sistema"].to_numpy() == lista_sistemas[1]
+    fc_temp = cuadro["temperatura"].map(db_temp_factors).to_numpy()
+    n_cond, n_hilos = cuadro["n_conductores"].to_numpy(), cuadro["n_hilos"].to_numpy()
+    longitud, fp, t = cuadro["longitud_m"].to_numpy(), cuadro["fp"].to_numpy(), cuadro["t_despeje"].to_numpy()
+    icc = cuadro["icc_tablero_ka"].to_numpy() * 1000
+    k = np.where(trifasico, 10.0, 5.0)
+    return {
+        "ampacidad": lambda: verificar_ampacidad(corriente_carga(carga, voltaje, trifasico), idx_cal, fc_temp, n_cond),
+        "caida": lambda: caida_tension(carga, voltaje, longitud, idx_cal, fp, k),
+        "canalizacion": lambda: ocupacion_canalizacion(n_hilos, AREA_MM2[idx_cal], idx_mat),
+        "cortocircuito": lambda: verificacion_termica(idx_cal, t, icc),
+        "cuadro_completo": lambda: evaluar_cuadro(cuadro),
+    }
+
+
+def bench_kernels(tamanos, repeticiones):
+    resultados = {}
+    for n in tamanos:
+        cuadro = circuitos_aleatorios(n)
+        reps = max(1, repeticiones if n <= 100_000 else repeticiones // 3)
+        if n <= MAX_ESCALAR:
+            resultados[f"escalar/4_verificaciones/{n}"] = medir(bench_escalar(cuadro), 1 if n >= 100_000 else reps)
+        for nombre, funcion in bench_lote(cuadro).items():
+            resultados[f"lote/{nombre}/{n}"] = medir(funcion, reps)
+    return resultados
+
+
+# =========================================================
+# APP COMPLETA (Streamlit AppTest, sin navegador)
+# =========================================================
+def bench_app(repeticiones):
+    from streamlit.testing.v1 import AppTest
+
+    resultados = {}
+    at = AppTest.from_file(str(RAIZ / "app.py"), default_timeout=60)
+    resultados["app/primera_ejecucion"] = medir(at.run, 1)
+    resultados["app/reejecucion"] = medir(at.run, repeticiones)
+
+    valores = iter(np.linspace(10.0, 100.0, repeticiones))
+    resultados["app/cambio_widget_dist"] = medir(lambda: at.number_input(key="dist").set_value(float(next(valores))).run(), repeticiones)
+    if at.exception:
+        raise RuntimeError(f"app.py lanzo una excepcion durante el benchmark: {at.exception[0].value}")
+    return resultados
+
+
+# =========================================================
+# PDF (latencia, memoria pico y tamaño)
+# =========================================================
+ARGS_PDF = (
+    1260.0, 120, "Monofásico (1F)", "12 AWG", "36-40 C (0.91)", 3.31, 30.0, 13.125, 1.25, 1.04, "3/4\"", 40.5, "1\"",
+    968.9, 10000.0, 5.0, "12 AWG", 6.56, 0.177, 0.9, 10.5, 35, 15, 3, "12 AWG", 20.0, 0.5, "PVC40", 1.0, 30, 40,
+)
+
+
+def bench_pdf(repeticiones):
+    resultados = {"pdf/create_pdf": medir(lambda: create_pdf(*ARGS_PDF), repeticiones)}
+    tracemalloc.start()
+    pdf = create_pdf(*ARGS_PDF)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados["pdf/create_pdf"].update({"memoria_pico_kb": pico / 1024, "tamano_kb": len(pdf) / 1024})
+    return resultados
+
+
+# =========================================================
+# COMPARACIÓN CONTRA UMBRALES Y CONTRA UNA CORRIDA BASE
+# =========================================================
+def verificar(resultados, umbrales, base=None, tolerancia=0.25):
+    fallas = []
+    for nombre, r in resultados.items():
+        limite = umbrales.get(nombre)
+        if limite is not None and r["mediana_s"] > limite:
+            fallas.append(f"{nombre}: {r['mediana_s']:.4f} s > umbral {limite:.4f} s")
+        previo = (base or {}).get(nombre)
+        if previo and r["mediana_s"] > previo["mediana_s"] * (1 + tolerancia):
+            fallas.append(f"{nombre}: {r['mediana_s']:.4f} s vs base {previo['mediana_s']:.4f} s (+{r['mediana_s'] / previo['mediana_s'] - 1:.0%})")
+    return fallas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks CEN-2004")
+    parser.add_argument("--salida", type=pathlib.Path, default=SALIDA, help="Archivo JSON de resultados")
+    parser.add_argument("--umbrales", type=pathlib.Path, default=UMBRALES, help="JSON {medicion: mediana maxima en s}")
+    parser.add_argument("--base", type=pathlib.Path, help="Resultados de una corrida anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Regresion maxima admitida frente a --base (0.25 = 25%%)")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--rapido", action="store_true", help="Omite 1M circuitos y usa 3 repeticiones")
+    parser.add_argument("--solo", choices=["kernels", "app", "pdf"], action="append", help="Limita las secciones a correr")
+    args = parser.parse_args(argv)
+
+    repeticiones = 3 if args.rapido else args.repeticiones
+    secciones = args.solo or ["kernels", "app", "pdf"]
+    resultados = {}
+    if "kernels" in secciones:
+        resultados.update(bench_kernels(TAMANOS[:-1] if args.rapido else TAMANOS, repeticiones))
+    if "app" in secciones:
+        resultados.update(bench_app(repeticiones))
+    if "pdf" in secciones:
+        resultados.update(bench_pdf(repeticiones * 10))
+
+    informe = {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    args.salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for nombre, r in resultados.items():
+        print(f"{nombre:45s} {r['mediana_s'] * 1000:12.3f} ms")
+
+    umbrales = json.loads(args.umbrales.read_text(encoding="utf-8")) if args.umbrales.exists() else {}
+    base = json.loads(args.base.read_text(encoding="utf-8"))["resultados"] if args.base else None
+    fallas = verificar(resultados, umbrales, base, args.tolerancia)
+    for f in fallas:
+        print(f"REGRESION {f}", file=sys.stderr)
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Prueba de carga local de api.py (clientes concurrentes con conexiones persistentes).
+
+Uso (desde la raiz del repositorio):
+
+    python -m benchmarks.carga_api                                  # levanta la API en un puerto libre
+    python -m benchmarks.carga_api --url 127.0.0.1:8502 --clientes 64 --peticiones 500
+    python -m benchmarks.carga_api --ruta /batch --lote 10000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+CUERPOS = {
+    "/ampacity": {"carga_va": 1260.0, "voltaje": 120.0, "sistema": "Monofásico (1F)", "calibre": "12 AWG", "num_conductores": 3, "temperatura": "36-40 C (0.91)"},
+    "/voltage-drop": {"carga_va": 1260.0, "voltaje": 120.0, "distancia": 20.0, "k_factor": 5.0, "fp": 0.9, "calibre": "12 AWG"},
+    "/conduit": {"n_hilos": 4, "calibre": "12 AWG", "material": "PVC40", "tubo": "3/4\""},
+    "/short-circuit": {"calibre": "12 AWG", "t_despeje": 0.5, "icc_a": 10000.0},
+    "/report": {"circuito": "C-1"},
+}
+
+
+def cuerpo_lote(n):
+    from benchmarks.bench import circuitos_aleatorios
+
+    return {"circuitos": circuitos_aleatorios(n).to_dict(orient="list")}
+
+
+async def cliente(host, puerto, ruta, cuerpo, peticiones, latencias):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    peticion = (f"POST {ruta} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(cuerpo)}\r\n\r\n").encode("latin-1") + cuerpo
+    errores = 0
+    for _ in range(peticiones):
+        inicio = time.perf_counter()
+        escritor.write(peticion)
+        await escritor.drain()
+        estado = int((await lector.readline()).split()[1])
+        largo = 0
+        while (cab := await lector.readline()) not in (b"\r\n", b""):
+            if cab.lower().startswith(b"content-length:"):
+                largo = int(cab.split(b":")[1])
+        await lector.readexactly(largo)
+        latencias.append(time.perf_counter() - inicio)
+        errores += estado != 200
+    escritor.close()
+    return errores
+
+
+async def carga(host, puerto, ruta, cuerpo, clientes, peticiones):
+    latencias = []
+    inicio = time.perf_counter()
+    errores = await asyncio.gather(*(cliente(host, puerto, ruta, cuerpo, peticiones, latencias) for _ in range(clientes)))
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    percentil = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))] * 1000
+    return {
+        "ruta": ruta, "peticiones": len(latencias), "errores": sum(errores), "segundos": total,
+        "peticiones_s": len(latencias) / total, "p50_ms": percentil(0.50), "p95_ms": percentil(0.95), "p99_ms": percentil(0.99),
+        "media_ms": statistics.fmean(latencias) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API CEN-2004")
+    parser.add_argument("--url", help="host:puerto de una API ya levantada (por defecto se levanta una)")
+    parser.add_argument("--ruta", default="/ampacity", choices=list(CUERPOS) + ["/batch"])
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--peticiones", type=int, default=200, help="Peticiones por cliente")
+    parser.add_argument("--lote", type=int, default=1000, help="Circuitos por peticion en /batch")
+    args = parser.parse_args(argv)
+
+    proceso = None
+    if args.url:
+        host, puerto = args.url.rsplit(":", 1)
+    else:
+        proceso = subprocess.Popen([sys.executable, "api.py", "--puerto", "0"], stderr=subprocess.PIPE, text=True)
+        host, puerto = proceso.stderr.readline().strip().rsplit("//", 1)[1].rsplit(":", 1)
+    try:
+        cuerpo = json.dumps(cuerpo_lote(args.lote) if args.ruta == "/batch" else CUERPOS[args.ruta]).encode("utf-8")
+        informe = asyncio.run(carga(host, int(puerto), args.ruta, cuerpo, args.clientes, args.peticiones))
+    finally:
+        if proceso:
+            # SIGTERM: la API cierra su pool de PDF antes de salir (sin procesos huerfanos sobre stdout)
+            proceso.terminate()
+            try:
+                proceso.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+                proceso.wait()
+    for clave, valor in informe.items():
+        print(f"{clave:14s} {valor:.3f}" if isinstance(valor, float) else f"{clave:14s} {valor}")
+    return 1 if informe["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
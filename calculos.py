@@ -0,0 +1,454 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+import catalogo
+
+# =========================================================
+# BASES DE DATOS DE INGENIERÍA (catalogo: datos/*.csv, cargado una vez por proceso)
+# =========================================================
+# Se usan ampacidades de 75°C (Limite Terminal) y 90°C (Base para Correcion)
+_cables = catalogo.tabla("conductores_cen")
+db_cables = {
+    str(f["calibre"]): {"area": float(f["area"]), "diam": float(f["diam"]), "R": float(f["R"]), "X": float(f["X"]),
+                        "amp_75": int(f["amp_75"]), "amp_90": int(f["amp_90"]), "kcmil": float(f["kcmil"])}
+    for f in _cables
+}
+
+# Corrientes nominales del catalogo de interruptores (las mismas con curva en coordinacion.py), hasta 1200 A
+db_breakers = catalogo.columna("interruptores", "in_a").astype(int).tolist()
+
+db_temp_factors = dict(zip(catalogo.etiquetas("factores_temperatura", "rango"), catalogo.columna("factores_temperatura", "factor_90").tolist()))
+
+lista_sistemas = ["Monofásico (1F)", "Trifásico (3F)"]
+lista_materiales = ["PVC40", "EMT", "ARG"]
+
+# Base de datos de tuberías ampliada hasta 6"
+lista_tuberias = catalogo.etiquetas("tuberias", "tubo")
+db_tuberias_full = {t: {m: int(catalogo.columna("tuberias", m)[i]) for m in lista_materiales} for i, t in enumerate(lista_tuberias)}
+
+K_CONST = 105.0 # Constante para Cobre (IEEE 242)
+K_CONST_AL = 69.0 # Constante para Aluminio (IEEE 242)
+LIMITE_CAIDA = 3.0 # % maximo recomendado (CEN 210.19)
+
+# --- VISTAS COLUMNARES DE LAS TABLAS (para cálculo vectorizado) ---
+lista_calibres = list(db_cables.keys())
+AREA_MM2 = np.asarray(_cables["area"], dtype=float)
+R_OHM_KM = np.asarray(_cables["R"], dtype=float)
+X_OHM_KM = np.asarray(_cables["X"], dtype=float)
+AMP_75 = np.asarray(_cables["amp_75"], dtype=float)
+AMP_90 = np.asarray(_cables["amp_90"], dtype=float)
+KCMIL = np.asarray(_cables["kcmil"], dtype=float)
+
+BREAKERS = np.array(db_breakers, dtype=float)
+
+# --- TABLAS DE CONDUCTORES SELECCIONABLES ---
+# Los kernels reciben una tabla opcional (conductores=None => tabla historica de la calculadora, Cu hasta
+# 4/0 AWG). tabla_conductores("Cu"/"Al", aislamiento) arma la misma estructura desde el catalogo completo
+# (datos/conductores.csv, hasta 2000 kcmil), con el area del conductor aislado para el llenado de tuberia.
+lista_tablas_conductores = ["CEN", "Cu", "Al"]
+lista_aislamientos = ["THHN", "XHHW", "USE"]
+CONDUCTORES_CEN = {
+    "calibres": lista_calibres, "area": AREA_MM2, "R": R_OHM_KM, "X": X_OHM_KM,
+    "amp_75": AMP_75, "amp_90": AMP_90, "kcmil": KCMIL, "k_termico": K_CONST,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def tabla_conductores(material="CEN", aislamiento="THHN"):
+    if material == "CEN":
+        return CONDUCTORES_CEN
+    if material not in lista_tablas_conductores or aislamiento not in lista_aislamientos:
+        raise ValueError(f"Tabla de conductores no reconocida: {material} {aislamiento}")
+    filas = catalogo.consultar("conductores", material=material)
+    # THHN no se fabrica sobre 1000 kcmil: esos calibres quedan fuera de la tabla
+    filas = filas[filas[f"area_{aislamiento.lower()}_mm2"].notna()]
+    return {
+        "calibres": filas["calibre"].tolist(),
+        "area": filas[f"area_{aislamiento.lower()}_mm2"].to_numpy(float),
+        "R": filas["r_ohm_km"].to_numpy(float), "X": filas["x_ohm_km"].to_numpy(float),
+        "amp_75": filas["amp_75"].to_numpy(float), "amp_90": filas["amp_90"].to_numpy(float),
+        "kcmil": filas["kcmil"].to_numpy(float), "k_termico": K_CONST if material == "Cu" else K_CONST_AL,
+    }
+
+
+def datos_calibre(calibre, conductores=None):
+    # Fila de un calibre (como db_cables[calibre]) en la tabla indicada; KeyError si la tabla no lo tiene
+    if conductores is None or conductores is CONDUCTORES_CEN:
+        return db_cables[calibre]
+    if calibre not in conductores["calibres"]:
+        raise KeyError(calibre)
+    i = conductores["calibres"].index(calibre)
+    return {c: float(conductores[c][i]) for c in ("area", "R", "X", "amp_75", "amp_90", "kcmil")}
+
+# Filas = material (orden de lista_materiales), columnas = diametro (orden de lista_tuberias)
+AREA_TUBERIAS = np.array([catalogo.columna("tuberias", m) for m in lista_materiales], dtype=float)
+
+
+# =========================================================
+# KERNELS VECTORIZADOS (un elemento por circuito)
+# =========================================================
+def es_trifasico(sistema):
+    # Acepta las etiquetas del dashboard ("Trifásico (3F)") y las abreviadas ("3F")
+    return pd.Series(sistema, dtype="string").str.contains("3F|Trif", case=False, regex=True).fillna(False).to_numpy(bool)
+
+
+def etiqueta_sistema(sistema):
+    # Etiqueta del dashboard para un sistema escalar: calculo_ampacidad busca "Monofásico" en el texto,
+    # asi "1F"/"3F" se interpretan igual que en los calculos vectorizados
+    return lista_sistemas[1] if es_trifasico([sistema])[0] else lista_sistemas[0]
+
+
+def corriente_carga(carga_va, voltaje, trifasico):
+    voltaje = np.asarray(voltaje, dtype=float)
+    denom = np.where(trifasico, voltaje * 1.732, voltaje)
+    return np.asarray(carga_va, dtype=float) / denom
+
+
+def factor_agrupamiento(num_conductores):
+    n = np.asarray(num_conductores)
+    return np.select([n <= 3, n <= 6, n <= 9, n <= 20], [1.0, 0.8, 0.7, 0.5], default=0.45)
+
+
+def seleccionar_breaker(i_diseno):
+    # Regla de redondeo CEN 240.4(B): primer interruptor >= I diseño (NaN si ninguno de la tabla alcanza)
+    idx = np.searchsorted(BREAKERS, i_diseno, side="left")
+    return np.where(idx < len(BREAKERS), BREAKERS[np.minimum(idx, len(BREAKERS) - 1)], np.nan)
+
+
+def verificar_ampacidad(i_carga, idx_calibre, fc_temp, num_conductores, conductores=None):
+    tabla = conductores or CONDUCTORES_CEN
+    fc_agrup = factor_agrupamiento(num_conductores)
+    amp_corregida = tabla["amp_90"][idx_calibre] * fc_temp * fc_agrup
+    amp_real = np.minimum(amp_corregida, tabla["amp_75"][idx_calibre])
+    i_diseno = i_carga * 1.25
+    breaker = seleccionar_breaker(i_diseno)
+    return {
+        "fc_agrup": fc_agrup,
+        "amp_real": amp_real,
+        "i_diseno": i_diseno,
+        "breaker": breaker,
+        # Sin un interruptor de la tabla que proteja el circuito, no cumple aunque el conductor alcance
+        "cumple_ampacidad": (amp_real >= i_diseno) & ~np.isnan(breaker),
+    }
+
+
+def caida_tension(carga_va, voltaje, distancia_m, idx_calibre, fp, k_factor, conductores=None):
+    # Ze = R*cosθ + X*sinθ ; %ΔV = (kVA*L*Ze) / (K * kV²) * 100
+    tabla = conductores or CONDUCTORES_CEN
+    fp = np.asarray(fp, dtype=float)
+    impedancia = tabla["R"][idx_calibre] * fp + tabla["X"][idx_calibre] * np.sin(np.arccos(fp))
+    kV = np.asarray(voltaje, dtype=float) / 1000.0
+    percent_drop = (np.asarray(carga_va, dtype=float) / 1000.0) * (np.asarray(distancia_m, dtype=float) / 1000.0) * impedancia / (k_factor * kV**2) * 100
+    return {
+        "caida_pct": percent_drop,
+        "caida_v": percent_drop / 100.0 * np.asarray(voltaje, dtype=float),
+        "cumple_caida": percent_drop <= LIMITE_CAIDA,
+    }
+
+
+def limite_llenado(n_hilos):
+    # CEN Cap. 9 Tabla 1: 53% (1 hilo), 31% (2 hilos), 40% (mas de dos)
+    n = np.asarray(n_hilos)
+    return np.select([n == 1, n == 2], [53.0, 31.0], default=40.0)
+
+
+def ocupacion_canalizacion(n_hilos, area_uni, idx_material, idx_tubo=None):
+    area_ocup = np.asarray(n_hilos, dtype=float) * area_uni
+    limite = limite_llenado(n_hilos)
+    area_necesaria_100 = area_ocup * 100 / limite
+
+    # Diametro minimo: busqueda binaria sobre la fila (ascendente) del material de cada circuito
+    idx_rec = np.full(area_ocup.shape, len(lista_tuberias))
+    for m in range(len(lista_materiales)):
+        mask = idx_material == m
+        idx_rec[mask] = np.searchsorted(AREA_TUBERIAS[m], area_necesaria_100[mask], side="left")
+
+    res = {"area_ocup": area_ocup, "limite": limite, "idx_tubo_rec": idx_rec}
+    if idx_tubo is None:
+        res["cumple_canalizacion"] = idx_rec < len(lista_tuberias)
+    else:
+        porc = area_ocup / AREA_TUBERIAS[idx_material, idx_tubo] * 100
+        res["ocupacion_pct"] = porc
+        res["cumple_canalizacion"] = porc <= limite
+    return res
+
+
+def tubo_minimo(area_necesaria_100, material):
+    # Diametro minimo (etiqueta) para un solo grupo de conductores
+    idx = np.searchsorted(AREA_TUBERIAS[lista_materiales.index(material)], area_necesaria_100, side="left")
+    return lista_tuberias[idx] if idx < len(lista_tuberias) else "No disponible"
+
+
+def verificacion_termica(idx_calibre, t_despeje, icc_tablero_a, conductores=None):
+    # Icc = (K * Area kcmil) / sqrt(t)
+    tabla = conductores or CONDUCTORES_CEN
+    t = np.asarray(t_despeje, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        i_cc_max = np.where(t > 0, tabla["k_termico"] * tabla["kcmil"][idx_calibre] / np.sqrt(np.where(t > 0, t, 1.0)), 0.0)
+    return {"icc_max_a": i_cc_max, "cumple_cortocircuito": i_cc_max >= icc_tablero_a}
+
+
+# =========================================================
+# DIMENSIONAMIENTO AUTOMÁTICO (calibre minimo + proteccion + tuberia)
+# =========================================================
+# Todas las tablas estan ordenadas de menor a mayor calibre, de modo que cada criterio
+# se resuelve con una busqueda binaria (np.searchsorted) sobre un arreglo ascendente; la
+# caida, cuya impedancia depende del FP de cada circuito, usa una busqueda binaria por fila.
+# "Sin calibre" es el indice len(calibres) de la tabla usada (SIN_CALIBRE con la tabla historica).
+SIN_CALIBRE = len(lista_calibres)
+
+
+def calibre_min_ampacidad(i_diseno, fc_temp, fc_agrup, conductores=None):
+    # amp_real = min(amp_90*FC, amp_75) >= I  <=>  amp_90 >= I/FC  y  amp_75 >= I
+    tabla = conductores or CONDUCTORES_CEN
+    por_90 = np.searchsorted(tabla["amp_90"], i_diseno / (fc_temp * fc_agrup), side="left")
+    por_75 = np.searchsorted(tabla["amp_75"], i_diseno, side="left")
+    return np.maximum(por_90, por_75)
+
+
+def busqueda_por_fila(valor, objetivo, n):
+    # Primer indice j en [0, n) con valor(j, filas) <= objetivo, suponiendo valor descendente en j
+    # (n si ninguno cumple). Busqueda binaria vectorizada: log2(n) pasos sobre todas las filas a la vez.
+    lo = np.zeros(objetivo.shape, dtype=np.intp)
+    hi = np.full(objetivo.shape, n, dtype=np.intp)
+    while (lo < hi).any():
+        activo = lo < hi
+        mid = (lo + hi) // 2
+        cumple = valor(np.minimum(mid, n - 1)) <= objetivo
+        hi = np.where(activo & cumple, mid, hi)
+        lo = np.where(activo & ~cumple, mid + 1, lo)
+    return lo
+
+
+def calibre_min_caida(carga_va, voltaje, distancia_m, fp, k_factor, limite=LIMITE_CAIDA, conductores=None):
+    tabla = conductores or CONDUCTORES_CEN
+    # %ΔV <= limite  <=>  Ze <= limite * K * kV² / (kVA * L_km * 100)
+    kV = np.asarray(voltaje, dtype=float) / 1000.0
+    kva_l = (np.asarray(carga_va, dtype=float) / 1000.0) * (np.asarray(distancia_m, dtype=float) / 1000.0)
+    with np.errstate(divide="ignore"):
+        ze_max = limite * np.asarray(k_factor, dtype=float) * kV**2 / (kva_l * 100)
+    ze_max, fp = np.broadcast_arrays(ze_max, np.asarray(fp, dtype=float))
+
+    # Ze = R*cosθ + X*sinθ depende del FP de cada circuito, asi que la busqueda binaria es por fila
+    sen = np.sin(np.arccos(fp))
+    return busqueda_por_fila(lambda j: tabla["R"][j] * fp + tabla["X"][j] * sen, ze_max, len(tabla["calibres"]))
+
+
+def calibre_min_termico(t_despeje, icc_a, conductores=None):
+    # K * kcmil / sqrt(t) >= Icc  <=>  kcmil >= Icc * sqrt(t) / K
+    tabla = conductores or CONDUCTORES_CEN
+    kcmil_min = np.asarray(icc_a, dtype=float) * np.sqrt(np.maximum(np.asarray(t_despeje, dtype=float), 0.0)) / tabla["k_termico"]
+    return np.searchsorted(tabla["kcmil"], kcmil_min, side="left")
+
+
+def dimensionar(carga_va, voltaje, trifasico, distancia_m, fp, k_factor, fc_temp, num_conductores, n_hilos, idx_material, t_despeje, icc_a,
+                conductores=None):
+    # Calibre minimo que cumple ampacidad (310.15, limite 75°C), caida <= 3% e IEEE 242 a la vez,
+    # con su proteccion y su tuberia. idx_calibre == len(calibres) => ningun calibre de la tabla cumple.
+    tabla = conductores or CONDUCTORES_CEN
+    sin_calibre = len(tabla["calibres"])
+    i_diseno = corriente_carga(carga_va, voltaje, trifasico) * 1.25
+    criterios = {
+        "idx_ampacidad": calibre_min_ampacidad(i_diseno, fc_temp, factor_agrupamiento(num_conductores), tabla),
+        "idx_caida": calibre_min_caida(carga_va, voltaje, distancia_m, fp, k_factor, conductores=tabla),
+        "idx_termico": calibre_min_termico(t_despeje, icc_a, tabla),
+    }
+    breaker = seleccionar_breaker(i_diseno)
+    # Sin proteccion disponible (breaker NaN) el circuito no tiene solucion en las tablas
+    idx = np.where(np.isnan(breaker), sin_calibre, np.maximum.reduce(list(criterios.values())))
+    idx_valido = np.minimum(idx, sin_calibre - 1)
+    canal = ocupacion_canalizacion(n_hilos, tabla["area"][idx_valido], idx_material)
+    encontrado = idx < sin_calibre
+    return {
+        **criterios,
+        "idx_calibre": idx,
+        "i_diseno": i_diseno,
+        "breaker": breaker,
+        "idx_tubo": np.where(encontrado, canal["idx_tubo_rec"], len(lista_tuberias)),
+    }
+
+
+# =========================================================
+# CUADRO DE CARGAS (tabla de circuitos)
+# =========================================================
+# Columnas de entrada y su valor por defecto (mismos defaults que el dashboard)
+COLUMNAS_CUADRO = {
+    "circuito": "",
+    "carga_va": 1260.0,
+    "voltaje": 120.0,
+    "sistema": "Monofásico (1F)",
+    "longitud_m": 20.0,
+    "calibre": "12 AWG",
+    "n_conductores": 3,
+    "temperatura": "36-40 C (0.91)",
+    "fp": 0.90,
+    "material": "PVC40",
+    "n_hilos": 4,
+    "t_despeje": 0.5,
+    "icc_tablero_ka": 10.0,
+}
+
+
+def normalizar_tabla(tabla, columnas):
+    # Completa columnas/celdas faltantes con los valores por defecto y fija los tipos
+    tabla = pd.DataFrame(tabla).reset_index(drop=True)
+    datos = {}
+    for col, defecto in columnas.items():
+        serie = tabla[col] if col in tabla else pd.Series([defecto] * len(tabla), dtype=object)
+        if isinstance(defecto, str):
+            serie = serie.astype(object).where(serie.notna() & (serie.astype(str) != ""), defecto).astype(str)
+        else:
+            serie = pd.to_numeric(serie, errors="coerce").fillna(defecto).astype(type(defecto))
+        datos[col] = serie
+    return pd.DataFrame(datos)
+
+
+def normalizar_cuadro(tabla):
+    return normalizar_tabla(tabla, COLUMNAS_CUADRO)
+
+
+def indices_tabla(serie, opciones, nombre):
+    idx = pd.Index(opciones).get_indexer(serie)
+    if (idx < 0).any():
+        invalidos = sorted(set(serie[idx < 0]))
+        raise ValueError(f"{nombre} no reconocido: {', '.join(map(str, invalidos))}")
+    return idx
+
+
+def evaluar_cuadro(tabla, conductores=None):
+    # Evalua las cuatro verificaciones CEN sobre todas las filas a la vez (operaciones por columna).
+    # conductores: tabla de tabla_conductores() (por defecto la historica)
+    conductores = conductores or CONDUCTORES_CEN
+    cuadro = normalizar_cuadro(tabla)
+    idx_cal = indices_tabla(cuadro["calibre"], conductores["calibres"], "Calibre")
+    idx_mat = indices_tabla(cuadro["material"], lista_materiales, "Material")
+    fc_temp = cuadro["temperatura"].map(db_temp_factors)
+    if fc_temp.isna().any():
+        raise ValueError(f"Rango de temperatura no reconocido: {', '.join(sorted(set(cuadro['temperatura'][fc_temp.isna()])))}")
+    fc_temp = fc_temp.to_numpy(float)
+
+    carga = cuadro["carga_va"].to_numpy(float)
+    voltaje = cuadro["voltaje"].to_numpy(float)
+    trifasico = es_trifasico(cuadro["sistema"])
+    k_factor = np.where(trifasico, 10.0, 5.0)
+
+    amp = verificar_ampacidad(corriente_carga(carga, voltaje, trifasico), idx_cal, fc_temp, cuadro["n_conductores"].to_numpy(), conductores)
+    caida = caida_tension(carga, voltaje, cuadro["longitud_m"].to_numpy(float), idx_cal, cuadro["fp"].to_numpy(float), k_factor, conductores)
+    canal = ocupacion_canalizacion(cuadro["n_hilos"].to_numpy(), conductores["area"][idx_cal], idx_mat)
+    termica = verificacion_termica(idx_cal, cuadro["t_despeje"].to_numpy(float), cuadro["icc_tablero_ka"].to_numpy(float) * 1000, conductores)
+
+    auto = dimensionar(
+        carga, voltaje, trifasico, cuadro["longitud_m"].to_numpy(float), cuadro["fp"].to_numpy(float), k_factor, fc_temp,
+        cuadro["n_conductores"].to_numpy(), cuadro["n_hilos"].to_numpy(), idx_mat, cuadro["t_despeje"].to_numpy(float),
+        cuadro["icc_tablero_ka"].to_numpy(float) * 1000, conductores,
+    )
+
+    tubos = np.array(lista_tuberias + ["No disponible"], dtype=object)
+    calibres = np.array(conductores["calibres"] + ["No disponible"], dtype=object)
+    resultados = pd.DataFrame({
+        "i_diseno_a": amp["i_diseno"],
+        "amp_real_a": amp["amp_real"],
+        "fc_agrup": amp["fc_agrup"],
+        "breaker_a": amp["breaker"],
+        "ok_ampacidad": amp["cumple_ampacidad"],
+        "caida_pct": caida["caida_pct"],
+        "ok_caida": caida["cumple_caida"],
+        "area_ocup_mm2": canal["area_ocup"],
+        "tubo_min": tubos[canal["idx_tubo_rec"]],
+        "ok_canalizacion": canal["cumple_canalizacion"],
+        "icc_max_ka": termica["icc_max_a"] / 1000,
+        "ok_cortocircuito": termica["cumple_cortocircuito"],
+        "calibre_min": calibres[auto["idx_calibre"]],
+        "tubo_calibre_min": tubos[auto["idx_tubo"]],
+    })
+    resultados["cumple_todo"] = resultados[["ok_ampacidad", "ok_caida", "ok_canalizacion", "ok_cortocircuito"]].all(axis=1)
+    return pd.concat([cuadro, resultados], axis=1)
+
+
+# =========================================================
+# CÁLCULO DE UN CIRCUITO (módulos del dashboard)
+# =========================================================
+# Funciones puras de entradas escalares: el dashboard las memoiza por el hash de sus argumentos.
+def calculo_corriente(carga_va, voltaje, sistema):
+    # Determinar el denominador correcto para I_carga
+    if "Monofásico" in sistema:
+        denom = voltaje
+    else: # Trifásico
+        denom = voltaje * 1.732
+    return carga_va / denom
+
+
+def breaker_ideal(i_diseno):
+    # Interruptor del dashboard: int, o None si ninguno de la tabla alcanza la corriente de diseño
+    breaker = float(seleccionar_breaker(i_diseno))
+    return None if np.isnan(breaker) else int(breaker)
+
+
+def calculo_ampacidad(carga_va, voltaje, sistema, calibre_sel, num_conductores, temp_factor_key, conductores=None):
+    fc_temp = db_temp_factors[temp_factor_key]
+    corriente = calculo_corriente(carga_va, voltaje, sistema)
+
+    # CÁLCULO DEL FACTOR DE AGRUPAMIENTO (FA)
+    fc_agrup = 1.0
+    if 4 <= num_conductores <= 6: fc_agrup = 0.8
+    elif 7 <= num_conductores <= 9: fc_agrup = 0.7
+    elif 10 <= num_conductores <= 20: fc_agrup = 0.5
+    elif num_conductores > 20: fc_agrup = 0.45
+
+    # Ampacidad Base usada para corrección (columna 90°C) y Máxima por terminales (columna 75°C)
+    cable = datos_calibre(calibre_sel, conductores)
+    amp_base_90 = cable["amp_90"]
+    amp_max_75 = cable["amp_75"]
+
+    # AMPACIDAD REAL LIMITADA por la temperatura del terminal (CEN 110.14(C))
+    amp_real = min(amp_base_90 * fc_temp * fc_agrup, amp_max_75)
+
+    # Corriente de Diseño (125% de la carga) y protección (CEN 240.4(B))
+    i_diseno = corriente * 1.25
+    return {
+        "fc_temp": fc_temp, "corriente_carga": corriente, "fc_agrup": fc_agrup,
+        "amp_base_90": amp_base_90, "amp_max_75": amp_max_75, "amp_real": amp_real,
+        "i_diseno": i_diseno, "breaker_ideal": breaker_ideal(i_diseno),
+    }
+
+
+def calculo_caida(carga_va, voltaje, distancia, K_FINAL, fp_v, calibre_v, conductores=None):
+    # CÁLCULOS (Fórmula de componentes de impedancia): Ze = R*cosθ + X*sinθ
+    cable = datos_calibre(calibre_v, conductores)
+    R, X = cable["R"], cable["X"]
+    impedancia = (R * fp_v) + (X * float(np.sin(np.arccos(fp_v))))
+
+    # Aplicación de su formula: (kVA*L*Ze) / (K * kV²), directamente en porcentaje
+    percent_drop = (carga_va / 1000.0 * distancia / 1000.0 * impedancia) / (K_FINAL * (voltaje / 1000.0)**2) * 100
+    return {"R": R, "X": X, "percent_drop": percent_drop, "v_drop": (percent_drop / 100.0) * voltaje}
+
+
+def calculo_canalizacion(n_hilos_canal, area_uni, material_sel, tubo_a_verificar):
+    area_ocup = n_hilos_canal * area_uni
+
+    # Límite de llenado según el número de hilos (CEN Cap. 9 Tabla 1)
+    if n_hilos_canal == 1:
+        limite = 53
+    elif n_hilos_canal == 2:
+        limite = 31
+    else:
+        limite = 40 # Para más de dos conductores
+
+    return {
+        "area_ocup": area_ocup, "limite": limite,
+        "tubo_recomendado": tubo_minimo(area_ocup * 100 / limite, material_sel),
+        "porc_verif": (area_ocup / db_tuberias_full[tubo_a_verificar][material_sel]) * 100,
+    }
+
+
+def calculo_cortocircuito(calibre_cc, tiempo_despeje, i_cap_interrupcion, conductores=None):
+    # Icc = (K * Area kcmil) / sqrt(t), K segun el material de la tabla (105 Cu, 69 Al)
+    area_real_kcmil = datos_calibre(calibre_cc, conductores)["kcmil"]
+    k_termico = (conductores or CONDUCTORES_CEN)["k_termico"]
+    if area_real_kcmil > 0 and tiempo_despeje > 0:
+        i_cc_max_permitida = (k_termico * area_real_kcmil) / float(np.sqrt(tiempo_despeje))
+    else:
+        i_cc_max_permitida = 0.0
+    return {"area_real_kcmil": area_real_kcmil, "i_cc_max_permitida": i_cc_max_permitida}
@@ -0,0 +1,153 @@
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from calculos import (
+    AREA_TUBERIAS, CONDUCTORES_CEN, corriente_carga, db_temp_factors, es_trifasico, factor_agrupamiento, indices_tabla,
+    limite_llenado, lista_materiales, lista_tuberias, normalizar_cuadro,
+)
+
+# =========================================================
+# RUTAS DE CANALIZACIÓN: varios circuitos por una trayectoria comun
+# =========================================================
+# Los conductores de cada circuito van juntos en una misma canalizacion. Se asignan circuitos a
+# canalizaciones por "first-fit decreasing" (mayor area primero) respetando los limites de llenado
+# CEN Cap. 9 (53/31/40 %) del diametro maximo admitido y, opcionalmente, que el FC de agrupamiento
+# resultante en cada canalizacion no haga fallar la ampacidad de ningun circuito que cumplia solo.
+# Luego cada canalizacion recibe el menor diametro que la contiene.
+PULGADAS = np.array([float(sum(Fraction(p) for p in t.strip('"').split())) for t in lista_tuberias])
+
+
+def portadores_circuito(sistema, n_hilos):
+    # Conductores portadores de corriente por circuito (2 en 1F, 3 en 3F), sin exceder los hilos del circuito
+    return np.minimum(np.where(es_trifasico(sistema), 3, 2), n_hilos)
+
+
+def preparar_ruta(cuadro, conductores=None):
+    # Datos por circuito para el empaquetado (un elemento por fila del cuadro); conductores: tabla de
+    # calculos.tabla_conductores() (por defecto la historica)
+    conductores = conductores or CONDUCTORES_CEN
+    cuadro = normalizar_cuadro(cuadro)
+    idx_cal = indices_tabla(cuadro["calibre"], conductores["calibres"], "Calibre")
+    amp_75, amp_90 = conductores["amp_75"][idx_cal], conductores["amp_90"][idx_cal]
+    fc_temp = cuadro["temperatura"].map(db_temp_factors)
+    if fc_temp.isna().any():
+        raise ValueError(f"Rango de temperatura no reconocido: {', '.join(sorted(set(cuadro['temperatura'][fc_temp.isna()])))}")
+    fc_temp = fc_temp.to_numpy(float)
+    n_hilos = cuadro["n_hilos"].to_numpy()
+    i_diseno = corriente_carga(cuadro["carga_va"].to_numpy(float), cuadro["voltaje"].to_numpy(float), es_trifasico(cuadro["sistema"])) * 1.25
+    portadores = portadores_circuito(cuadro["sistema"], n_hilos)
+    # FC de agrupamiento minimo que necesita cada circuito; 0 si falla aun solo (no restringe el empaquetado)
+    fc_requerido = i_diseno / (amp_90 * fc_temp)
+    cumple_solo = (fc_requerido <= factor_agrupamiento(portadores)) & (i_diseno <= amp_75)
+    return cuadro, {
+        "idx_calibre": idx_cal,
+        "amp_75": amp_75,
+        "amp_90": amp_90,
+        "fc_temp": fc_temp,
+        "n_hilos": n_hilos,
+        "portadores": portadores,
+        "area": n_hilos * conductores["area"][idx_cal],
+        "i_diseno": i_diseno,
+        "fc_requerido": np.where(cumple_solo, fc_requerido, 0.0),
+    }
+
+
+def empaquetar(datos, idx_material, idx_tubo_max, respetar_ampacidad=True):
+    # First-fit decreasing; el estado de las canalizaciones abiertas se evalua vectorizado en cada paso.
+    # Devuelve la canalizacion asignada a cada circuito (0..n_canalizaciones-1, en orden de apertura).
+    area, hilos, port, fc_req = datos["area"], datos["n_hilos"], datos["portadores"], datos["fc_requerido"]
+    n = len(area)
+    capacidad = AREA_TUBERIAS[idx_material, idx_tubo_max]
+    # Tablas por numero de hilos / portadores para no recalcular np.select en el bucle
+    lim = limite_llenado(np.arange(int(hilos.sum()) + 1)) / 100
+    fca = factor_agrupamiento(np.arange(int(port.sum()) + 1)) if respetar_ampacidad else None
+
+    area_c = np.zeros(n)
+    hilos_c = np.zeros(n, dtype=int)
+    port_c = np.zeros(n, dtype=int)
+    fc_req_c = np.zeros(n)
+    asignacion = np.empty(n, dtype=int)
+    abiertas = 0
+    for i in np.argsort(-area, kind="stable"):
+        h = hilos_c[:abiertas] + hilos[i]
+        cabe = area_c[:abiertas] + area[i] <= capacidad * lim[h]
+        if respetar_ampacidad:
+            p = port_c[:abiertas] + port[i]
+            cabe &= fca[p] >= np.maximum(fc_req_c[:abiertas], fc_req[i])
+        j = int(np.argmax(cabe)) if cabe.any() else abiertas
+        abiertas = max(abiertas, j + 1)
+        area_c[j] += area[i]
+        hilos_c[j] += hilos[i]
+        port_c[j] += port[i]
+        fc_req_c[j] = max(fc_req_c[j], fc_req[i])
+        asignacion[i] = j
+    return asignacion
+
+
+def resumir_ruta(cuadro, datos, asignacion, idx_material):
+    # Diametro minimo, llenado y FC de agrupamiento por canalizacion, y ampacidad de cada circuito con ese FC
+    n_canal = int(asignacion.max()) + 1 if len(asignacion) else 0
+    area = np.bincount(asignacion, datos["area"], minlength=n_canal)
+    hilos = np.bincount(asignacion, datos["n_hilos"], minlength=n_canal).astype(int)
+    port = np.bincount(asignacion, datos["portadores"], minlength=n_canal).astype(int)
+    limite = limite_llenado(hilos)
+    idx_tubo = np.searchsorted(AREA_TUBERIAS[idx_material], area * 100 / limite, side="left")
+    valido = idx_tubo < len(lista_tuberias)
+    idx_tubo_ok = np.minimum(idx_tubo, len(lista_tuberias) - 1)
+    fc_agrup = factor_agrupamiento(port)
+    tubos = np.array(lista_tuberias + ["No disponible"], dtype=object)
+
+    canalizaciones = pd.DataFrame({
+        "canalizacion": np.arange(1, n_canal + 1),
+        "circuitos": np.bincount(asignacion, minlength=n_canal),
+        "n_hilos": hilos,
+        "portadores": port,
+        "area_ocup_mm2": area,
+        "limite_pct": limite,
+        "tubo": tubos[idx_tubo],
+        "diametro_pulg": np.where(valido, PULGADAS[idx_tubo_ok], np.nan),
+        "ocupacion_pct": np.where(valido, area / AREA_TUBERIAS[idx_material, idx_tubo_ok] * 100, np.nan),
+        "fc_agrup": fc_agrup,
+        "ok_canalizacion": valido,
+    })
+
+    amp_real = np.minimum(datos["amp_90"] * datos["fc_temp"] * fc_agrup[asignacion], datos["amp_75"])
+    circuitos = pd.DataFrame({
+        "circuito": cuadro["circuito"],
+        "calibre": cuadro["calibre"],
+        "n_hilos": datos["n_hilos"],
+        "area_mm2": datos["area"],
+        "canalizacion": asignacion + 1,
+        "tubo": tubos[idx_tubo[asignacion]],
+        "fc_agrup": fc_agrup[asignacion],
+        "i_diseno_a": datos["i_diseno"],
+        "amp_real_a": amp_real,
+        "ok_ampacidad": amp_real >= datos["i_diseno"],
+    })
+    return circuitos, canalizaciones
+
+
+def optimizar_ruta(cuadro, material="PVC40", tubo_max=None, respetar_ampacidad=True, conductores=None):
+    # Prueba cada diametro maximo admisible (o solo tubo_max) y se queda con la solucion de menos
+    # canalizaciones y, a igualdad, menor suma de diametros nominales.
+    cuadro, datos = preparar_ruta(cuadro, conductores)
+    idx_material = lista_materiales.index(material)
+    if tubo_max is not None:
+        candidatos = [lista_tuberias.index(tubo_max)]
+    else:
+        # Ningun candidato puede dejar sin lugar a un circuito que cabe solo en el mayor diametro
+        individual = np.searchsorted(AREA_TUBERIAS[idx_material], datos["area"] * 100 / limite_llenado(datos["n_hilos"]), side="left")
+        cabe = individual < len(lista_tuberias)
+        candidatos = range(int(individual[cabe].max()) if cabe.any() else len(lista_tuberias) - 1, len(lista_tuberias))
+
+    mejor = None
+    for idx_max in candidatos:
+        asignacion = empaquetar(datos, idx_material, idx_max, respetar_ampacidad)
+        circuitos, canalizaciones = resumir_ruta(cuadro, datos, asignacion, idx_material)
+        costo = (len(canalizaciones), canalizaciones["diametro_pulg"].sum())
+        if mejor is None or costo < mejor[0]:
+            mejor = (costo, circuitos, canalizaciones, lista_tuberias[idx_max])
+    _, circuitos, canalizaciones, tubo_usado = mejor
+    return {"circuitos": circuitos, "canalizaciones": canalizaciones, "tubo_max": tubo_usado}
@@ -0,0 +1,88 @@
+import functools
+import os
+import pathlib
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# CATÁLOGO DE CONDUCTORES, TUBERÍAS Y FACTORES (datos/*.csv)
+# =========================================================
+# Cada tabla se lee una sola vez por proceso (compartida por todas las sesiones) como un arreglo
+# estructurado de NumPy, una columna por campo. La primera lectura de un CSV deja una copia binaria
+# (.npy) en datos/cache/ que las siguientes cargas mapean en memoria; se regenera si el CSV es mas nuevo.
+DIRECTORIO = pathlib.Path(os.environ.get("CEN_CATALOGO", pathlib.Path(__file__).resolve().parent / "datos"))
+CACHE = DIRECTORIO / "cache"
+
+
+def _leer_csv(ruta):
+    df = pd.read_csv(ruta, comment="#")
+    campos = []
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].fillna("").astype(str)
+            campos.append((col, f"U{max(1, df[col].str.len().max())}"))
+        else:
+            campos.append((col, "f8" if df[col].dtype.kind == "f" or df[col].isna().any() else "i8"))
+    datos = np.empty(len(df), dtype=campos)
+    for col, _ in campos:
+        datos[col] = df[col].to_numpy()
+    return datos
+
+
+def _guardar_cache(datos, destino):
+    # Escritura atomica: otro proceso nunca ve un .npy a medio escribir
+    try:
+        CACHE.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=CACHE, suffix=".npy", delete=False) as f:
+            np.save(f, datos, allow_pickle=False)
+        os.replace(f.name, destino)
+    except OSError:
+        pass # Directorio de solo lectura: se sigue usando el CSV
+
+
+@functools.lru_cache(maxsize=None)
+def tabla(nombre):
+    # Arreglo estructurado (solo lectura) de datos/<nombre>.csv
+    fuente = DIRECTORIO / f"{nombre}.csv"
+    binario = CACHE / f"{nombre}.npy"
+    if binario.exists() and binario.stat().st_mtime >= fuente.stat().st_mtime:
+        return np.load(binario, mmap_mode="r", allow_pickle=False)
+    datos = _leer_csv(fuente)
+    _guardar_cache(datos, binario)
+    datos.flags.writeable = False
+    return datos
+
+
+@functools.lru_cache(maxsize=None)
+def indice(nombre, columna):
+    # Indice ordenado de una columna numerica: (orden de filas, valores ordenados). Los NaN quedan al final.
+    valores = np.asarray(tabla(nombre)[columna], dtype=float)
+    orden = np.argsort(valores, kind="stable")
+    return orden, valores[orden]
+
+
+def rango(nombre, columna, minimo=-np.inf, maximo=np.inf):
+    # Filas (en orden de la columna) con minimo <= valor <= maximo, por busqueda binaria sobre el indice
+    orden, valores = indice(nombre, columna)
+    return orden[np.searchsorted(valores, minimo, side="left"):np.searchsorted(valores, maximo, side="right")]
+
+
+def consultar(nombre, rangos=None, **iguales):
+    # Filas que cumplen todos los rangos {columna: (min, max)} y las igualdades columna=valor, como DataFrame
+    datos = tabla(nombre)
+    filas = np.arange(len(datos))
+    for columna, (minimo, maximo) in (rangos or {}).items():
+        filas = filas[np.isin(filas, rango(nombre, columna, minimo, maximo))]
+    for columna, valor in iguales.items():
+        filas = filas[datos[columna][filas] == valor]
+    return pd.DataFrame(datos[filas])
+
+
+def columna(nombre, campo):
+    return np.asarray(tabla(nombre)[campo])
+
+
+def etiquetas(nombre, campo):
+    return [str(v) for v in tabla(nombre)[campo]]
@@ -0,0 +1,75 @@
+import numpy as np
+
+import catalogo
+
+# =========================================================
+# CURVAS TIEMPO-CORRIENTE DE INTERRUPTORES Y SELECTIVIDAD
+# =========================================================
+# Cada interruptor de datos/interruptores.csv tiene una banda (t_min, t_max) por corriente: la curva
+# minima es el primer instante en que puede disparar y la maxima el ultimo en que despeja la falla.
+# Las curvas se evaluan como arreglos [dispositivos, corrientes] sobre una malla logaritmica comun,
+# asi toda una jerarquia de tableros se re-verifica con unas pocas operaciones por columna.
+_interruptores = catalogo.tabla("interruptores")
+CORRIENTES_NOMINALES = np.asarray(_interruptores["in_a"], dtype=float)
+A_MIN = np.asarray(_interruptores["a_min"], dtype=float)
+A_MAX = np.asarray(_interruptores["a_max"], dtype=float)
+IM_MIN = np.asarray(_interruptores["im_min"], dtype=float)
+IM_MAX = np.asarray(_interruptores["im_max"], dtype=float)
+T_INST_MIN = np.asarray(_interruptores["t_inst_min"], dtype=float)
+T_INST_MAX = np.asarray(_interruptores["t_inst_max"], dtype=float)
+lista_interruptores = CORRIENTES_NOMINALES.astype(int).tolist() # = calculos.db_breakers
+
+UMBRAL_TERMICO = 1.05 # I/In bajo el cual el elemento termico no dispara
+TOLERANCIA_AJUSTE = 0.20 # Banda del disparo instantaneo ajustado: ajuste * (1 ± tolerancia)
+MALLA = np.geomspace(10.0, 200_000.0, 256) # Corrientes (A) para comparar curvas
+
+
+def indice_interruptor(breaker_a):
+    # Fila del catalogo de cada corriente nominal (conserva la forma de la entrada)
+    breaker_a = np.asarray(breaker_a, dtype=float)
+    idx = np.minimum(np.searchsorted(CORRIENTES_NOMINALES, breaker_a), len(CORRIENTES_NOMINALES) - 1)
+    invalidos = CORRIENTES_NOMINALES[idx] != breaker_a
+    if invalidos.any():
+        raise ValueError(f"Interruptor no reconocido: {', '.join(f'{v:g} A' for v in sorted(set(breaker_a[invalidos].ravel())))}")
+    return idx
+
+
+def tiempos_disparo(breaker_a, corriente_a, ajuste_inst=0.0):
+    # Banda (t_min, t_max) en s; inf = no dispara. Entradas con broadcasting (p. ej. [N, 1] contra [1, G]).
+    # ajuste_inst > 0 fija el disparo instantaneo en ese multiplo de In; 0 usa la banda del catalogo.
+    idx = indice_interruptor(breaker_a)
+    in_a = CORRIENTES_NOMINALES[idx]
+    ajuste = np.asarray(ajuste_inst, dtype=float)
+    im_min = np.where(ajuste > 0, ajuste * (1 - TOLERANCIA_AJUSTE), IM_MIN[idx]) * in_a
+    im_max = np.where(ajuste > 0, ajuste * (1 + TOLERANCIA_AJUSTE), IM_MAX[idx]) * in_a
+
+    corriente_a = np.asarray(corriente_a, dtype=float)
+    m = corriente_a / in_a
+    with np.errstate(divide="ignore"):
+        termico = np.where(m > UMBRAL_TERMICO, 1.0 / np.maximum(m**2 - 1.0, 1e-12), np.inf)
+    t_min = np.where(corriente_a >= im_min, T_INST_MIN[idx], A_MIN[idx] * termico)
+    t_max = np.where(corriente_a >= im_max, T_INST_MAX[idx], A_MAX[idx] * termico)
+    return t_min, t_max
+
+
+def tiempo_despeje(breaker_a, icc_a, ajuste_inst=0.0):
+    # Tiempo de despeje (s) a la corriente de falla: curva maxima, el caso mas desfavorable para el conductor
+    return tiempos_disparo(breaker_a, icc_a, ajuste_inst)[1]
+
+
+def selectividad(breaker_arriba, breaker_abajo, icc_a, ajuste_arriba=0.0, ajuste_abajo=0.0, malla=MALLA):
+    # Pares (aguas arriba, aguas abajo) [N]: hay selectividad a una corriente si el dispositivo aguas abajo
+    # despeja (t_max) antes de que el de aguas arriba pueda empezar a disparar (t_min). Se revisan las
+    # corrientes de la malla hasta la falla maxima que ve el dispositivo aguas abajo (icc_a).
+    col = lambda v: np.asarray(v, dtype=float).reshape(-1, 1)
+    _, t_max_abajo = tiempos_disparo(col(breaker_abajo), malla, col(ajuste_abajo))
+    t_min_arriba, _ = tiempos_disparo(col(breaker_arriba), malla, col(ajuste_arriba))
+    violacion = (malla <= col(icc_a)) & np.isfinite(t_min_arriba) & ~(t_max_abajo < t_min_arriba)
+
+    hay_violacion = violacion.any(axis=1)
+    primera = np.argmax(violacion, axis=1)
+    return {
+        "selectivo": ~hay_violacion,
+        # Menor corriente de la malla en que se pierde la selectividad (NaN si es total hasta icc_a)
+        "i_perdida_a": np.where(hay_violacion, malla[primera], np.nan),
+    }
@@ -0,0 +1,159 @@
+"""Verificacion CEN-2004 por lotes, sin interfaz, para archivos de circuitos de cualquier tamaño.
+
+Uso (desde la raiz del repositorio):
+
+    python lote.py circuitos.csv resultados.csv
+    python lote.py circuitos.parquet resultados.parquet --trabajadores 8 --bloque 200000
+    python lote.py circuitos.csv fallas.csv --solo-fallas --estricto
+    python lote.py circuitos.csv resultados.csv --conductores Al --aislamiento XHHW
+
+La entrada (CSV o Parquet, con las columnas del Cuadro de Cargas) se lee por bloques; cada bloque se
+evalua en un proceso del pool (ampacidad, caida, canalizaciones y cortocircuito) y se escribe a la salida
+en el orden original apenas esta listo. Nunca hay mas de 2 bloques por trabajador en memoria.
+"""
+import argparse
+import collections
+import concurrent.futures
+import importlib.util
+import os
+import pathlib
+import sys
+import time
+
+import pandas as pd
+
+from calculos import evaluar_cuadro, lista_aislamientos, lista_tablas_conductores, tabla_conductores
+
+TAMANO_BLOQUE = 100_000
+EN_VUELO_POR_TRABAJADOR = 2
+VERIFICACIONES = {
+    "fallas_ampacidad": "ok_ampacidad", "fallas_caida": "ok_caida", "fallas_canalizacion": "ok_canalizacion",
+    "fallas_cortocircuito": "ok_cortocircuito", "fallas_total": "cumple_todo",
+}
+
+
+def formato(ruta):
+    sufijo = pathlib.Path(ruta).suffix.lower()
+    if sufijo not in (".csv", ".parquet", ".pq"):
+        raise ValueError(f"Formato no soportado: {ruta} (use .csv o .parquet)")
+    if sufijo == ".csv":
+        return "csv"
+    # pyarrow solo hace falta para Parquet: sin el se avisa antes de leer o escribir nada
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ValueError(f"Leer o escribir Parquet requiere pyarrow (pip install pyarrow): {ruta}")
+    return "parquet"
+
+
+def leer_bloques(ruta, tamano_bloque=TAMANO_BLOQUE):
+    # Generador de DataFrames de a lo sumo tamano_bloque filas
+    if formato(ruta) == "csv":
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque)
+    else:
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque):
+            yield lote.to_pandas()
+
+
+def evaluar_bloque(bloque, solo_fallas=False, tabla=("CEN", "THHN")):
+    # tabla = (material, aislamiento): se pasa como tupla para no serializar los arreglos a cada proceso
+    resultado = evaluar_cuadro(bloque, tabla_conductores(*tabla))
+    return resultado[~resultado["cumple_todo"]] if solo_fallas else resultado
+
+
+def evaluar_bloques(bloques, trabajadores=None, solo_fallas=False, tabla=("CEN", "THHN")):
+    # Evalua los bloques en un pool de procesos y los devuelve en orden, con una ventana acotada de tareas en vuelo
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1:
+        for bloque in bloques:
+            yield evaluar_bloque(bloque, solo_fallas, tabla)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        en_vuelo = collections.deque()
+        for bloque in bloques:
+            en_vuelo.append(pool.submit(evaluar_bloque, bloque, solo_fallas, tabla))
+            if len(en_vuelo) >= trabajadores * EN_VUELO_POR_TRABAJADOR:
+                yield en_vuelo.popleft().result()
+        while en_vuelo:
+            yield en_vuelo.popleft().result()
+
+
+class EscritorResultados:
+    # Escribe los bloques a medida que llegan (CSV con una sola cabecera, o Parquet por row groups)
+    def __init__(self, ruta):
+        self.ruta, self.formato = ruta, formato(ruta)
+        self._parquet = None
+        self._primero = True
+
+    def escribir(self, tabla):
+        if self.formato == "csv":
+            tabla.to_csv(self.ruta, mode="w" if self._primero else "a", header=self._primero, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            datos = pa.Table.from_pandas(tabla, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.ruta, datos.schema)
+            self._parquet.write_table(datos.cast(self._parquet.schema))
+        self._primero = False
+
+    def cerrar(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def procesar(entrada, salida, trabajadores=None, tamano_bloque=TAMANO_BLOQUE, solo_fallas=False, progreso=None, tabla=("CEN", "THHN")):
+    # Pipeline completo: leer -> evaluar en paralelo -> escribir. Devuelve totales por verificacion.
+    totales = collections.Counter()
+    formato(entrada)
+    with EscritorResultados(salida) as escritor:
+        for i, resultado in enumerate(evaluar_bloques(leer_bloques(entrada, tamano_bloque), trabajadores, solo_fallas, tabla)):
+            escritor.escribir(resultado)
+            totales["bloques"] += 1
+            totales["escritos"] += len(resultado)
+            for clave, col in VERIFICACIONES.items():
+                totales[clave] += int((~resultado[col]).sum())
+            if progreso:
+                progreso(i, totales)
+    return totales
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verificacion CEN-2004 por lotes (CSV/Parquet)")
+    parser.add_argument("entrada", type=pathlib.Path, help="Cuadro de cargas (.csv o .parquet)")
+    parser.add_argument("salida", type=pathlib.Path, help="Resultados (.csv o .parquet)")
+    parser.add_argument("--trabajadores", type=int, default=os.cpu_count(), help="Procesos del pool (1 = sin pool)")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Filas por bloque")
+    parser.add_argument("--solo-fallas", action="store_true", help="Escribe solo los circuitos que no cumplen")
+    parser.add_argument("--conductores", choices=lista_tablas_conductores, default="CEN",
+                        help="Tabla de conductores (CEN = tabla historica Cu hasta 4/0; Cu/Al = catalogo completo)")
+    parser.add_argument("--aislamiento", choices=lista_aislamientos, default="THHN", help="Aislamiento (solo con --conductores Cu/Al)")
+    parser.add_argument("--estricto", action="store_true", help="Sale con codigo 1 si algun circuito no cumple")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    def progreso(i, totales):
+        print(f"bloque {i + 1}: {totales['escritos']} filas escritas, {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+    try:
+        totales = procesar(args.entrada, args.salida, args.trabajadores, args.bloque, args.solo_fallas, progreso,
+                           (args.conductores, args.aislamiento))
+    except ValueError as e:
+        print(f"ERROR {e}", file=sys.stderr)
+        return 2
+
+    for clave in VERIFICACIONES:
+        print(f"{clave:25s} {totales[clave]}")
+    return 1 if args.estricto and totales["fallas_total"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import collections
+import contextlib
+import functools
+import hmac
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# =========================================================
+# INSTRUMENTACIÓN (opt-in, por proceso)
+# =========================================================
+# Se activa con la variable de entorno CEN_METRICAS=1. Cada metrica guarda sus ultimas
+# CEN_METRICAS_MAX muestras en un buffer circular en memoria, compartido por todas las sesiones
+# del proceso; sin activar, medir()/registrar() no hacen nada.
+ACTIVO = os.environ.get("CEN_METRICAS", "0") == "1"
+MAX_MUESTRAS = int(os.environ.get("CEN_METRICAS_MAX", "2048"))
+ARCHIVO_JSONL = os.environ.get("CEN_METRICAS_ARCHIVO", "metricas_cen.jsonl")
+# El JSONL se rota (una copia .1) al superar este tamaño, para no crecer sin limite
+MAX_BYTES_JSONL = int(os.environ.get("CEN_METRICAS_ARCHIVO_MAX", str(10 * 1024 * 1024)))
+# Token del panel de administracion (?admin=<token>); sin token configurado el panel no se muestra
+TOKEN_ADMIN = os.environ.get("CEN_METRICAS_TOKEN", "")
+PERCENTILES = (50, 95, 99)
+
+_muestras = collections.defaultdict(lambda: collections.deque(maxlen=MAX_MUESTRAS))
+_candado = threading.Lock()
+
+
+def registrar(nombre, valor, **etiquetas):
+    if not ACTIVO:
+        return
+    with _candado:
+        _muestras[(nombre, tuple(sorted(etiquetas.items())))].append((time.time(), float(valor)))
+
+
+@contextlib.contextmanager
+def medir(nombre, **etiquetas):
+    # Tiempo de pared (s) del bloque; no se registra si el bloque termina con una excepcion (p. ej. st.rerun)
+    if not ACTIVO:
+        yield
+        return
+    inicio = time.perf_counter()
+    yield
+    registrar(nombre, time.perf_counter() - inicio, **etiquetas)
+
+
+def cronometrado(nombre):
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def cambio_detectado(estado, claves, memoria="_metricas_valores_previos"):
+    # Primera clave cuyo valor cambio respecto de la corrida anterior (el widget que disparo la re-ejecucion)
+    actuales = {k: estado.get(k) for k in claves}
+    previos = estado.get(memoria)
+    estado[memoria] = actuales
+    if previos is None:
+        return "inicio"
+    return next((k for k in claves if actuales[k] != previos.get(k)), "ninguno")
+
+
+def refrescar_previos(estado, claves, memoria="_metricas_valores_previos"):
+    # Las re-ejecuciones parciales (fragmentos) tambien cambian session_state: se actualizan sus claves en la
+    # foto previa para que la siguiente corrida completa se atribuya al widget que realmente la disparo.
+    # Devuelve la primera clave que cambio (el widget que disparo la re-ejecucion parcial).
+    previos = estado.get(memoria)
+    if not ACTIVO or previos is None:
+        return "inicio"
+    cambio = next((k for k in claves if estado.get(k) != previos.get(k)), "ninguno")
+    previos.update({k: estado.get(k) for k in claves})
+    return cambio
+
+
+def admin_autorizado(token):
+    # Compara el token recibido (query param) con CEN_METRICAS_TOKEN en tiempo constante
+    return bool(TOKEN_ADMIN) and hmac.compare_digest(str(token or ""), TOKEN_ADMIN)
+
+
+# --- CONSULTA Y EXPORTACIÓN ---
+def series():
+    # {(nombre, etiquetas): arreglo de valores} (copia, para no bloquear a las sesiones mientras se analiza)
+    with _candado:
+        return {clave: np.array([v for _, v in datos]) for clave, datos in _muestras.items()}
+
+
+def resumen():
+    filas = []
+    for (nombre, etiquetas), valores in sorted(series().items()):
+        p = np.percentile(valores, PERCENTILES)
+        filas.append({
+            "metrica": nombre, "etiquetas": dict(etiquetas), "n": len(valores),
+            **{f"p{q}": v for q, v in zip(PERCENTILES, p)}, "max": valores.max(),
+        })
+    return filas
+
+
+def exportar_prometheus(prefijo="cen"):
+    # Formato de texto de Prometheus: un summary por metrica con sus cuantiles, _sum y _count
+    lineas, tipos = [], set()
+    for (nombre, etiquetas), valores in sorted(series().items()):
+        metrica = f"{prefijo}_{nombre}"
+        if metrica not in tipos:
+            lineas.append(f"# TYPE {metrica} summary")
+            tipos.add(metrica)
+        base = ",".join(f'{k}="{v}"' for k, v in etiquetas)
+        for q, v in zip(PERCENTILES, np.percentile(valores, PERCENTILES)):
+            lineas.append(f'{metrica}{{{base + "," if base else ""}quantile="{q / 100}"}} {v:.6g}')
+        sufijo = f"{{{base}}}" if base else ""
+        lineas.append(f"{metrica}_sum{sufijo} {valores.sum():.6g}")
+        lineas.append(f"{metrica}_count{sufijo} {len(valores)}")
+    return "\n".join(lineas) + "\n"
+
+
+_ultima_exportacion = {} # ruta -> instante de la ultima muestra escrita
+
+
+def exportar_jsonl(ruta=ARCHIVO_JSONL, max_bytes=MAX_BYTES_JSONL):
+    # Agrega al archivo las muestras del buffer que aun no se escribieron (una linea JSON por muestra) y
+    # devuelve cuantas escribio. Si el archivo supera max_bytes se rota a <ruta>.1 (se conserva una copia).
+    with _candado:
+        desde = _ultima_exportacion.get(ruta, 0.0)
+        copia = [(nombre, dict(etiquetas), [(t, v) for t, v in datos if t > desde]) for (nombre, etiquetas), datos in _muestras.items()]
+        _ultima_exportacion[ruta] = max([desde] + [t for _, _, datos in copia for t, _ in datos])
+        if os.path.exists(ruta) and os.path.getsize(ruta) >= max_bytes:
+            os.replace(ruta, f"{ruta}.1")
+        n = 0
+        with open(ruta, "a", encoding="utf-8") as f:
+            for nombre, etiquetas, datos in copia:
+                for instante, valor in datos:
+                    f.write(json.dumps({"t": instante, "metrica": nombre, "valor": valor, **etiquetas}) + "\n")
+                    n += 1
+    return n
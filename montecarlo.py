@@ -0,0 +1,142 @@
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+
+import catalogo
+from calculos import (
+    caida_tension, corriente_carga, db_temp_factors, es_trifasico, indices_tabla, lista_materiales, normalizar_cuadro,
+    ocupacion_canalizacion, tabla_conductores, verificacion_termica, verificar_ampacidad,
+)
+
+# =========================================================
+# ANÁLISIS DE ROBUSTEZ (Monte Carlo) DE LAS CUATRO VERIFICACIONES
+# =========================================================
+# Cada variable incierta se describe con una tupla (tipo, parametros...):
+#   ("fija",)  ("uniforme", min, max)  ("normal", media, desv)  ("triangular", min, moda, max)
+# carga_va, longitud_m, fp y t_despeje se muestrean como factores multiplicativos sobre el valor nominal
+# de cada circuito; temperatura_c es la temperatura ambiente absoluta (°C), que se lleva a su banda de
+# db_temp_factors. Cada circuito usa su propio flujo aleatorio (SeedSequence.spawn), asi el resultado no
+# depende de como se repartan los circuitos entre procesos.
+# Las probabilidades de falla cuentan las n muestras; los percentiles se calculan con las primeras
+# MUESTRAS_PERCENTILES (las muestras son independientes, asi que son una submuestra al azar) para que la
+# memoria por circuito no crezca con n.
+DISTRIBUCIONES = ["fija", "uniforme", "normal", "triangular"]
+VARIABLES = ["carga_va", "longitud_m", "fp", "temperatura_c", "t_despeje"]
+INCERTIDUMBRE_DEFECTO = {
+    "carga_va": ("normal", 1.0, 0.10),
+    "longitud_m": ("uniforme", 0.9, 1.2),
+    "fp": ("uniforme", 0.95, 1.05),
+    "temperatura_c": ("fija",),
+    "t_despeje": ("triangular", 0.8, 1.0, 1.5),
+}
+TAMANO_BLOQUE = 250_000
+MUESTRAS_PERCENTILES = 1_000_000
+PERCENTILES = (5, 50, 95)
+
+# Limite superior (°C) de cada banda de temperatura, de la misma tabla (y en el mismo orden) que db_temp_factors
+LIMITES_TEMPERATURA = catalogo.columna("factores_temperatura", "t_max_c").astype(float)
+FACTORES_TEMPERATURA = np.array(list(db_temp_factors.values()))
+
+
+def muestrear(rng, dist, n):
+    tipo, *p = dist
+    if tipo == "fija":
+        return None
+    if tipo == "uniforme":
+        return rng.uniform(p[0], p[1], n)
+    if tipo == "normal":
+        return rng.normal(p[0], p[1], n)
+    if tipo == "triangular":
+        return rng.triangular(p[0], p[1], p[2], n)
+    raise ValueError(f"Distribucion no reconocida: {tipo}")
+
+
+def factor_temperatura(temperatura_c):
+    # Banda de db_temp_factors de cada temperatura (por debajo de la primera banda se usa esta, sobre la ultima
+    # se usa la ultima)
+    idx = np.searchsorted(LIMITES_TEMPERATURA, temperatura_c, side="left")
+    return FACTORES_TEMPERATURA[np.minimum(idx, len(FACTORES_TEMPERATURA) - 1)]
+
+
+def simular_circuito(c, incertidumbre, n, semilla, tamano_bloque=TAMANO_BLOQUE, tabla=("CEN", "THHN"),
+                     muestras_percentiles=MUESTRAS_PERCENTILES):
+    # n muestras de un circuito (dict con las columnas del Cuadro de Cargas) en bloques de tamano_bloque;
+    # tabla = (material, aislamiento) de la tabla de conductores del cuadro
+    rng = np.random.default_rng(semilla)
+    conductores = tabla_conductores(*tabla)
+    idx_cal = conductores["calibres"].index(c["calibre"])
+    trifasico = bool(es_trifasico([c["sistema"]])[0])
+    k_factor = 10.0 if trifasico else 5.0
+    icc_a = c["icc_tablero_ka"] * 1000
+    fallas = np.zeros(4, dtype=np.int64) # ampacidad, caida, cortocircuito, alguna (canalizacion es determinista)
+    caida, margen_amp, margen_termico = [], [], [] # a lo sumo muestras_percentiles valores cada una
+
+    # La canalizacion no depende de ninguna variable incierta
+    canal = ocupacion_canalizacion(np.array([c["n_hilos"]]), conductores["area"][idx_cal], np.array([lista_materiales.index(c["material"])]))
+    cumple_canal = bool(canal["cumple_canalizacion"][0])
+
+    for inicio in range(0, n, tamano_bloque):
+        m = min(tamano_bloque, n - inicio)
+        muestra = {v: muestrear(rng, incertidumbre.get(v, ("fija",)), m) for v in VARIABLES}
+        carga = c["carga_va"] * (muestra["carga_va"] if muestra["carga_va"] is not None else 1.0)
+        longitud = c["longitud_m"] * (muestra["longitud_m"] if muestra["longitud_m"] is not None else 1.0)
+        fp = np.clip(c["fp"] * (muestra["fp"] if muestra["fp"] is not None else 1.0), 0.01, 1.0)
+        fc_temp = factor_temperatura(muestra["temperatura_c"]) if muestra["temperatura_c"] is not None else db_temp_factors[c["temperatura"]]
+        t = np.clip(c["t_despeje"] * (muestra["t_despeje"] if muestra["t_despeje"] is not None else 1.0), 1e-3, None)
+        carga, longitud, fp, fc_temp, t = np.broadcast_arrays(carga, longitud, fp, fc_temp, t)
+        carga = np.clip(carga, 0.0, None)
+
+        amp = verificar_ampacidad(corriente_carga(carga, c["voltaje"], trifasico), idx_cal, fc_temp, c["n_conductores"], conductores)
+        dv = caida_tension(carga, c["voltaje"], longitud, idx_cal, fp, k_factor, conductores)
+        termica = verificacion_termica(idx_cal, t, icc_a, conductores)
+
+        falla_amp, falla_caida, falla_cc = ~amp["cumple_ampacidad"], ~dv["cumple_caida"], ~termica["cumple_cortocircuito"]
+        fallas += [falla_amp.sum(), falla_caida.sum(), falla_cc.sum(), (falla_amp | falla_caida | falla_cc | (not cumple_canal)).sum()]
+        faltan = max(0, min(m, muestras_percentiles - inicio))
+        if faltan:
+            caida.append(dv["caida_pct"][:faltan])
+            margen_amp.append((amp["amp_real"] - amp["i_diseno"])[:faltan])
+            margen_termico.append((termica["icc_max_a"][:faltan] - icc_a) / 1000)
+
+    res = {
+        "circuito": c["circuito"],
+        "muestras": n,
+        "p_falla_ampacidad": fallas[0] / n,
+        "p_falla_caida": fallas[1] / n,
+        "p_falla_canalizacion": 0.0 if cumple_canal else 1.0,
+        "p_falla_cortocircuito": fallas[2] / n,
+        "p_falla_alguna": fallas[3] / n,
+    }
+    for nombre, valores in (("caida_pct", caida), ("margen_amp_a", margen_amp), ("margen_termico_ka", margen_termico)):
+        for q, v in zip(PERCENTILES, np.percentile(np.concatenate(valores), PERCENTILES)):
+            res[f"{nombre}_p{q}"] = v
+    return res
+
+
+def _simular_grupo(filas, incertidumbre, n, semillas, tamano_bloque, tabla):
+    return [simular_circuito(c, incertidumbre, n, s, tamano_bloque, tabla) for c, s in zip(filas, semillas)]
+
+
+def analizar(cuadro, incertidumbre=INCERTIDUMBRE_DEFECTO, n=1_000_000, semilla=0, trabajadores=1, tamano_bloque=TAMANO_BLOQUE,
+             tabla=("CEN", "THHN")):
+    # Probabilidad de falla y percentiles por circuito. Con trabajadores > 1 los circuitos se reparten entre
+    # procesos; cada uno conserva su flujo aleatorio, asi el resultado es el mismo con cualquier reparto.
+    cuadro = normalizar_cuadro(cuadro)
+    indices_tabla(cuadro["calibre"], tabla_conductores(*tabla)["calibres"], "Calibre")
+    indices_tabla(cuadro["material"], lista_materiales, "Material")
+    indices_tabla(cuadro["temperatura"], list(db_temp_factors), "Rango de temperatura")
+    for v, dist in incertidumbre.items():
+        if v not in VARIABLES or dist[0] not in DISTRIBUCIONES:
+            raise ValueError(f"Incertidumbre no reconocida: {v} {dist}")
+    filas = cuadro.to_dict("records")
+    semillas = np.random.SeedSequence(semilla).spawn(len(filas))
+
+    if trabajadores <= 1 or len(filas) <= 1:
+        return pd.DataFrame(_simular_grupo(filas, incertidumbre, n, semillas, tamano_bloque, tabla))
+    grupos = np.array_split(np.arange(len(filas)), min(trabajadores, len(filas)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(grupos)) as pool:
+        partes = pool.map(_simular_grupo, [[filas[i] for i in g] for g in grupos], [incertidumbre] * len(grupos),
+                          [n] * len(grupos), [[semillas[i] for i in g] for g in grupos], [tamano_bloque] * len(grupos),
+                          [tabla] * len(grupos))
+        return pd.DataFrame([r for parte in partes for r in parte])
@@ -0,0 +1,111 @@
+import streamlit as st
+import pandas as pd
+
+from calculos import (
+    COLUMNAS_CUADRO, db_temp_factors, evaluar_cuadro, lista_aislamientos, lista_materiales, lista_sistemas, lista_tablas_conductores,
+    normalizar_cuadro, tabla_conductores,
+)
+
+st.set_page_config(page_title="CEN-2004: Cuadro de Cargas", layout="wide", page_icon="⚡")
+
+st.title("📋 Cuadro de Cargas")
+st.caption("Verificacion simultanea de todos los circuitos de un tablero (Ampacidad, Caida de Tension, Canalizaciones y Cortocircuito)")
+
+COLUMNAS_RESULTADO = [
+    "i_diseno_a", "amp_real_a", "fc_agrup", "breaker_a", "ok_ampacidad", "caida_pct", "ok_caida",
+    "area_ocup_mm2", "tubo_min", "ok_canalizacion", "icc_max_ka", "ok_cortocircuito", "cumple_todo",
+    "calibre_min", "tubo_calibre_min",
+]
+
+# --- CARGA DEL CUADRO (archivo o edicion directa) ---
+if "cuadro" not in st.session_state:
+    st.session_state.cuadro = normalizar_cuadro(pd.DataFrame([{"circuito": "C-1"}]))
+    st.session_state.cuadro_version = 0
+
+col_up1, col_up2 = st.columns([3, 1])
+with col_up1:
+    archivo = st.file_uploader("Cargar cuadro de cargas (CSV)", type=["csv"], key="cuadro_csv")
+with col_up2:
+    plantilla = pd.DataFrame([COLUMNAS_CUADRO]).to_csv(index=False).encode("utf-8")
+    st.download_button("📥 Plantilla CSV", plantilla, "plantilla_cuadro_cargas.csv", "text/csv")
+
+if archivo is not None and st.session_state.get("cuadro_archivo") != archivo.file_id:
+    st.session_state.cuadro = normalizar_cuadro(pd.read_csv(archivo))
+    st.session_state.cuadro_archivo = archivo.file_id
+    st.session_state.cuadro_version += 1
+
+# La tabla de conductores es parte del cuadro: se guarda con el tablero y la usan las demas paginas
+tabla_cuadro = st.session_state.setdefault("cuadro_conductores", ("CEN", "THHN"))
+st.session_state.setdefault("cuadro_tabla", tabla_cuadro[0])
+st.session_state.setdefault("cuadro_ais", tabla_cuadro[1])
+col_tab1, col_tab2 = st.columns(2)
+with col_tab1:
+    material_cond = st.selectbox("Tabla de Conductores", lista_tablas_conductores, key="cuadro_tabla",
+                                 format_func=lambda m: "CEN (Cu, tabla historica)" if m == "CEN" else f"Catalogo {m}")
+with col_tab2:
+    aislamiento = st.selectbox("Aislamiento", lista_aislamientos, key="cuadro_ais", disabled=material_cond == "CEN")
+st.session_state.cuadro_conductores = (material_cond, aislamiento if material_cond != "CEN" else "THHN")
+conductores = tabla_conductores(*st.session_state.cuadro_conductores)
+
+st.caption("Puede pegar filas copiadas desde una hoja de calculo directamente en la tabla. Las columnas de resultados se recalculan en cada edicion.")
+
+# --- EVALUACION VECTORIZADA ---
+try:
+    vista = evaluar_cuadro(st.session_state.cuadro, conductores)
+except ValueError as e:
+    st.error(f"❌ {e}")
+    vista = st.session_state.cuadro
+
+editado = st.data_editor(
+    vista,
+    key=f"editor_cuadro_{st.session_state.cuadro_version}",
+    num_rows="dynamic",
+    width="stretch",
+    disabled=[c for c in COLUMNAS_RESULTADO if c in vista],
+    column_config={
+        "sistema": st.column_config.SelectboxColumn("sistema", options=lista_sistemas),
+        "calibre": st.column_config.SelectboxColumn("calibre", options=conductores["calibres"]),
+        "temperatura": st.column_config.SelectboxColumn("temperatura", options=list(db_temp_factors.keys())),
+        "material": st.column_config.SelectboxColumn("material", options=lista_materiales),
+        "fp": st.column_config.NumberColumn("fp", min_value=0.0, max_value=1.0, step=0.01),
+        "i_diseno_a": st.column_config.NumberColumn("I diseno (A)", format="%.2f"),
+        "amp_real_a": st.column_config.NumberColumn("Ampacidad (A)", format="%.2f"),
+        "breaker_a": st.column_config.NumberColumn("Proteccion (A)", format="%.0f"),
+        "caida_pct": st.column_config.NumberColumn("% Caida", format="%.2f"),
+        "area_ocup_mm2": st.column_config.NumberColumn("Area ocupada (mm²)", format="%.1f"),
+        "tubo_min": st.column_config.TextColumn("Tuberia minima"),
+        "icc_max_ka": st.column_config.NumberColumn("Icc max. cond. (kA)", format="%.2f"),
+        "ok_ampacidad": st.column_config.CheckboxColumn("Ampacidad"),
+        "ok_caida": st.column_config.CheckboxColumn("Caida"),
+        "ok_canalizacion": st.column_config.CheckboxColumn("Canalizacion"),
+        "ok_cortocircuito": st.column_config.CheckboxColumn("Cortocircuito"),
+        "cumple_todo": st.column_config.CheckboxColumn("CUMPLE"),
+        "calibre_min": st.column_config.TextColumn("Calibre minimo (auto)"),
+        "tubo_calibre_min": st.column_config.TextColumn("Tuberia (calibre minimo)"),
+    },
+)
+
+# Si cambiaron las entradas se guardan y se recalcula (las columnas de resultado se descartan)
+entradas = normalizar_cuadro(editado[[c for c in COLUMNAS_CUADRO if c in editado]])
+if not entradas.equals(st.session_state.cuadro):
+    st.session_state.cuadro = entradas
+    st.session_state.cuadro_version += 1
+    st.rerun()
+
+# --- RESUMEN ---
+if "cumple_todo" in vista:
+    st.markdown("---")
+    r1, r2, r3, r4, r5 = st.columns(5)
+    r1.metric("Circuitos", f"{len(vista)}")
+    r2.metric("Fallas Ampacidad", f"{(~vista['ok_ampacidad']).sum()}")
+    r3.metric("Fallas Caida", f"{(~vista['ok_caida']).sum()}")
+    r4.metric("Fallas Canalizacion", f"{(~vista['ok_canalizacion']).sum()}")
+    r5.metric("Fallas Cortocircuito", f"{(~vista['ok_cortocircuito']).sum()}")
+    col_b1, col_b2 = st.columns(2)
+    # Sustituye el calibre de cada circuito por el minimo que cumple ampacidad, caida y termico
+    if col_b1.button("⚙️ Aplicar Calibre Minimo (Auto-dimensionar)", key="aplicar_auto"):
+        aplicable = vista["calibre_min"] != "No disponible"
+        st.session_state.cuadro.loc[aplicable, "calibre"] = vista.loc[aplicable, "calibre_min"]
+        st.session_state.cuadro_version += 1
+        st.rerun()
+    col_b2.download_button("📥 Descargar Resultados (CSV)", vista.to_csv(index=False).encode("utf-8"), "cuadro_cargas_resultados.csv", "text/csv")
@@ -0,0 +1,119 @@
+import streamlit as st
+import pandas as pd
+
+from calculos import lista_aislamientos, lista_sistemas, lista_tablas_conductores, tabla_conductores
+from coordinacion import lista_interruptores
+from red import COLUMNAS_RED, FUENTE_DEFECTO, LIMITE_CAIDA_TOTAL, analizar_red, cortocircuito_red, lista_tipos_nodo, normalizar_red
+
+st.set_page_config(page_title="CEN-2004: Red de Distribucion", layout="wide", page_icon="⚡")
+
+st.title("🌳 Red de Distribucion Radial")
+st.caption("Caida de tension acumulada y corriente de cortocircuito disponible en cada tablero y circuito (tableros → alimentadores → circuitos)")
+
+# El analisis de la red (cargas, caidas, impedancias) solo se repite cuando cambia la tabla de nodos;
+# cambiar la fuente solo re-evalua Icc = E / |Z| sobre las columnas ya calculadas.
+@st.cache_data(max_entries=16, show_spinner=False)
+def analizar_red_cache(nodos, material, aislamiento):
+    return analizar_red(nodos, tabla_conductores(material, aislamiento))
+
+
+# --- FUENTE (Transformador de la acometida) ---
+st.sidebar.header("🔌 Fuente (Transformador)")
+fuente = {
+    "kva": st.sidebar.number_input("Potencia (kVA)", value=FUENTE_DEFECTO["kva"], min_value=1.0, step=25.0, key="fte_kva"),
+    "z_pct": st.sidebar.number_input("Impedancia (%Z)", value=FUENTE_DEFECTO["z_pct"], min_value=0.1, step=0.25, key="fte_z"),
+    "x_r": st.sidebar.number_input("Relacion X/R", value=FUENTE_DEFECTO["x_r"], min_value=0.1, step=0.5, key="fte_xr"),
+    "voltaje": st.sidebar.number_input("Tension Secundaria (V)", value=FUENTE_DEFECTO["voltaje"], min_value=1.0, key="fte_v"),
+}
+st.sidebar.header("🧵 Conductores")
+material_cond = st.sidebar.selectbox("Tabla de Conductores", lista_tablas_conductores, key="red_tabla",
+                                     format_func=lambda m: "CEN (Cu, tabla historica)" if m == "CEN" else f"Catalogo {m}")
+aislamiento = st.sidebar.selectbox("Aislamiento", lista_aislamientos, key="red_ais") if material_cond != "CEN" else "THHN"
+conductores = tabla_conductores(material_cond, aislamiento)
+
+RED_EJEMPLO = pd.DataFrame([
+    {"id": "ACOMETIDA", "padre": "", "tipo": "acometida", "calibre": "4/0 AWG", "longitud_m": 0.0},
+    {"id": "TP", "padre": "ACOMETIDA", "tipo": "tablero", "calibre": "4/0 AWG", "longitud_m": 15.0, "breaker_a": 250.0},
+    {"id": "TS-1", "padre": "TP", "tipo": "alimentador", "calibre": "2 AWG", "longitud_m": 30.0, "breaker_a": 100.0},
+    {"id": "TS-2", "padre": "TP", "tipo": "alimentador", "calibre": "1/0 AWG", "longitud_m": 45.0, "breaker_a": 125.0},
+    {"id": "TS-1/C1", "padre": "TS-1", "carga_va": 1800.0, "voltaje": 120.0, "sistema": "Monofásico (1F)", "calibre": "12 AWG", "longitud_m": 18.0, "breaker_a": 20.0},
+    {"id": "TS-1/C2", "padre": "TS-1", "carga_va": 1500.0, "voltaje": 120.0, "sistema": "Monofásico (1F)", "calibre": "12 AWG", "longitud_m": 25.0, "breaker_a": 20.0},
+    {"id": "TS-2/AA-1", "padre": "TS-2", "carga_va": 9000.0, "calibre": "8 AWG", "longitud_m": 12.0, "breaker_a": 40.0},
+])
+
+if "red" not in st.session_state:
+    st.session_state.red = normalizar_red(RED_EJEMPLO)
+
+col_up1, col_up2 = st.columns([3, 1])
+with col_up1:
+    archivo = st.file_uploader("Cargar red (CSV: id, padre, tipo, carga_va, voltaje, sistema, calibre, longitud_m, fp, cap_int_ka, t_despeje, breaker_a, ajuste_inst)", type=["csv"], key="red_csv")
+with col_up2:
+    st.download_button("📥 Plantilla CSV", pd.DataFrame([COLUMNAS_RED]).to_csv(index=False).encode("utf-8"), "plantilla_red.csv", "text/csv")
+
+if archivo is not None and st.session_state.get("red_archivo") != archivo.file_id:
+    st.session_state.red = normalizar_red(pd.read_csv(archivo, dtype={"id": str, "padre": str}))
+    st.session_state.red_archivo = archivo.file_id
+
+st.caption("Cada fila es un nodo; su segmento (calibre, longitud) lo une con el nodo 'padre'. La acometida no tiene padre. "
+           "cap_int_ka es la capacidad de interrupcion del tablero/proteccion del nodo. breaker_a es el interruptor en el origen del segmento "
+           "(0 = sin interruptor: se usa t_despeje) y ajuste_inst su disparo instantaneo en multiplos de In (0 = banda del catalogo).")
+nodos = st.data_editor(
+    st.session_state.red,
+    key=f"editor_red_{st.session_state.get('red_archivo')}",
+    num_rows="dynamic",
+    width="stretch",
+    column_config={
+        "tipo": st.column_config.SelectboxColumn("tipo", options=lista_tipos_nodo),
+        "sistema": st.column_config.SelectboxColumn("sistema", options=lista_sistemas),
+        "calibre": st.column_config.SelectboxColumn("calibre", options=conductores["calibres"]),
+        "fp": st.column_config.NumberColumn("fp", min_value=0.0, max_value=1.0, step=0.01),
+        "breaker_a": st.column_config.SelectboxColumn("breaker_a", options=[0.0] + [float(i) for i in lista_interruptores]),
+        "ajuste_inst": st.column_config.NumberColumn("ajuste_inst", min_value=0.0, step=0.5),
+    },
+)
+
+# --- EVALUACION (un recorrido por niveles sobre el arreglo de padres) ---
+try:
+    resultado = cortocircuito_red(analizar_red_cache(normalizar_red(nodos), material_cond, aislamiento), fuente, conductores)
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+st.markdown("---")
+if resultado.empty:
+    st.info("La red no tiene nodos: agregue al menos la acometida en la tabla.")
+    st.stop()
+peor = resultado.loc[resultado["caida_acumulada_pct"].idxmax()]
+m1, m2, m3, m4, m5, m6, m7 = st.columns(7)
+m1.metric("Nodos", f"{len(resultado)}")
+m2.metric("Niveles", f"{resultado['nivel'].max() + 1}")
+m3.metric("Caida Maxima Acumulada", f"{peor['caida_acumulada_pct']:.2f} %", peor["id"], delta_color="off")
+m4.metric(f"Nodos > {LIMITE_CAIDA_TOTAL:.0f}%", f"{(~resultado['cumple_caida_total']).sum()}")
+m5.metric("Icc Acometida", f"{resultado.loc[resultado['idx_padre'] < 0, 'icc_ka'].max():.2f} kA")
+m6.metric("Fallas Cortocircuito", f"{(~(resultado['cumple_interrupcion'] & resultado['cumple_termico'])).sum()}")
+m7.metric("Interruptores sin Selectividad", f"{(~resultado['selectivo']).sum()}")
+
+solo_fallas = st.checkbox("Mostrar solo nodos que no cumplen", key="red_solo_fallas")
+cumple = resultado["cumple_caida_total"] & resultado["cumple_interrupcion"] & resultado["cumple_termico"] & resultado["selectivo"]
+vista = resultado[~cumple] if solo_fallas else resultado
+st.dataframe(
+    vista,
+    width="stretch",
+    column_config={
+        "carga_total_va": st.column_config.NumberColumn("Carga aguas abajo (VA)", format="%.0f"),
+        "corriente_a": st.column_config.NumberColumn("I segmento (A)", format="%.2f"),
+        "caida_segmento_pct": st.column_config.NumberColumn("% Caida segmento", format="%.2f"),
+        "caida_acumulada_pct": st.column_config.NumberColumn("% Caida acumulada", format="%.2f"),
+        "cumple_caida_total": st.column_config.CheckboxColumn(f"Cumple (≤{LIMITE_CAIDA_TOTAL:.0f}%)"),
+        "icc_ka": st.column_config.NumberColumn("Icc barra (kA)", format="%.2f"),
+        "icc_origen_ka": st.column_config.NumberColumn("Icc origen segmento (kA)", format="%.2f"),
+        "t_despeje_s": st.column_config.NumberColumn("t despeje (s)", format="%.3f"),
+        "icc_max_cond_ka": st.column_config.NumberColumn("Icc max. conductor (kA)", format="%.2f"),
+        "cumple_interrupcion": st.column_config.CheckboxColumn("Cap. Interrupcion"),
+        "cumple_termico": st.column_config.CheckboxColumn("Termico Conductor"),
+        "selectivo": st.column_config.CheckboxColumn("Selectivo con Padre"),
+        "i_perdida_selectividad_ka": st.column_config.NumberColumn("Selectividad hasta (kA)", format="%.2f"),
+        "idx_padre": None, "r_acum_ohm": None, "x_acum_ohm": None,
+    },
+)
+st.download_button("📥 Descargar Resultados (CSV)", resultado.to_csv(index=False).encode("utf-8"), "red_resultados.csv", "text/csv")
@@ -0,0 +1,95 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from barrido import (
+    CARGA_REFERENCIA_VA, FACTORES_AGRUPAMIENTO, FACTORES_POTENCIA, LONGITUDES_M, grilla_ampacidad, grilla_caida, longitud_maxima,
+)
+from calculos import LIMITE_CAIDA, db_temp_factors, lista_aislamientos, lista_sistemas, lista_tablas_conductores, tabla_conductores
+
+st.set_page_config(page_title="CEN-2004: Barrido Parametrico", layout="wide", page_icon="⚡")
+
+st.title("📈 Barrido Parametrico")
+st.caption("Caida de tension y ampacidad evaluadas sobre grillas completas de calibre × longitud × factor de potencia × factores de correccion")
+
+
+# Grillas cacheadas por (voltaje, sistema, K, tabla de conductores): mover un slider solo re-corta el arreglo en cache
+@st.cache_data(max_entries=32, show_spinner=False)
+def grillas(voltaje, sistema, k_factor, material, aislamiento):
+    conductores = tabla_conductores(material, aislamiento)
+    return (grilla_caida(voltaje, k_factor, conductores=conductores)[0],
+            longitud_maxima(voltaje, k_factor, CARGA_REFERENCIA_VA, conductores=conductores)[0])
+
+
+@st.cache_data(show_spinner=False)
+def grilla_amp(material, aislamiento):
+    return grilla_ampacidad(conductores=tabla_conductores(material, aislamiento))
+
+
+# --- PARAMETROS ---
+st.sidebar.header("⚙️ Parametros del Barrido")
+voltaje = st.sidebar.selectbox("Tension de Servicio (V)", [120, 208, 480], index=1, key="bar_v")
+sistema = st.sidebar.selectbox("Sistema", lista_sistemas, index=1, key="bar_sist")
+k_factor = st.sidebar.selectbox("Factor K", [5.0, 10.0], index=0 if "Monofásico" in sistema else 1, key="bar_k")
+carga_va = st.sidebar.number_input("Carga (VA)", value=5000.0, min_value=1.0, step=100.0, key="bar_carga")
+fp = st.sidebar.select_slider("Factor Potencia", options=list(FACTORES_POTENCIA), value=0.9, key="bar_fp")
+material = st.sidebar.selectbox("Tabla de Conductores", lista_tablas_conductores, key="bar_tabla",
+                                format_func=lambda m: "CEN (Cu, tabla historica)" if m == "CEN" else f"Catalogo {m}")
+aislamiento = st.sidebar.selectbox("Aislamiento", lista_aislamientos, key="bar_ais") if material != "CEN" else "THHN"
+lista_calibres = tabla_conductores(material, aislamiento)["calibres"]
+
+caida_por_kva, lmax_por_kva = grillas(voltaje, sistema, k_factor, material, aislamiento)
+escala = carga_va / CARGA_REFERENCIA_VA
+i_fp = int(np.flatnonzero(FACTORES_POTENCIA == fp)[0])
+
+# =========================================================
+# CAÍDA DE TENSIÓN: calibre × longitud
+# =========================================================
+st.header("Caida de Tension (%) por Calibre y Longitud")
+st.subheader(f"{carga_va:.0f} VA · {voltaje} V · {sistema} · FP {fp:.2f} · K={k_factor:.1f}")
+
+caida = caida_por_kva[:, :, i_fp] * escala
+df_caida = pd.DataFrame({
+    "calibre": np.repeat(lista_calibres, len(LONGITUDES_M)),
+    "longitud_m": np.tile(LONGITUDES_M, len(lista_calibres)),
+    "caida_pct": caida.ravel(),
+})
+mapa_caida = alt.Chart(df_caida).mark_rect().encode(
+    x=alt.X("longitud_m:O", title="Longitud (m)", axis=alt.Axis(values=list(LONGITUDES_M[9::10]))),
+    y=alt.Y("calibre:N", sort=lista_calibres, title="Calibre"),
+    color=alt.Color("caida_pct:Q", title="% Caida", scale=alt.Scale(domain=[0, 2 * LIMITE_CAIDA], clamp=True, scheme="redyellowgreen", reverse=True)),
+    tooltip=["calibre", "longitud_m", alt.Tooltip("caida_pct:Q", format=".2f")],
+)
+st.altair_chart(mapa_caida, width="stretch")
+
+# --- LONGITUD MÁXIMA POR CALIBRE ---
+st.subheader(f"Longitud Maxima por Calibre (Caida ≤ {LIMITE_CAIDA:.0f}%)")
+fps_tabla = [0.8, 0.85, 0.9, 0.95, 1.0]
+idx_fps = [int(np.flatnonzero(FACTORES_POTENCIA == f)[0]) for f in fps_tabla]
+tabla_lmax = pd.DataFrame(lmax_por_kva[:, idx_fps] / escala, index=lista_calibres, columns=[f"FP {f:.2f}" for f in fps_tabla])
+st.dataframe(tabla_lmax.style.format("{:.1f} m"), width="stretch")
+
+# =========================================================
+# AMPACIDAD: calibre × FC temperatura (para un FC de agrupamiento)
+# =========================================================
+st.markdown("---")
+st.header("Ampacidad Real (A) por Calibre y Temperatura Ambiente")
+fc_agrup = st.select_slider("FC Agrupamiento", options=list(FACTORES_AGRUPAMIENTO), value=1.0, key="bar_fa")
+i_fa = int(np.flatnonzero(FACTORES_AGRUPAMIENTO == fc_agrup)[0])
+
+amp = grilla_amp(material, aislamiento)[:, :, i_fa]
+temps = list(db_temp_factors.keys())
+df_amp = pd.DataFrame({
+    "calibre": np.repeat(lista_calibres, len(temps)),
+    "temperatura": np.tile(temps, len(lista_calibres)),
+    "amp_real_a": amp.ravel(),
+})
+mapa_amp = alt.Chart(df_amp).mark_rect().encode(
+    x=alt.X("temperatura:N", sort=temps, title="Temperatura Ambiente"),
+    y=alt.Y("calibre:N", sort=lista_calibres, title="Calibre"),
+    color=alt.Color("amp_real_a:Q", title="Ampacidad (A)", scale=alt.Scale(scheme="blues")),
+    tooltip=["calibre", "temperatura", alt.Tooltip("amp_real_a:Q", format=".1f")],
+)
+texto_amp = mapa_amp.mark_text(fontSize=11).encode(text=alt.Text("amp_real_a:Q", format=".0f"), color=alt.value("black"))
+st.altair_chart(mapa_amp + texto_amp, width="stretch")
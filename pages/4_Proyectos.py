@@ -0,0 +1,107 @@
+import io
+
+import pandas as pd
+import streamlit as st
+
+from calculos import normalizar_cuadro
+from proyectos import (
+    VERIFICACIONES, calibres_proyecto, cargar_tablero, conexion, filtrar_circuitos, guardar_tablero, listar_proyectos, listar_tableros,
+    tabla_tablero,
+)
+from reporte import memoria_proyecto
+
+st.set_page_config(page_title="CEN-2004: Proyectos", layout="wide", page_icon="⚡")
+
+st.title("🗂️ Proyectos")
+st.caption("Cuadros de cargas guardados por proyecto y tablero, con resultados almacenados y re-validacion solo de los circuitos modificados")
+
+with conexion() as con:
+    proyectos = listar_proyectos(con)
+
+# --- PROYECTO Y TABLERO ACTIVOS ---
+st.sidebar.header("📁 Proyecto")
+proyecto = st.sidebar.selectbox("Proyecto existente", [""] + proyectos, key="proy_sel") or st.sidebar.text_input("Nuevo proyecto", key="proy_nuevo").strip()
+tablero = st.sidebar.text_input("Tablero", value="TP-1", key="proy_tablero").strip()
+
+if not proyecto or not tablero:
+    st.info("Seleccione o cree un proyecto y un tablero en la barra lateral.")
+    st.stop()
+
+col_g1, col_g2, col_g3 = st.columns(3)
+# Guarda el cuadro abierto en la pagina "Cuadro de Cargas", con su tabla de conductores
+if col_g1.button("💾 Guardar Cuadro Actual en el Tablero", key="proy_guardar", disabled="cuadro" not in st.session_state):
+    try:
+        with conexion() as con:
+            n = guardar_tablero(con, proyecto, tablero, st.session_state.cuadro, tabla=st.session_state.get("cuadro_conductores", ("CEN", "THHN")))
+        st.success(f"✅ Guardado: {n} circuito(s) re-evaluado(s).")
+    except ValueError as e:
+        st.error(f"❌ {e}")
+
+archivo = col_g2.file_uploader("Importar CSV al tablero", type=["csv"], key="proy_csv")
+if archivo is not None and st.session_state.get("proy_archivo") != archivo.file_id:
+    try:
+        with conexion() as con:
+            n = guardar_tablero(con, proyecto, tablero, pd.read_csv(archivo))
+        st.session_state.proy_archivo = archivo.file_id
+        st.success(f"✅ Importado: {n} circuito(s) re-evaluado(s).")
+    except ValueError as e:
+        st.error(f"❌ {e}")
+
+with conexion() as con:
+    resumen = listar_tableros(con, proyecto)
+
+if col_g3.button("📋 Abrir Tablero en Cuadro de Cargas", key="proy_abrir", disabled=tablero not in set(resumen["tablero"])):
+    with conexion() as con:
+        st.session_state.cuadro = normalizar_cuadro(cargar_tablero(con, proyecto, tablero))
+        st.session_state.cuadro_conductores = tabla_tablero(con, proyecto, tablero)
+    st.session_state.cuadro_version = st.session_state.get("cuadro_version", 0) + 1
+    st.switch_page("pages/1_Cuadro_de_Cargas.py")
+
+# =========================================================
+# RESUMEN DEL PROYECTO
+# =========================================================
+st.markdown("---")
+st.header(f"Tableros de {proyecto}")
+if resumen.empty:
+    st.info("El proyecto aun no tiene tableros guardados.")
+    st.stop()
+r1, r2, r3 = st.columns(3)
+r1.metric("Tableros", f"{len(resumen)}")
+r2.metric("Circuitos", f"{resumen['circuitos'].sum()}")
+r3.metric("Circuitos con Fallas", f"{resumen['fallas'].sum()}")
+st.dataframe(resumen, width="stretch", hide_index=True)
+
+# --- MEMORIA DE CALCULO DEL PROYECTO (portada, resumen por tablero y detalle por circuito) ---
+m1, m2 = st.columns([1, 3])
+procesos = m1.number_input("Procesos", value=1, min_value=1, max_value=16, step=1, key="proy_memoria_procesos")
+if m2.button("📄 Generar Memoria de Calculo (PDF)", key="proy_memoria"):
+    def tableros_proyecto(con):
+        # Los tableros se cargan de a uno, a medida que se renderizan
+        for nombre in resumen["tablero"]:
+            yield nombre, cargar_tablero(con, proyecto, nombre), tabla_tablero(con, proyecto, nombre)
+
+    salida = io.BytesIO()
+    with st.spinner("Generando memoria..."), conexion() as con:
+        memoria_proyecto(tableros_proyecto(con), salida, proyecto, int(procesos))
+    st.session_state.proy_memoria_pdf = (proyecto, salida.getvalue())
+if st.session_state.get("proy_memoria_pdf", (None,))[0] == proyecto:
+    st.download_button("📥 Descargar Memoria de Calculo", st.session_state.proy_memoria_pdf[1], f"memoria_{proyecto}.pdf", "application/pdf", key="proy_memoria_descarga")
+
+# --- CONSULTA DE CIRCUITOS (usa los indices por verificacion y calibre) ---
+st.subheader("Consulta de Circuitos")
+f1, f2, f3 = st.columns(3)
+falla = f1.selectbox("Que no cumplen", ["(todos)"] + list(VERIFICACIONES), key="proy_falla")
+filtro_tablero = f2.selectbox("Tablero", ["(todos)"] + list(resumen["tablero"]), key="proy_filtro_tablero")
+with conexion() as con:
+    calibres = calibres_proyecto(con, proyecto)
+calibre = f3.selectbox("Calibre", ["(todos)"] + calibres, key="proy_calibre")
+
+with conexion() as con:
+    consulta = filtrar_circuitos(
+        con, proyecto,
+        falla=None if falla == "(todos)" else falla,
+        tablero=None if filtro_tablero == "(todos)" else filtro_tablero,
+        calibre=None if calibre == "(todos)" else calibre,
+    )
+st.caption(f"{len(consulta)} circuito(s)")
+st.dataframe(consulta, width="stretch", hide_index=True)
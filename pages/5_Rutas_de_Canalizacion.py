@@ -0,0 +1,78 @@
+import pandas as pd
+import streamlit as st
+
+from calculos import lista_aislamientos, lista_materiales, lista_tablas_conductores, lista_tuberias, normalizar_cuadro, tabla_conductores
+from canalizaciones import optimizar_ruta
+
+st.set_page_config(page_title="CEN-2004: Rutas de Canalizacion", layout="wide", page_icon="⚡")
+
+st.title("🛤️ Rutas de Canalizacion")
+st.caption("Asignacion de los conductores de varios circuitos a la menor cantidad y tamaño de canalizaciones (CEN Cap. 9, 310.15)")
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def optimizar_cache(cuadro, material, tubo_max, respetar, tabla):
+    return optimizar_ruta(cuadro, material, tubo_max, respetar, tabla_conductores(*tabla))
+
+
+# --- CIRCUITOS DE LA RUTA (cuadro abierto o CSV) ---
+archivo = st.file_uploader("Cargar circuitos de la ruta (CSV, columnas del Cuadro de Cargas)", type=["csv"], key="ruta_csv")
+if archivo is not None:
+    cuadro = normalizar_cuadro(pd.read_csv(archivo))
+    material_cond = st.sidebar.selectbox("Tabla de Conductores del CSV", lista_tablas_conductores, key="ruta_tabla",
+                                         format_func=lambda m: "CEN (Cu, tabla historica)" if m == "CEN" else f"Catalogo {m}")
+    tabla = (material_cond, st.sidebar.selectbox("Aislamiento", lista_aislamientos, key="ruta_ais") if material_cond != "CEN" else "THHN")
+elif "cuadro" in st.session_state:
+    cuadro = st.session_state.cuadro
+    tabla = st.session_state.get("cuadro_conductores", ("CEN", "THHN"))
+    st.caption(f"Usando el cuadro abierto en la pagina Cuadro de Cargas (conductores {' '.join(tabla)}).")
+else:
+    st.info("Cargue un CSV o abra un cuadro en la pagina Cuadro de Cargas.")
+    st.stop()
+
+st.sidebar.header("⚙️ Parametros de la Ruta")
+material = st.sidebar.selectbox("Material de Tuberia", lista_materiales, key="ruta_mat")
+tubo_max = st.sidebar.selectbox("Diametro Maximo", ["Automatico"] + lista_tuberias, key="ruta_tubo_max")
+respetar = st.sidebar.checkbox("No degradar ampacidad por agrupamiento", value=True, key="ruta_amp")
+seleccion = st.multiselect("Circuitos en la ruta", list(cuadro["circuito"]), default=list(cuadro["circuito"]), key="ruta_circuitos")
+
+if not seleccion:
+    st.stop()
+
+try:
+    ruta = optimizar_cache(cuadro[cuadro["circuito"].isin(seleccion)], material, None if tubo_max == "Automatico" else tubo_max, respetar, tabla)
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+canal, circ = ruta["canalizaciones"], ruta["circuitos"]
+
+# =========================================================
+# RESULTADOS
+# =========================================================
+r1, r2, r3, r4 = st.columns(4)
+r1.metric("Canalizaciones", f"{len(canal)}")
+r2.metric("Suma de Diametros", f"{canal['diametro_pulg'].sum():.2f}\"")
+r3.metric("Diametro Maximo Usado", ruta["tubo_max"])
+r4.metric("Circuitos que Fallan Ampacidad", f"{(~circ['ok_ampacidad']).sum()}")
+
+if not canal["ok_canalizacion"].all():
+    st.error(f"❌ {(~canal['ok_canalizacion']).sum()} canalizacion(es) no caben en el mayor diametro disponible.")
+if (~circ["ok_ampacidad"]).any():
+    st.warning("⚠️ Hay circuitos que no cumplen ampacidad con el FC de agrupamiento de su canalizacion (o ya fallaban solos).")
+
+st.subheader("Canalizaciones")
+st.dataframe(canal, width="stretch", hide_index=True, column_config={
+    "area_ocup_mm2": st.column_config.NumberColumn("Area ocupada (mm²)", format="%.1f"),
+    "limite_pct": st.column_config.NumberColumn("Limite (%)", format="%.0f"),
+    "ocupacion_pct": st.column_config.ProgressColumn("Ocupacion (%)", format="%.1f", min_value=0, max_value=53),
+    "ok_canalizacion": st.column_config.CheckboxColumn("Cumple"),
+})
+
+st.subheader("Asignacion de Circuitos")
+st.dataframe(circ, width="stretch", hide_index=True, column_config={
+    "area_mm2": st.column_config.NumberColumn("Area (mm²)", format="%.1f"),
+    "i_diseno_a": st.column_config.NumberColumn("I diseno (A)", format="%.2f"),
+    "amp_real_a": st.column_config.NumberColumn("Ampacidad (A)", format="%.2f"),
+    "ok_ampacidad": st.column_config.CheckboxColumn("Ampacidad"),
+})
+st.download_button("📥 Descargar Asignacion (CSV)", circ.to_csv(index=False).encode("utf-8"), "ruta_canalizacion.csv", "text/csv")
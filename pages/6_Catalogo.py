@@ -0,0 +1,43 @@
+import streamlit as st
+
+import catalogo
+
+st.set_page_config(page_title="CEN-2004: Catalogo", layout="wide", page_icon="⚡")
+
+st.title("📚 Catalogo de Conductores")
+st.caption("Cobre y aluminio de 14 AWG a 2000 kcmil: ampacidad 60/75/90 °C, impedancia y area para llenado de tuberia (THHN, XHHW, USE)")
+
+AISLAMIENTOS = {"THHN": "area_thhn_mm2", "XHHW": "area_xhhw_mm2", "USE": "area_use_mm2"}
+COLUMNAS_TEMP = {"60 °C": "amp_60", "75 °C": "amp_75", "90 °C": "amp_90"}
+
+# --- FILTROS (consultas por rango sobre los indices ordenados del catalogo) ---
+f1, f2, f3, f4 = st.columns(4)
+material = f1.selectbox("Material", ["Cu", "Al"], key="cat_mat")
+aislamiento = f2.selectbox("Aislamiento", list(AISLAMIENTOS), key="cat_ais")
+temperatura = f3.selectbox("Columna de Temperatura", list(COLUMNAS_TEMP), index=1, key="cat_temp")
+i_requerida = f4.number_input("Corriente Requerida (A)", value=100.0, min_value=0.0, step=5.0, key="cat_i")
+
+col_amp = COLUMNAS_TEMP[temperatura]
+amp_max = float(catalogo.columna("conductores", col_amp).max())
+rango_amp = st.slider("Rango de Ampacidad (A)", 0.0, amp_max, (0.0, amp_max), key="cat_rango")
+
+# Calibre minimo: primera fila del indice de ampacidad a partir de la corriente requerida
+candidatos = catalogo.consultar("conductores", rangos={col_amp: (i_requerida, amp_max)}, material=material)
+candidatos = candidatos[candidatos[AISLAMIENTOS[aislamiento]].notna()]
+st.metric(f"Calibre Minimo ({material}, {aislamiento}, {temperatura}) para {i_requerida:.0f} A",
+          candidatos["calibre"].iloc[0] if len(candidatos) else "No disponible")
+
+tabla = catalogo.consultar("conductores", rangos={col_amp: rango_amp}, material=material)
+tabla = tabla[["calibre", "kcmil", "area_mm2", AISLAMIENTOS[aislamiento], "r_ohm_km", "x_ohm_km", "amp_60", "amp_75", "amp_90"]]
+tabla = tabla[tabla[AISLAMIENTOS[aislamiento]].notna()]
+
+if tabla.empty:
+    st.warning("⚠️ Ningun conductor del catalogo cumple los filtros.")
+    st.stop()
+
+st.dataframe(tabla, width="stretch", hide_index=True, column_config={
+    "area_mm2": st.column_config.NumberColumn("Seccion (mm²)", format="%.2f"),
+    AISLAMIENTOS[aislamiento]: st.column_config.NumberColumn(f"Area {aislamiento} (mm²)", format="%.2f"),
+    "r_ohm_km": st.column_config.NumberColumn("R (Ω/km)", format="%.3f"),
+    "x_ohm_km": st.column_config.NumberColumn("X (Ω/km)", format="%.3f"),
+})
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from calculos import normalizar_cuadro, tabla_conductores
+from perfiles import HORAS_ANIO, TIPOS_PERFIL, bloques_perfil, leer_perfiles_csv, perfil_tipico, simular
+
+st.set_page_config(page_title="CEN-2004: Perfiles de Carga", layout="wide", page_icon="⚡")
+
+st.title("📊 Perfiles de Carga Anuales")
+st.caption("Perdidas I²R (kWh/año), horas sobre la ampacidad corregida y caida de tension pico con perfiles horarios o de 15 minutos")
+
+perfil_cache = st.cache_data(max_entries=16, show_spinner=False)(perfil_tipico)
+
+# --- CIRCUITOS (cuadro abierto en Cuadro de Cargas, o un circuito con los valores por defecto) ---
+if "cuadro" in st.session_state:
+    cuadro = st.session_state.cuadro
+    tabla = st.session_state.get("cuadro_conductores", ("CEN", "THHN"))
+    st.caption(f"Usando el cuadro abierto en la pagina Cuadro de Cargas ({len(cuadro)} circuitos, conductores {' '.join(tabla)}).")
+else:
+    cuadro = normalizar_cuadro(pd.DataFrame([{"circuito": "C-1"}]))
+    tabla = ("CEN", "THHN")
+    st.caption("No hay un cuadro abierto: se simula un circuito con los valores por defecto.")
+
+st.sidebar.header("⚙️ Perfil")
+resolucion = st.sidebar.radio("Resolucion", ["Horaria (8760)", "15 minutos (35040)"], key="perf_res")
+pasos_por_hora = 1 if resolucion.startswith("Horaria") else 4
+origen = st.sidebar.radio("Origen del Perfil", ["Tipico", "Archivo CSV"], key="perf_origen")
+costo_kwh = st.sidebar.number_input("Costo de la Energia (por kWh)", value=0.10, min_value=0.0, step=0.01, format="%.3f", key="perf_costo")
+
+if origen == "Tipico":
+    tipo = st.sidebar.selectbox("Tipo de Carga", TIPOS_PERFIL, index=2, key="perf_tipo")
+    perfil = perfil_cache(tipo, pasos_por_hora)
+    bloques = bloques_perfil(perfil)
+else:
+    st.sidebar.caption("CSV en p.u. de carga_va: una columna por circuito (nombre del circuito) o una columna 'perfil' comun. Puede abarcar varios años.")
+    archivo = st.sidebar.file_uploader("Perfil (CSV)", type=["csv"], key="perf_csv")
+    if archivo is None:
+        st.info("Cargue un archivo de perfil en la barra lateral.")
+        st.stop()
+    perfil = None
+    bloques = leer_perfiles_csv(archivo, list(cuadro["circuito"]))
+
+try:
+    resumen = simular(cuadro, bloques, 1.0 / pasos_por_hora, costo_kwh, tabla_conductores(*tabla))
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+# =========================================================
+# RESULTADOS POR CIRCUITO
+# =========================================================
+r1, r2, r3, r4 = st.columns(4)
+r1.metric("Perdidas Totales", f"{resumen['perdidas_kwh_anio'].sum():,.0f} kWh/año")
+r2.metric("Costo de Perdidas", f"{resumen['costo_perdidas_anio'].sum():,.2f} /año")
+r3.metric("Circuitos sobre Ampacidad", f"{(resumen['horas_sobre_amp_anio'] > 0).sum()}")
+r4.metric("Caida Pico Maxima", f"{resumen['caida_pico_pct'].max():.2f} %")
+
+st.dataframe(resumen, width="stretch", hide_index=True, column_config={
+    "energia_kwh_anio": st.column_config.NumberColumn("Energia (kWh/año)", format="%.0f"),
+    "perdidas_kwh_anio": st.column_config.NumberColumn("Perdidas (kWh/año)", format="%.1f"),
+    "perdidas_pct": st.column_config.NumberColumn("Perdidas (%)", format="%.2f"),
+    "costo_perdidas_anio": st.column_config.NumberColumn("Costo perdidas/año", format="%.2f"),
+    "i_pico_a": st.column_config.NumberColumn("I pico (A)", format="%.1f"),
+    "i_rms_a": st.column_config.NumberColumn("I rms (A)", format="%.1f"),
+    "amp_real_a": st.column_config.NumberColumn("Ampacidad (A)", format="%.1f"),
+    "horas_sobre_amp_anio": st.column_config.NumberColumn("Horas > Ampacidad", format="%.2f"),
+    "caida_pico_pct": st.column_config.NumberColumn("% Caida pico", format="%.2f"),
+    "ahorro_kwh_anio": st.column_config.NumberColumn("Ahorro calibre sup. (kWh/año)", format="%.1f"),
+    "ahorro_anio": st.column_config.NumberColumn("Ahorro calibre sup./año", format="%.2f"),
+})
+st.download_button("📥 Descargar Resultados (CSV)", resumen.to_csv(index=False).encode("utf-8"), "perfiles_resultados.csv", "text/csv")
+
+# --- FORMA DEL PERFIL (semana tipica de invierno y de verano) ---
+if perfil is not None:
+    st.subheader("Perfil (p.u.) — Semana de Enero y de Julio")
+    semana = 7 * 24 * pasos_por_hora
+    julio = 181 * 24 * pasos_por_hora
+    st.line_chart(pd.DataFrame({"Enero": perfil[:semana], "Julio": perfil[julio:julio + semana]}, index=np.arange(semana) / pasos_por_hora))
+    st.caption(f"Factor de carga anual: {perfil[:HORAS_ANIO * pasos_por_hora].mean():.2f}")
@@ -0,0 +1,74 @@
+import pandas as pd
+import streamlit as st
+
+from calculos import normalizar_cuadro
+from montecarlo import DISTRIBUCIONES, INCERTIDUMBRE_DEFECTO, PERCENTILES, analizar
+
+st.set_page_config(page_title="CEN-2004: Robustez", layout="wide", page_icon="⚡")
+
+st.title("🎲 Analisis de Robustez (Monte Carlo)")
+st.caption("Probabilidad de incumplir cada verificacion CEN cuando carga, longitud, FP, temperatura ambiente y tiempo de despeje son inciertos")
+
+analizar_cache = st.cache_data(max_entries=16, show_spinner="Muestreando...")(analizar)
+
+if "cuadro" in st.session_state:
+    cuadro = st.session_state.cuadro
+    tabla = st.session_state.get("cuadro_conductores", ("CEN", "THHN"))
+    st.caption(f"Usando el cuadro abierto en la pagina Cuadro de Cargas ({len(cuadro)} circuitos, conductores {' '.join(tabla)}).")
+else:
+    cuadro = normalizar_cuadro(pd.DataFrame([{"circuito": "C-1"}]))
+    tabla = ("CEN", "THHN")
+    st.caption("No hay un cuadro abierto: se analiza un circuito con los valores por defecto.")
+
+# --- DISTRIBUCIONES (factores sobre el valor nominal; temperatura en °C) ---
+st.sidebar.header("🎯 Incertidumbre")
+ETIQUETAS = {
+    "carga_va": "Carga (factor)", "longitud_m": "Longitud (factor)", "fp": "Factor de Potencia (factor)",
+    "temperatura_c": "Temperatura Ambiente (°C)", "t_despeje": "Tiempo de Despeje (factor)",
+}
+PARAMETROS = {"uniforme": ["min", "max"], "normal": ["media", "desv"], "triangular": ["min", "moda", "max"], "fija": []}
+DEFECTO_TEMPERATURA = {"uniforme": (30.0, 45.0), "normal": (35.0, 4.0), "triangular": (28.0, 35.0, 45.0)}
+DEFECTO_FACTOR = {"uniforme": (0.9, 1.1), "normal": (1.0, 0.1), "triangular": (0.8, 1.0, 1.3)}
+
+incertidumbre = {}
+for variable, etiqueta in ETIQUETAS.items():
+    defecto = INCERTIDUMBRE_DEFECTO[variable]
+    tipo = st.sidebar.selectbox(etiqueta, DISTRIBUCIONES, index=DISTRIBUCIONES.index(defecto[0]), key=f"mc_{variable}")
+    if tipo == defecto[0]:
+        valores = defecto[1:]
+    else:
+        valores = (DEFECTO_TEMPERATURA if variable == "temperatura_c" else DEFECTO_FACTOR).get(tipo, ())
+    cols = st.sidebar.columns(max(1, len(PARAMETROS[tipo])))
+    params = tuple(
+        col.number_input(nombre, value=float(v), step=0.01, format="%.2f", key=f"mc_{variable}_{tipo}_{nombre}")
+        for col, nombre, v in zip(cols, PARAMETROS[tipo], valores)
+    )
+    incertidumbre[variable] = (tipo, *params)
+
+st.sidebar.header("⚙️ Simulacion")
+n = st.sidebar.select_slider("Muestras por Circuito", [10_000, 100_000, 1_000_000], value=100_000, key="mc_n")
+semilla = st.sidebar.number_input("Semilla", value=0, min_value=0, step=1, key="mc_semilla")
+trabajadores = st.sidebar.number_input("Procesos", value=1, min_value=1, max_value=16, step=1, key="mc_procesos")
+
+try:
+    resultado = analizar_cache(cuadro, incertidumbre, n, int(semilla), int(trabajadores), tabla=tuple(tabla))
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+# =========================================================
+# RESULTADOS
+# =========================================================
+r1, r2, r3, r4 = st.columns(4)
+r1.metric("P(falla) Ampacidad max.", f"{resultado['p_falla_ampacidad'].max():.1%}")
+r2.metric("P(falla) Caida max.", f"{resultado['p_falla_caida'].max():.1%}")
+r3.metric("P(falla) Cortocircuito max.", f"{resultado['p_falla_cortocircuito'].max():.1%}")
+r4.metric("Circuitos con P(falla) > 5%", f"{(resultado['p_falla_alguna'] > 0.05).sum()}")
+
+formato_p = {c: st.column_config.ProgressColumn(c.replace("p_falla_", "P falla "), format="percent", min_value=0, max_value=1)
+             for c in resultado if c.startswith("p_falla_")}
+st.dataframe(resultado, width="stretch", hide_index=True, column_config=formato_p)
+st.caption(f"Percentiles P{', P'.join(map(str, PERCENTILES))} de % caida, margen de ampacidad (ampacidad - I diseño, A) y margen termico (Icc max. conductor - Icc tablero, kA).")
+
+st.subheader("Probabilidad de Falla por Circuito")
+st.bar_chart(resultado.set_index("circuito")[["p_falla_ampacidad", "p_falla_caida", "p_falla_canalizacion", "p_falla_cortocircuito"]], stack=False)
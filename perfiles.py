@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from calculos import (
+    CONDUCTORES_CEN, caida_tension, corriente_carga, db_temp_factors, es_trifasico, indices_tabla, normalizar_cuadro,
+    verificar_ampacidad,
+)
+
+# =========================================================
+# PERFILES DE CARGA: simulacion anual (8760 h o 35040 pasos de 15 min)
+# =========================================================
+# Un perfil es una matriz [pasos, circuitos] en p.u. de la carga_va de cada circuito (o una sola columna
+# compartida por todo el tablero). Se procesa por bloques de pasos: cada bloque solo suma I², cuenta horas
+# sobre la ampacidad y guarda maximos, asi un perfil de varios años nunca se materializa completo.
+HORAS_ANIO = 8760
+TAMANO_BLOQUE = 8760
+TIPOS_PERFIL = ["Constante", "Residencial", "HVAC", "Carga VE", "Oficina"]
+
+
+def perfil_tipico(tipo, pasos_por_hora=1, anios=1, semilla=0):
+    # Perfil sintetico en p.u. (maximo 1.0) con forma diaria, diferencia fin de semana y estacionalidad
+    t = np.arange(HORAS_ANIO * anios * pasos_por_hora) / pasos_por_hora
+    hora, dia = t % 24, (t // 24) % 365
+    estacion = 0.5 - 0.5 * np.cos(2 * np.pi * (dia - 15) / 365) # 0 en enero, 1 en julio
+    laborable = (t // 24) % 7 < 5
+    if tipo == "Constante":
+        return np.ones_like(t)
+    if tipo == "Residencial":
+        pu = 0.25 + 0.35 * np.exp(-((hora - 7.5) / 1.5) ** 2) + 0.65 * np.exp(-((hora - 20) / 2.5) ** 2)
+    elif tipo == "HVAC":
+        pu = (0.2 + 0.8 * estacion) * (0.35 + 0.65 * np.clip(np.sin(np.pi * (hora - 7) / 14), 0, None))
+    elif tipo == "Carga VE":
+        pu = np.where((hora >= 19) | (hora < 2), 1.0, 0.05) * np.where(laborable, 1.0, 0.4)
+    elif tipo == "Oficina":
+        pu = np.where(laborable & (hora >= 8) & (hora < 18), 0.9, 0.15) + 0.1 * estacion
+    else:
+        raise ValueError(f"Perfil no reconocido: {tipo}")
+    ruido = 1 + 0.05 * np.random.default_rng(semilla).standard_normal(t.shape)
+    pu = np.clip(pu * ruido, 0, None)
+    return pu / pu.max()
+
+
+def bloques_perfil(perfil, tamano_bloque=TAMANO_BLOQUE):
+    # Divide un perfil en memoria en bloques de pasos (vistas, sin copiar)
+    perfil = np.asarray(perfil, dtype=float)
+    for inicio in range(0, len(perfil), tamano_bloque):
+        yield perfil[inicio:inicio + tamano_bloque]
+
+
+def leer_perfiles_csv(ruta, circuitos, tamano_bloque=TAMANO_BLOQUE):
+    # Bloques [pasos, circuitos] desde un CSV con una columna por circuito (o una columna "perfil" comun a todos)
+    for bloque in pd.read_csv(ruta, chunksize=tamano_bloque):
+        if "perfil" in bloque:
+            yield bloque["perfil"].to_numpy(float)
+        else:
+            faltantes = [c for c in circuitos if c not in bloque]
+            if faltantes:
+                raise ValueError(f"Circuitos sin perfil: {', '.join(faltantes)}")
+            yield bloque[list(circuitos)].to_numpy(float)
+
+
+def datos_circuitos(cuadro, conductores=None):
+    # Constantes por circuito (no dependen del paso de tiempo); conductores: tabla de calculos.tabla_conductores()
+    conductores = conductores or CONDUCTORES_CEN
+    cuadro = normalizar_cuadro(cuadro)
+    idx_cal = indices_tabla(cuadro["calibre"], conductores["calibres"], "Calibre")
+    fc_temp = cuadro["temperatura"].map(db_temp_factors)
+    if fc_temp.isna().any():
+        raise ValueError(f"Rango de temperatura no reconocido: {', '.join(sorted(set(cuadro['temperatura'][fc_temp.isna()])))}")
+    trifasico = es_trifasico(cuadro["sistema"])
+    carga = cuadro["carga_va"].to_numpy(float)
+    voltaje = cuadro["voltaje"].to_numpy(float)
+    amp = verificar_ampacidad(corriente_carga(carga, voltaje, trifasico), idx_cal, fc_temp.to_numpy(float), cuadro["n_conductores"].to_numpy(), conductores)
+    # Caida (%) por VA: la formula es lineal en la carga
+    caida_va = caida_tension(1.0, voltaje, cuadro["longitud_m"].to_numpy(float), idx_cal, cuadro["fp"].to_numpy(float), np.where(trifasico, 10.0, 5.0), conductores)["caida_pct"]
+    return cuadro, {
+        "tabla": conductores,
+        "idx_calibre": idx_cal,
+        "carga_va": carga,
+        "i_por_va": corriente_carga(1.0, voltaje, trifasico),
+        "amp_real": amp["amp_real"],
+        "caida_por_va": caida_va,
+        # Conductores con corriente de carga: fase y neutro en 1F, tres fases equilibradas en 3F
+        "conductores": np.where(trifasico, 3, 2),
+        "longitud_km": cuadro["longitud_m"].to_numpy(float) / 1000,
+        "fp": cuadro["fp"].to_numpy(float),
+    }
+
+
+def acumular(bloques, datos, horas_por_paso=1.0):
+    # Recorre los bloques [pasos, circuitos] (o [pasos] comun) en p.u. y devuelve los acumulados por circuito
+    n = len(datos["carga_va"])
+    acum = {"pasos": 0, "suma_i2": np.zeros(n), "suma_va": np.zeros(n), "pasos_sobre_amp": np.zeros(n, dtype=int), "va_max": np.zeros(n)}
+    for pu in bloques:
+        pu = np.asarray(pu, dtype=float)
+        va = (pu[:, None] if pu.ndim == 1 else pu) * datos["carga_va"]
+        i = va * datos["i_por_va"]
+        acum["pasos"] += len(va)
+        acum["suma_i2"] += np.einsum("ij,ij->j", i, i)
+        acum["suma_va"] += va.sum(axis=0)
+        acum["pasos_sobre_amp"] += (i > datos["amp_real"]).sum(axis=0)
+        acum["va_max"] = np.maximum(acum["va_max"], va.max(axis=0, initial=0.0))
+    acum["horas_por_paso"] = horas_por_paso
+    return acum
+
+
+def perdidas_por_calibre(acum, datos):
+    # kWh de perdidas I²R de cada circuito con cada calibre de la tabla: [circuitos, calibres]
+    k = datos["conductores"] * datos["longitud_km"] * acum["horas_por_paso"] / 1000
+    return (acum["suma_i2"] * k)[:, None] * datos["tabla"]["R"][None, :]
+
+
+def resumen_anual(cuadro, acum, datos, costo_kwh=0.0):
+    # Resultados por circuito, escalados a un año
+    anios = max(acum["pasos"] * acum["horas_por_paso"] / HORAS_ANIO, 1e-12)
+    perdidas = perdidas_por_calibre(acum, datos) / anios
+    idx = datos["idx_calibre"]
+    filas = np.arange(len(idx))
+    perdidas_actual = perdidas[filas, idx]
+    calibres = datos["tabla"]["calibres"]
+    siguiente = np.minimum(idx + 1, len(calibres) - 1)
+    energia = acum["suma_va"] * datos["fp"] * acum["horas_por_paso"] / 1000 / anios
+    with np.errstate(divide="ignore", invalid="ignore"):
+        perdidas_pct = np.where(energia > 0, perdidas_actual / energia * 100, 0.0)
+    return pd.DataFrame({
+        "circuito": cuadro["circuito"],
+        "calibre": cuadro["calibre"],
+        "energia_kwh_anio": energia,
+        "perdidas_kwh_anio": perdidas_actual,
+        "perdidas_pct": perdidas_pct,
+        "costo_perdidas_anio": perdidas_actual * costo_kwh,
+        "i_pico_a": acum["va_max"] * datos["i_por_va"],
+        "i_rms_a": np.sqrt(acum["suma_i2"] / max(acum["pasos"], 1)),
+        "amp_real_a": datos["amp_real"],
+        "horas_sobre_amp_anio": acum["pasos_sobre_amp"] * acum["horas_por_paso"] / anios,
+        "caida_pico_pct": acum["va_max"] * datos["caida_por_va"],
+        "calibre_superior": np.array(calibres, dtype=object)[siguiente],
+        "ahorro_kwh_anio": perdidas_actual - perdidas[filas, siguiente],
+        "ahorro_anio": (perdidas_actual - perdidas[filas, siguiente]) * costo_kwh,
+    })
+
+
+def simular(cuadro, bloques, horas_por_paso=1.0, costo_kwh=0.0, conductores=None):
+    # Simulacion completa: constantes por circuito, recorrido por bloques y resumen anual
+    cuadro, datos = datos_circuitos(cuadro, conductores)
+    return resumen_anual(cuadro, acumular(bloques, datos, horas_por_paso), datos, costo_kwh)
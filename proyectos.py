@@ -0,0 +1,218 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from calculos import COLUMNAS_CUADRO, evaluar_cuadro, lista_aislamientos, normalizar_cuadro, tabla_conductores
+
+# =========================================================
+# ALMACÉN DE PROYECTOS (SQLite): proyectos -> tableros -> circuitos
+# =========================================================
+# Cada circuito guarda sus entradas (columnas del Cuadro de Cargas), los resultados de las
+# cuatro verificaciones y un hash de las entradas. Al guardar, solo se re-evaluan las filas
+# cuyo hash cambio; los resultados se escriben con upserts por lotes. Cada tablero guarda tambien su
+# tabla de conductores (material, aislamiento de calculos.tabla_conductores); si cambia se re-evalua todo.
+RUTA_DB = os.environ.get("CEN_PROYECTOS_DB", "proyectos_cen.db")
+
+ENTRADAS = [c for c in COLUMNAS_CUADRO if c != "circuito"]
+RESULTADOS = {
+    "i_diseno_a": "REAL", "amp_real_a": "REAL", "fc_agrup": "REAL", "breaker_a": "REAL", "ok_ampacidad": "INTEGER",
+    "caida_pct": "REAL", "ok_caida": "INTEGER", "area_ocup_mm2": "REAL", "tubo_min": "TEXT", "ok_canalizacion": "INTEGER",
+    "icc_max_ka": "REAL", "ok_cortocircuito": "INTEGER", "cumple_todo": "INTEGER", "calibre_min": "TEXT", "tubo_calibre_min": "TEXT",
+}
+VERIFICACIONES = {"ampacidad": "ok_ampacidad", "caida": "ok_caida", "canalizacion": "ok_canalizacion", "cortocircuito": "ok_cortocircuito", "todas": "cumple_todo"}
+
+
+def _tipo_sql(defecto):
+    return "TEXT" if isinstance(defecto, str) else "INTEGER" if isinstance(defecto, int) else "REAL"
+
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS proyectos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    creado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tableros (
+    id INTEGER PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyectos(id) ON DELETE CASCADE,
+    nombre TEXT NOT NULL,
+    conductores TEXT NOT NULL DEFAULT 'CEN',
+    aislamiento TEXT NOT NULL DEFAULT 'THHN',
+    UNIQUE (proyecto_id, nombre)
+);
+CREATE TABLE IF NOT EXISTS circuitos (
+    tablero_id INTEGER NOT NULL REFERENCES tableros(id) ON DELETE CASCADE,
+    circuito TEXT NOT NULL,
+    {", ".join(f"{c} {_tipo_sql(COLUMNAS_CUADRO[c])}" for c in ENTRADAS)},
+    {", ".join(f"{c} {t}" for c, t in RESULTADOS.items())},
+    hash_entradas INTEGER NOT NULL,
+    PRIMARY KEY (tablero_id, circuito)
+);
+CREATE INDEX IF NOT EXISTS idx_circuitos_calibre ON circuitos (calibre, tablero_id);
+{"".join(f"CREATE INDEX IF NOT EXISTS idx_falla_{v} ON circuitos (tablero_id) WHERE {col} = 0;" for v, col in VERIFICACIONES.items())}
+"""
+
+
+@contextlib.contextmanager
+def conexion(ruta=None):
+    # Una conexion por uso (SQLite es local y abrirla es barato); confirma al salir sin error
+    con = sqlite3.connect(ruta or RUTA_DB)
+    try:
+        con.execute("PRAGMA foreign_keys = ON")
+        con.execute("PRAGMA journal_mode = WAL")
+        con.executescript(ESQUEMA)
+        _migrar(con)
+        with con:
+            yield con
+    finally:
+        con.close()
+
+
+def _migrar(con):
+    # Bases creadas antes de que los tableros guardaran su tabla de conductores: todos usaban la historica
+    existentes = {fila[1] for fila in con.execute("PRAGMA table_info(tableros)")}
+    for columna, defecto in (("conductores", "CEN"), ("aislamiento", "THHN")):
+        if columna not in existentes:
+            con.execute(f"ALTER TABLE tableros ADD COLUMN {columna} TEXT NOT NULL DEFAULT '{defecto}'")
+
+
+def hash_entradas(cuadro):
+    # Hash estable por fila de las entradas (int64 para SQLite)
+    return pd.util.hash_pandas_object(cuadro[["circuito"] + ENTRADAS], index=False).to_numpy().view(np.int64)
+
+
+def _id_tablero(con, proyecto, tablero, crear=True):
+    if crear:
+        con.execute("INSERT OR IGNORE INTO proyectos (nombre, creado) VALUES (?, ?)", (proyecto, datetime.datetime.now().isoformat(timespec="seconds")))
+    fila = con.execute("SELECT id FROM proyectos WHERE nombre = ?", (proyecto,)).fetchone()
+    if fila is None:
+        raise ValueError(f"Proyecto inexistente: {proyecto}")
+    if crear:
+        con.execute("INSERT OR IGNORE INTO tableros (proyecto_id, nombre) VALUES (?, ?)", (fila[0], tablero))
+    fila = con.execute("SELECT id FROM tableros WHERE proyecto_id = ? AND nombre = ?", (fila[0], tablero)).fetchone()
+    if fila is None:
+        raise ValueError(f"Tablero inexistente: {proyecto} / {tablero}")
+    return fila[0]
+
+
+def _upsert(con, tablero_id, evaluado, hashes):
+    columnas = ["tablero_id", "circuito"] + ENTRADAS + list(RESULTADOS) + ["hash_entradas"]
+    datos = evaluado[["circuito"] + ENTRADAS + list(RESULTADOS)].astype(object)
+    for col, tipo in RESULTADOS.items():
+        if tipo == "INTEGER":
+            datos[col] = evaluado[col].astype(int)
+    filas = [(tablero_id, *fila, int(h)) for fila, h in zip(datos.itertuples(index=False, name=None), hashes)]
+    con.executemany(
+        f"INSERT INTO circuitos ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))}) "
+        f"ON CONFLICT (tablero_id, circuito) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columnas[2:])}",
+        filas,
+    )
+
+
+def guardar_tablero(con, proyecto, tablero, cuadro, reemplazar=True, tabla=None):
+    # Guarda el cuadro re-validando solo las filas nuevas o con entradas distintas a las almacenadas.
+    # tabla = (material, aislamiento); None conserva la del tablero (la historica si es nuevo).
+    # Devuelve el numero de filas re-evaluadas.
+    cuadro = normalizar_cuadro(cuadro)
+    if cuadro["circuito"].duplicated().any():
+        raise ValueError(f"Circuitos duplicados: {', '.join(sorted(set(cuadro['circuito'][cuadro['circuito'].duplicated()])))}")
+    tablero_id = _id_tablero(con, proyecto, tablero)
+    almacenada = tuple(con.execute("SELECT conductores, aislamiento FROM tableros WHERE id = ?", (tablero_id,)).fetchone())
+    tabla = tuple(tabla) if tabla is not None else almacenada
+    conductores = tabla_conductores(*tabla)
+
+    almacenados = dict(con.execute("SELECT circuito, hash_entradas FROM circuitos WHERE tablero_id = ?", (tablero_id,)).fetchall())
+    hashes = hash_entradas(cuadro)
+    # Otra tabla de conductores cambia los resultados de todas las filas
+    vigentes = almacenados if tabla == almacenada else {}
+    if tabla != almacenada:
+        con.execute("UPDATE tableros SET conductores = ?, aislamiento = ? WHERE id = ?", (*tabla, tablero_id))
+    cambiados = np.array([vigentes.get(c) != h for c, h in zip(cuadro["circuito"], hashes.tolist())], dtype=bool)
+    if cambiados.any():
+        _upsert(con, tablero_id, evaluar_cuadro(cuadro[cambiados], conductores), hashes[cambiados])
+
+    if reemplazar:
+        eliminados = set(almacenados) - set(cuadro["circuito"])
+        con.executemany("DELETE FROM circuitos WHERE tablero_id = ? AND circuito = ?", [(tablero_id, c) for c in eliminados])
+    return int(cambiados.sum())
+
+
+def actualizar_tablero(con, proyecto, tablero, **datos_tablero):
+    # Cambia datos comunes del tablero (p. ej. voltaje, sistema, icc_tablero_ka) en todos sus circuitos:
+    # todas sus filas dependen de ellos, asi que se re-validan juntas.
+    desconocidas = set(datos_tablero) - set(ENTRADAS)
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {', '.join(sorted(desconocidas))}")
+    cuadro = cargar_tablero(con, proyecto, tablero)[["circuito"] + ENTRADAS].assign(**datos_tablero)
+    return guardar_tablero(con, proyecto, tablero, cuadro)
+
+
+def tabla_tablero(con, proyecto, tablero):
+    # (material, aislamiento) de la tabla de conductores con que se evaluo el tablero
+    tablero_id = _id_tablero(con, proyecto, tablero, crear=False)
+    return tuple(con.execute("SELECT conductores, aislamiento FROM tableros WHERE id = ?", (tablero_id,)).fetchone())
+
+
+def cargar_tablero(con, proyecto, tablero):
+    # Entradas y resultados almacenados (sin recalcular)
+    tablero_id = _id_tablero(con, proyecto, tablero, crear=False)
+    tabla = pd.read_sql_query(
+        f"SELECT circuito, {', '.join(ENTRADAS)}, {', '.join(RESULTADOS)} FROM circuitos WHERE tablero_id = ? ORDER BY rowid",
+        con, params=(tablero_id,),
+    )
+    return _tipos_resultado(tabla)
+
+
+def filtrar_circuitos(con, proyecto, falla=None, tablero=None, calibre=None):
+    # Circuitos del proyecto que no cumplen la verificacion indicada, con filtros opcionales por tablero y calibre
+    condiciones, params = ["p.nombre = ?"], [proyecto]
+    if falla is not None:
+        condiciones.append(f"c.{VERIFICACIONES[falla]} = 0")
+    if tablero is not None:
+        condiciones.append("t.nombre = ?")
+        params.append(tablero)
+    if calibre is not None:
+        condiciones.append("c.calibre = ?")
+        params.append(calibre)
+    tabla = pd.read_sql_query(
+        f"SELECT t.nombre AS tablero, c.circuito, {', '.join('c.' + e for e in ENTRADAS)}, {', '.join('c.' + r for r in RESULTADOS)} "
+        f"FROM circuitos c JOIN tableros t ON t.id = c.tablero_id JOIN proyectos p ON p.id = t.proyecto_id "
+        f"WHERE {' AND '.join(condiciones)}",
+        con, params=params,
+    )
+    return _tipos_resultado(tabla)
+
+
+def _tipos_resultado(tabla):
+    for col, tipo in RESULTADOS.items():
+        if tipo == "INTEGER":
+            tabla[col] = tabla[col].astype(bool)
+    return tabla
+
+
+def listar_proyectos(con):
+    return [n for (n,) in con.execute("SELECT nombre FROM proyectos ORDER BY nombre")]
+
+
+def listar_tableros(con, proyecto):
+    return pd.read_sql_query(
+        "SELECT t.nombre AS tablero, t.conductores, t.aislamiento, COUNT(c.circuito) AS circuitos, "
+        "COALESCE(SUM(1 - c.cumple_todo), 0) AS fallas "
+        "FROM tableros t JOIN proyectos p ON p.id = t.proyecto_id LEFT JOIN circuitos c ON c.tablero_id = t.id "
+        "WHERE p.nombre = ? GROUP BY t.id ORDER BY t.nombre",
+        con, params=(proyecto,),
+    )
+
+
+def calibres_proyecto(con, proyecto):
+    # Calibres usados en el proyecto (de cualquier tabla de conductores), de menor a mayor, para filtrar circuitos
+    usados = {c for (c,) in con.execute(
+        "SELECT DISTINCT c.calibre FROM circuitos c JOIN tableros t ON t.id = c.tablero_id JOIN proyectos p ON p.id = t.proyecto_id "
+        "WHERE p.nombre = ?", (proyecto,),
+    )}
+    orden = [c for m in ("Cu", "Al", "CEN") for a in lista_aislamientos for c in tabla_conductores(m, a)["calibres"]]
+    return [c for c in dict.fromkeys(orden) if c in usados] + sorted(usados - set(orden))
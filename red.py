@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+from calculos import (
+    CONDUCTORES_CEN, caida_tension, corriente_carga, es_trifasico, indices_tabla, normalizar_tabla, verificacion_termica,
+)
+from coordinacion import selectividad, tiempo_despeje
+
+# =========================================================
+# RED RADIAL (tableros -> alimentadores -> circuitos): caida acumulada y cortocircuito
+# =========================================================
+# Cada nodo representa el tablero/carga al final de un segmento; el segmento une el nodo con su padre.
+# La raiz (acometida) no tiene padre ni segmento. La red se guarda como arreglos: padre[i] es el
+# indice del nodo padre (-1 en la raiz) y los recorridos se hacen por niveles de profundidad.
+COLUMNAS_RED = {
+    "id": "",
+    "padre": "",
+    "tipo": "circuito",
+    "carga_va": 0.0,
+    "voltaje": 208.0,
+    "sistema": "Trifásico (3F)",
+    "calibre": "4/0 AWG",
+    "longitud_m": 0.0,
+    "fp": 0.90,
+    "cap_int_ka": 10.0,
+    "t_despeje": 0.5,
+    "breaker_a": 0.0,
+    "ajuste_inst": 0.0,
+}
+lista_tipos_nodo = ["acometida", "tablero", "alimentador", "circuito"]
+
+LIMITE_CAIDA_TOTAL = 5.0 # % acumulado alimentador + circuito ramal (CEN 215.2 / 210.19)
+
+# Transformador trifasico que alimenta la acometida
+FUENTE_DEFECTO = {"kva": 500.0, "z_pct": 5.75, "x_r": 5.0, "voltaje": 208.0}
+
+
+def normalizar_red(nodos):
+    return normalizar_tabla(nodos, COLUMNAS_RED)
+
+
+def indexar_red(nodos):
+    # Convierte la tabla de nodos en arreglos: indice del padre y lista de niveles (raices primero)
+    ids = pd.Index(nodos["id"])
+    if ids.has_duplicates:
+        raise ValueError(f"Nodos duplicados: {', '.join(sorted(set(ids[ids.duplicated()])))}")
+
+    tiene_padre = nodos["padre"].to_numpy(str) != ""
+    padre = np.full(len(nodos), -1, dtype=np.intp)
+    padre[tiene_padre] = ids.get_indexer(nodos["padre"][tiene_padre])
+    if (padre[tiene_padre] < 0).any():
+        faltantes = sorted(set(nodos["padre"][tiene_padre][padre[tiene_padre] < 0]))
+        raise ValueError(f"Padre inexistente: {', '.join(faltantes)}")
+
+    # Hijos agrupados por padre (estilo CSR) para expandir cada nivel sin recorrer toda la red
+    hijos = np.argsort(padre, kind="stable")
+    hijos = hijos[padre[hijos] >= 0]
+    inicio = np.searchsorted(padre[hijos], np.arange(len(nodos)), side="left")
+    fin = np.searchsorted(padre[hijos], np.arange(len(nodos)), side="right")
+
+    niveles = []
+    frente = np.flatnonzero(padre < 0)
+    while len(frente):
+        niveles.append(frente)
+        cuenta = fin[frente] - inicio[frente]
+        # Posiciones de todos los hijos del frente: inicio de cada padre + desplazamiento 0..cuenta-1
+        desplazamiento = np.arange(cuenta.sum()) - np.repeat(np.cumsum(cuenta) - cuenta, cuenta)
+        frente = hijos[np.repeat(inicio[frente], cuenta) + desplazamiento]
+
+    if sum(len(n) for n in niveles) != len(nodos):
+        raise ValueError("La red no es radial: hay nodos en un ciclo o sin conexion con la acometida.")
+    nivel = np.empty(len(nodos), dtype=np.intp)
+    for k, nodos_nivel in enumerate(niveles):
+        nivel[nodos_nivel] = k
+    return {"ids": ids, "padre": padre, "niveles": niveles, "nivel": nivel}
+
+
+def acumular_hacia_abajo(red, valor_segmento):
+    # acumulado[i] = valor del segmento i + acumulado[padre]  (una operacion vectorizada por nivel)
+    acumulado = np.array(valor_segmento, dtype=float)
+    padre = red["padre"]
+    for nivel in red["niveles"][1:]:
+        acumulado[nivel] += acumulado[padre[nivel]]
+    return acumulado
+
+
+def interruptor_aguas_arriba(red, con_interruptor):
+    # arriba[i] = indice del interruptor mas cercano aguas arriba de i (el del padre, o el de su ancestro mas
+    # proximo si el padre no tiene), -1 si no hay ninguno. Se propaga desde la raiz, un nivel a la vez.
+    arriba = np.full(len(red["padre"]), -1, dtype=np.intp)
+    padre = red["padre"]
+    for nivel in red["niveles"][1:]:
+        p = padre[nivel]
+        arriba[nivel] = np.where(con_interruptor[p], p, arriba[p])
+    return arriba
+
+
+def sumar_hacia_arriba(red, valor_nodo):
+    # total[i] = valor propio + suma de los totales de sus hijos (de las hojas a la raiz)
+    total = np.array(valor_nodo, dtype=float)
+    padre = red["padre"]
+    for nivel in reversed(red["niveles"][1:]):
+        total += np.bincount(padre[nivel], weights=total[nivel], minlength=len(total))
+    return total
+
+
+def impedancia_fuente(fuente):
+    # Z del transformador referida al secundario: Z = (V² / S) * %Z / 100, repartida segun X/R
+    z = fuente["voltaje"]**2 / (fuente["kva"] * 1000.0) * fuente["z_pct"] / 100.0
+    r = z / np.sqrt(1.0 + fuente["x_r"]**2)
+    return r, r * fuente["x_r"]
+
+
+def corriente_falla(r_acum, x_acum, voltaje, trifasico, fuente):
+    # Icc = E / |Z_fuente + Z_conductores|, con E = V/√3 (3F) o V (1F, lazo ida y retorno en Z_conductores)
+    r_src, x_src = impedancia_fuente(fuente)
+    e = np.where(trifasico, np.asarray(voltaje, dtype=float) / 1.732, voltaje)
+    return e / np.hypot(r_src + r_acum, x_src + x_acum)
+
+
+def analizar_red(nodos, conductores=None):
+    # Todo lo que no depende de la fuente: cargas, caida acumulada e impedancia de conductores hasta cada nodo.
+    # conductores: tabla de calculos.tabla_conductores() (por defecto la historica)
+    conductores = conductores or CONDUCTORES_CEN
+    nodos = normalizar_red(nodos)
+    red = indexar_red(nodos)
+    idx_cal = indices_tabla(nodos["calibre"], conductores["calibres"], "Calibre")
+
+    voltaje = nodos["voltaje"].to_numpy(float)
+    trifasico = es_trifasico(nodos["sistema"])
+    carga_total = sumar_hacia_arriba(red, nodos["carga_va"].to_numpy(float))
+
+    # Caida del segmento padre -> nodo con la carga total que transporta (misma formula del Modulo 2)
+    longitud = np.where(red["padre"] >= 0, nodos["longitud_m"].to_numpy(float), 0.0)
+    caida_seg = caida_tension(carga_total, voltaje, longitud, idx_cal, nodos["fp"].to_numpy(float), np.where(trifasico, 10.0, 5.0), conductores)["caida_pct"]
+    caida_acum = acumular_hacia_abajo(red, caida_seg)
+
+    # Impedancia de los conductores desde la acometida (Ohm); los segmentos 1F cuentan ida y retorno
+    km = longitud / 1000.0 * np.where(trifasico, 1.0, 2.0)
+    r_acum = acumular_hacia_abajo(red, conductores["R"][idx_cal] * km)
+    x_acum = acumular_hacia_abajo(red, conductores["X"][idx_cal] * km)
+
+    resultado = nodos.assign(
+        carga_total_va=carga_total,
+        corriente_a=corriente_carga(carga_total, voltaje, trifasico),
+        caida_segmento_pct=caida_seg,
+        caida_acumulada_pct=caida_acum,
+        nivel=red["nivel"],
+        idx_padre=red["padre"],
+        r_acum_ohm=r_acum,
+        x_acum_ohm=x_acum,
+    )
+    resultado["cumple_caida_total"] = resultado["caida_acumulada_pct"] <= LIMITE_CAIDA_TOTAL
+    return resultado
+
+
+def cortocircuito_red(analisis, fuente=FUENTE_DEFECTO, conductores=None):
+    # Corriente de falla disponible en cada barra para una fuente dada (solo operaciones por columna,
+    # de modo que cambiar la fuente no repite el analisis de la red)
+    voltaje = analisis["voltaje"].to_numpy(float)
+    icc = corriente_falla(analisis["r_acum_ohm"].to_numpy(), analisis["x_acum_ohm"].to_numpy(), voltaje, es_trifasico(analisis["sistema"]), fuente)
+
+    # El conductor de cada segmento debe soportar la falla en su origen (barra del padre)
+    padre = analisis["idx_padre"].to_numpy()
+    es_raiz = padre < 0
+    icc_origen = np.where(es_raiz, icc, icc[np.maximum(padre, 0)])
+
+    # Nodos con interruptor (breaker_a > 0, instalado en el origen del segmento): el tiempo de despeje sale
+    # de su curva a la falla en el origen; sin interruptor se usa el t_despeje indicado
+    breaker = analisis["breaker_a"].to_numpy(float)
+    ajuste = analisis["ajuste_inst"].to_numpy(float)
+    con_interruptor = breaker > 0
+    t = analisis["t_despeje"].to_numpy(float).copy()
+    t[con_interruptor] = tiempo_despeje(breaker[con_interruptor], icc_origen[con_interruptor], ajuste[con_interruptor])
+    conductores = conductores or CONDUCTORES_CEN
+    termica = verificacion_termica(indices_tabla(analisis["calibre"], conductores["calibres"], "Calibre"), t, icc_origen, conductores)
+
+    # Selectividad con el interruptor mas cercano aguas arriba (un tablero sin interruptor no corta la cadena),
+    # hasta la falla en el origen del segmento. Los niveles se rearman desde la columna nivel del analisis.
+    nivel = analisis["nivel"].to_numpy()
+    orden = np.argsort(nivel, kind="stable")
+    niveles = np.split(orden, np.searchsorted(nivel[orden], np.arange(1, nivel.max(initial=0) + 1)))
+    arriba = interruptor_aguas_arriba({"padre": padre, "niveles": niveles}, con_interruptor)
+    par = con_interruptor & (arriba >= 0)
+    selectivo, i_perdida = np.ones(len(t), dtype=bool), np.full(len(t), np.nan)
+    if par.any():
+        sel = selectividad(breaker[arriba[par]], breaker[par], icc_origen[par], ajuste[arriba[par]], ajuste[par])
+        selectivo[par], i_perdida[par] = sel["selectivo"], sel["i_perdida_a"]
+
+    return analisis.assign(
+        icc_ka=icc / 1000,
+        icc_origen_ka=icc_origen / 1000,
+        t_despeje_s=t,
+        icc_max_cond_ka=termica["icc_max_a"] / 1000,
+        cumple_interrupcion=analisis["cap_int_ka"].to_numpy(float) * 1000 >= icc,
+        cumple_termico=termica["cumple_cortocircuito"] | es_raiz,
+        selectivo=selectivo,
+        i_perdida_selectividad_ka=i_perdida / 1000,
+    )
+
+
+def evaluar_red(nodos, fuente=FUENTE_DEFECTO, conductores=None):
+    return cortocircuito_red(analizar_red(nodos, conductores), fuente, conductores)
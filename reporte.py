@@ -0,0 +1,411 @@
+import collections
+import concurrent.futures
+import datetime
+import functools
+import os
+import re
+import tempfile
+
+from fpdf import FPDF
+
+from calculos import (
+    COLUMNAS_CUADRO, calculo_ampacidad, calculo_caida, calculo_canalizacion, calculo_cortocircuito, datos_calibre, db_temp_factors,
+    etiqueta_sistema, evaluar_cuadro, lista_sistemas, tabla_conductores,
+)
+from metricas import medir, registrar
+
+
+# =========================================================
+# GENERADOR PDF (Reporte Simplificado)
+# =========================================================
+def create_pdf(*args):
+    pdf = FPDF(unit='mm')
+    pdf.add_page()
+    secciones_circuito(pdf, *args)
+    # fpdf 1.7 devuelve el documento como str latin-1; se entregan los bytes reales del PDF
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def secciones_circuito(pdf, carga, vol, sist, cal_amp, temp_key, area_uni_mm2, amp, i_dis, v_dp, v_pct, tub, porc_tub, tubo_rec, i_cc_max_cond, i_cc_tablero, k_factor_utilizado, cal_v, R_v, X_v, fp_v, I_carga, amp_base_val_90, i_breaker_val, num_cond_portadores, calibre_t, distancia_metros, tiempo_despeje_seg, material_seleccionado, fc_agrup_val, amp_max_75_val, limite_ocupacion):
+    # Secciones 1 y 2 (2.1-2.4) de la memoria de un circuito, sobre la pagina actual de pdf
+    pdf.set_font("Arial", size=10)
+    
+    
+    # ----------------------------------------------------
+    # SECCION DE PARAMETROS DE ENTRADA
+    # ----------------------------------------------------
+    pdf.set_fill_color(220, 220, 220)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 7, "1. PARAMETROS DE ENTRADA", 1, 1, 'L', 1)
+    pdf.set_font("Arial", size=10)
+    
+    pdf.cell(0, 5, f"Carga (VA): {carga:.2f} | Voltaje (V): {vol:.1f} | Sistema: {sist}", ln=True)
+    pdf.cell(0, 5, f"Calibre Analizado: {cal_amp} | Longitud (m): {distancia_metros:.1f} | Factor K: {k_factor_utilizado:.1f}", ln=True)
+    pdf.cell(0, 5, f"Temp. Ambiente: {temp_key} | Cond. Activos: {num_cond_portadores:.0f}", ln=True)
+    pdf.cell(0, 5, f"Cap. Interrupcion Tablero (kA): {i_cc_tablero/1000:.1f} | T. Despeje (s): {tiempo_despeje_seg:.2f}", ln=True)
+    pdf.ln(5)
+
+    # ----------------------------------------------------
+    # RESUMEN DE RESULTADOS (PRINCIPAL)
+    # ----------------------------------------------------
+    pdf.set_fill_color(220, 220, 220)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 7, "2. RESUMEN DE RESULTADOS Y VERIFICACIONES", 1, 1, 'L', 1)
+    pdf.set_font("Arial", size=10)
+    
+    res_amp = "CUMPLE" if amp >= i_dis and i_breaker_val is not None else "FALLA"
+    res_v = "CUMPLE (<3%)" if v_pct <= 3 else "FALLA (>3%)"
+    res_t = "CUMPLE (<40%)" if porc_tub <= limite_ocupacion else "FALLA (>40%)"
+    res_cc = "CUMPLE" if i_cc_max_cond >= i_cc_tablero else "FALLA"
+
+    # Resultados Ampacidad
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 5, "2.1. AMPACIDAD Y PROTECCION (CEN 310.15)", 0, 1, 'L')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 5, f"I_Diseno (125%): {i_dis:.2f} A | Ampacidad Base (90C): {amp_base_val_90:.2f} A", ln=True)
+    pdf.cell(0, 5, f"FC Temp: {db_temp_factors[temp_key]:.2f} | FC Agrupamiento: {fc_agrup_val:.2f}", ln=True)
+    pdf.cell(0, 5, f"I_Max_Terminal (75C): {amp_max_75_val:.2f} A | I_Corregida (Final): {amp:.2f} A", ln=True)
+    pdf.cell(0, 5, f"Proteccion Sugerida: {'No disponible' if i_breaker_val is None else f'{i_breaker_val:.1f} A'} | Estado: {res_amp}", ln=True)
+    pdf.ln(2)
+
+    # Resultados Caída de Tensión
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 5, "2.2. CAIDA DE TENSION (CEN 210.19)", 0, 1, 'L')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 5, f"Caida de Tension: {v_dp:.2f} V ({v_pct:.2f}%)", ln=True)
+    pdf.cell(0, 5, f"Estado: {res_v}", ln=True)
+    pdf.ln(2)
+
+    # Resultados Canalizaciones
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 5, "2.3. CANALIZACIONES (CEN Cap. 9)", 0, 1, 'L')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 5, f"Tuberia Verificada: {tub} ({material_seleccionado}) | Ocupacion: {porc_tub:.2f}% (Max {limite_ocupacion}%)", ln=True)
+    pdf.cell(0, 5, f"Diametro Minimo Requerido: {tubo_rec}", ln=True)
+    pdf.cell(0, 5, f"Estado: {res_t}", ln=True)
+    pdf.ln(2)
+    
+    # Resultados Cortocircuito
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 5, "2.4. CORTOCIRCUITO (IEEE 242)", 0, 1, 'L')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 5, f"Icc Max. Soportada por {cal_amp}: {i_cc_max_cond/1000:.2f} kA", ln=True)
+    pdf.cell(0, 5, f"Icc del Tablero (Ref.): {i_cc_tablero/1000:.1f} kA", ln=True)
+    pdf.cell(0, 5, f"Estado: {res_cc}", ln=True)
+
+
+# Memoria de un circuito memoizada por sus argumentos (todos escalares/hashables):
+# el mismo reporte pedido de nuevo, por esta u otra sesion, no se vuelve a renderizar.
+@functools.lru_cache(maxsize=32)
+def memoria_pdf(*args):
+    with medir("pdf_generacion_s"):
+        pdf = create_pdf(*args)
+    registrar("pdf_tamano_bytes", len(pdf))
+    return pdf
+
+
+def argumentos_circuito(c, tubo=None, conductores=None):
+    # Argumentos de create_pdf para un circuito del Cuadro de Cargas (un solo calibre para los cuatro modulos,
+    # K segun el sistema). Si no se indica el diametro a verificar se usa el minimo recomendado.
+    # conductores: tabla de calculos.tabla_conductores() del cuadro (por defecto la historica)
+    c = {**c, "sistema": etiqueta_sistema(c["sistema"])}
+    k_factor = 10.0 if c["sistema"] == lista_sistemas[1] else 5.0
+    area_uni = datos_calibre(c["calibre"], conductores)["area"]
+    amp = calculo_ampacidad(c["carga_va"], c["voltaje"], c["sistema"], c["calibre"], c["n_conductores"], c["temperatura"], conductores)
+    caida = calculo_caida(c["carga_va"], c["voltaje"], c["longitud_m"], k_factor, c["fp"], c["calibre"], conductores)
+    canal = calculo_canalizacion(c["n_hilos"], area_uni, c["material"], tubo or "6\"")
+    if tubo is None:
+        tubo = canal["tubo_recomendado"] if canal["tubo_recomendado"] != "No disponible" else "6\""
+        canal = calculo_canalizacion(c["n_hilos"], area_uni, c["material"], tubo)
+    icc_a = c["icc_tablero_ka"] * 1000
+    cc = calculo_cortocircuito(c["calibre"], c["t_despeje"], icc_a, conductores)
+    return (
+        float(c["carga_va"]), float(c["voltaje"]), c["sistema"], c["calibre"], c["temperatura"], area_uni,
+        amp["amp_real"], amp["i_diseno"],
+        caida["v_drop"], caida["percent_drop"], tubo, canal["porc_verif"], canal["tubo_recomendado"],
+        cc["i_cc_max_permitida"], icc_a, k_factor,
+        c["calibre"], caida["R"], caida["X"], float(c["fp"]), amp["corriente_carga"], amp["amp_base_90"], amp["breaker_ideal"],
+        int(c["n_conductores"]), c["calibre"],
+        float(c["longitud_m"]), float(c["t_despeje"]), c["material"],
+        amp["fc_agrup"], amp["amp_max_75"], canal["limite"],
+    )
+
+
+# =========================================================
+# MEMORIA DE CALCULO DEL PROYECTO (varios tableros en un solo PDF)
+# =========================================================
+# Los tableros se evaluan uno a uno (evaluar_cuadro) y se reparten en tareas: una tabla resumen por tablero
+# y bloques de CIRCUITOS_POR_BLOQUE paginas de detalle. Cada tarea se renderiza en un FPDF propio (las
+# fuentes y el formato se reutilizan en todas sus paginas) y se escribe a un archivo temporal; con
+# trabajadores > 1 las tareas corren en un pool con una ventana acotada, como en lote.py. La portada se
+# renderiza al final, con los totales y la pagina de inicio de cada tablero, y va primero. Los archivos se
+# unen copiando sus objetos al PDF de salida de a uno (_concatenar_pdf), asi la memoria no crece con el
+# numero de circuitos.
+CIRCUITOS_POR_BLOQUE = 200
+EN_VUELO_POR_TRABAJADOR = 2
+# (titulo, columna de evaluar_cuadro, ancho mm, formato)
+COLUMNAS_RESUMEN = [
+    ("Circuito", "circuito", 24, "{}"), ("Carga VA", "carga_va", 17, "{:.0f}"), ("Sistema", "sistema", 25, "{}"),
+    ("Calibre", "calibre", 17, "{}"), ("I dis. A", "i_diseno_a", 14, "{:.1f}"), ("Amp. A", "amp_real_a", 14, "{:.1f}"),
+    ("Caida %", "caida_pct", 14, "{:.2f}"), ("Tubo min.", "tubo_min", 15, "{}"), ("Icc max kA", "icc_max_ka", 16, "{:.2f}"),
+    ("Amp.", "ok_ampacidad", 9, None), ("Caida", "ok_caida", 9, None), ("Canal.", "ok_canalizacion", 10, None),
+    ("Icc", "ok_cortocircuito", 8, None), ("Estado", "cumple_todo", 0, None),
+]
+
+
+def _latin1(texto):
+    # Las fuentes base de fpdf solo cubren latin-1 (nombres de circuito con otros caracteres -> '?')
+    return str(texto).encode("latin-1", "replace").decode("latin-1")
+
+
+class _DocumentoMemoria(FPDF):
+    def __init__(self, proyecto):
+        super().__init__(unit='mm')
+        self.set_auto_page_break(True, 15)
+        self.proyecto = _latin1(proyecto)
+        self.encabezado = ""
+
+    def header(self):
+        if not self.encabezado:
+            return
+        self.set_font("Arial", 'I', 8)
+        self.cell(0, 5, f"{self.proyecto} - {self.encabezado}", 'B', 1, 'R')
+        self.ln(3)
+
+
+def _titulo(pdf, texto):
+    pdf.set_fill_color(220, 220, 220)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 7, _latin1(texto), 1, 1, 'L', 1)
+
+
+def _cabecera_resumen(pdf):
+    pdf.set_font("Arial", 'B', 7)
+    for titulo, _, ancho, _ in COLUMNAS_RESUMEN:
+        pdf.cell(ancho, 5, titulo, 1, 0, 'C', 1)
+    pdf.ln()
+    pdf.set_font("Arial", size=7)
+
+
+def _pagina_resumen(pdf, tablero, filas):
+    pdf.encabezado = _latin1(f"Tablero {tablero}")
+    pdf.add_page(orientation='L')
+    _titulo(pdf, f"RESUMEN DEL TABLERO {tablero} ({len(filas)} circuitos)")
+    pdf.ln(2)
+    _cabecera_resumen(pdf)
+    for fila in filas:
+        if pdf.get_y() + 5 > pdf.page_break_trigger:
+            pdf.add_page(orientation='L')
+            _cabecera_resumen(pdf)
+        for _, columna, ancho, fmt in COLUMNAS_RESUMEN:
+            valor = fila[columna]
+            if fmt is None:
+                texto = ("CUMPLE" if valor else "FALLA") if columna == "cumple_todo" else ("Si" if valor else "No")
+            else:
+                texto = fmt.format(valor)
+            pdf.cell(ancho, 5, _latin1(texto), 1, 0, 'C')
+        pdf.ln()
+
+
+def _paginas_detalle(pdf, tablero, circuitos, conductores):
+    for c in circuitos:
+        pdf.encabezado = _latin1(f"Tablero {tablero} - Circuito {c['circuito']}")
+        pdf.add_page(orientation='P')
+        secciones_circuito(pdf, *argumentos_circuito(c, conductores=conductores))
+
+
+def renderizar_bloque(tarea, ruta):
+    # Corre en un proceso del pool: escribe la tarea a ruta y devuelve el numero de paginas
+    # (tabla = (material, aislamiento) del tablero: se arma la tabla de conductores en el proceso)
+    proyecto, tipo, tablero, filas, tabla = tarea
+    pdf = _DocumentoMemoria(proyecto)
+    if tipo == "resumen":
+        _pagina_resumen(pdf, tablero, filas)
+    else:
+        _paginas_detalle(pdf, tablero, filas, tabla_conductores(*tabla))
+    pdf.output(ruta, 'F')
+    return pdf.page_no()
+
+
+def _portada(proyecto, tableros, paginas_portada=1):
+    pdf = _DocumentoMemoria(proyecto)
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 18)
+    pdf.ln(30)
+    pdf.cell(0, 10, "MEMORIA DE CALCULO", 0, 1, 'C')
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 8, "Verificacion de Conductores segun CEN-2004 (FONDONORMA 200)", 0, 1, 'C')
+    pdf.ln(10)
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 8, pdf.proyecto, 0, 1, 'C')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 6, f"Fecha: {datetime.date.today():%d/%m/%Y}", 0, 1, 'C')
+    pdf.ln(15)
+
+    _titulo(pdf, "TABLEROS")
+    anchos = [50, 20, 16, 16, 16, 16, 20, 0]
+    pdf.set_font("Arial", 'B', 8)
+    for titulo, ancho in zip(["Tablero", "Circuitos", "F. Amp.", "F. Caida", "F. Canal.", "F. Icc", "Con Fallas", "Pagina"], anchos):
+        pdf.cell(ancho, 6, titulo, 1, 0, 'C', 1)
+    pdf.ln()
+    pdf.set_font("Arial", size=8)
+    total = collections.Counter()
+    for t in tableros:
+        valores = [t["circuitos"], t["fallas_ampacidad"], t["fallas_caida"], t["fallas_canalizacion"], t["fallas_cortocircuito"], t["fallas"]]
+        pdf.cell(anchos[0], 6, _latin1(t["tablero"]), 1, 0, 'L')
+        for v, ancho in zip(valores, anchos[1:]):
+            pdf.cell(ancho, 6, f"{v}", 1, 0, 'C')
+        pdf.cell(anchos[-1], 6, f"{t['pagina'] + paginas_portada}", 1, 1, 'C')
+        total.update({"circuitos": t["circuitos"], "fallas": t["fallas"]})
+    pdf.ln(4)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(0, 6, f"Total: {len(tableros)} tablero(s), {total['circuitos']} circuito(s), {total['fallas']} con al menos una falla", ln=True)
+    return pdf
+
+
+def _tareas_proyecto(proyecto, tableros, circuitos_por_bloque, resumen):
+    # Evalua cada tablero y emite sus tareas de renderizado; resumen recibe los totales por tablero.
+    # Cada tablero es (nombre, cuadro) o (nombre, cuadro, (material, aislamiento)); sin tabla se usa la historica.
+    for nombre, cuadro, *tabla in tableros:
+        tabla = tuple(tabla[0]) if tabla else ("CEN", "THHN")
+        resultado = evaluar_cuadro(cuadro, tabla_conductores(*tabla))
+        resumen.append({
+            "tablero": nombre, "circuitos": len(resultado),
+            "fallas_ampacidad": int((~resultado["ok_ampacidad"]).sum()), "fallas_caida": int((~resultado["ok_caida"]).sum()),
+            "fallas_canalizacion": int((~resultado["ok_canalizacion"]).sum()),
+            "fallas_cortocircuito": int((~resultado["ok_cortocircuito"]).sum()), "fallas": int((~resultado["cumple_todo"]).sum()),
+        })
+        yield proyecto, "resumen", nombre, resultado[[c for _, c, _, _ in COLUMNAS_RESUMEN]].to_dict("records"), tabla
+        entradas = resultado[list(COLUMNAS_CUADRO)]
+        for inicio in range(0, len(entradas), circuitos_por_bloque):
+            yield proyecto, "detalle", nombre, entradas.iloc[inicio:inicio + circuitos_por_bloque].to_dict("records"), tabla
+
+
+_REFERENCIA = re.compile(rb"(\d+) 0 R")
+_XREF = re.compile(rb"xref\n0 (\d+)\n0000000000 65535 f \n((?:\d{10} 00000 n \n)*)trailer\n")
+_SEPARADOR_FLUJO = b">>\nstream\n"
+
+
+def _objetos_fpdf(ruta, datos):
+    # Valida que el archivo tenga la forma que escribe fpdf 1.7.2 (la que asume _concatenar_pdf) y devuelve
+    # los objetos 1..n como bytes. Si la forma cambia (otra version de fpdf) falla en vez de escribir un PDF roto.
+    def exigir(condicion, que):
+        if not condicion:
+            raise ValueError(f"{ruta}: no tiene la estructura de fpdf 1.7.2 ({que})")
+
+    exigir(datos.startswith(b"%PDF-1.3\n"), "cabecera")
+    marca = datos.rfind(b"startxref\n")
+    exigir(marca >= 0, "startxref")
+    inicio_xref = int(datos[marca + 10:].split()[0])
+    tabla = _XREF.match(datos, inicio_xref)
+    exigir(tabla is not None, "tabla xref")
+    posiciones = [int(linea[:10]) for linea in tabla.group(2).splitlines()]
+    n = len(posiciones) # objetos 1..n, Info = n - 1, Catalog = n
+    exigir(n == int(tabla.group(1)) - 1 and n >= 4, "numero de objetos de la tabla xref")
+    # fpdf escribe la raiz /Pages despues de las paginas: cada objeto termina donde empieza el siguiente en el archivo
+    ordenadas = sorted(posiciones) + [inicio_xref]
+    siguiente = dict(zip(ordenadas, ordenadas[1:]))
+    objetos = []
+    for numero, posicion in enumerate(posiciones, 1):
+        objeto = datos[posicion:siguiente[posicion]]
+        exigir(objeto.startswith(b"%d 0 obj\n" % numero) and objeto.endswith(b"endobj\n"), f"objeto {numero}")
+        exigir(b"\nstream\n" not in objeto or _SEPARADOR_FLUJO in objeto, f"flujo del objeto {numero}")
+        objetos.append(objeto)
+    exigir(objetos[0].startswith(b"1 0 obj\n<</Type /Pages\n") and b"/MediaBox [" in objetos[0], "raiz /Pages")
+    exigir(b"\n/Producer " in objetos[-2], "Info")
+    exigir(b"\n/Type /Catalog\n" in objetos[-1], "Catalog")
+    for numero, objeto in enumerate(objetos[1:-2], 2):
+        for m in _REFERENCIA.finditer(objeto.partition(_SEPARADOR_FLUJO)[0]):
+            exigir(1 <= int(m.group(1)) <= n - 2, f"referencia {m.group()} en el objeto {numero}")
+    return objetos
+
+
+def _concatenar_pdf(rutas, salida):
+    # Une PDFs de fpdf 1.7.2 sin cargarlos todos: se lee un archivo a la vez, sus objetos se renumeran y se
+    # escriben directo a la salida. De cada archivo se descartan su raiz /Pages (1), Info y Catalog (los dos
+    # ultimos); las paginas pasan a colgar de una sola raiz /Pages que se escribe al final.
+    propio = isinstance(salida, (str, os.PathLike))
+    destino = open(salida, "wb") if propio else salida
+    try:
+        escrito = [0]
+        def escribir(datos):
+            destino.write(datos)
+            escrito[0] += len(datos)
+
+        escribir(b"%PDF-1.3\n")
+        offsets, kids, media_box = [None], [], None # offsets[i] = objeto i + 1; el 1 (raiz /Pages) va al final
+        for ruta in rutas:
+            with open(ruta, "rb") as f:
+                objetos = _objetos_fpdf(ruta, f.read())
+            numeros = {1: 1}
+            for viejo in range(2, len(objetos) - 1):
+                numeros[viejo] = len(offsets) + viejo - 1
+            media_box = media_box or re.search(rb"/MediaBox \[[^\]]*\]", objetos[0]).group()
+            for viejo in range(2, len(objetos) - 1):
+                cabecera, separador, flujo = objetos[viejo - 1].partition(_SEPARADOR_FLUJO)
+                cabecera = _REFERENCIA.sub(lambda m: b"%d 0 R" % numeros[int(m.group(1))], cabecera.split(b" 0 obj", 1)[1])
+                if cabecera.startswith(b"\n<</Type /Page\n"):
+                    kids.append(numeros[viejo])
+                offsets.append(escrito[0])
+                escribir(b"%d 0 obj" % numeros[viejo] + cabecera + separador + flujo)
+
+        offsets[0] = escrito[0]
+        escribir(b"1 0 obj\n<</Type /Pages\n/Kids [%s]\n/Count %d\n%s\n>>\nendobj\n"
+                 % (b" ".join(b"%d 0 R" % k for k in kids), len(kids), media_box))
+        offsets.append(escrito[0])
+        catalogo = len(offsets)
+        escribir(b"%d 0 obj\n<</Type /Catalog\n/Pages 1 0 R>>\nendobj\n" % catalogo)
+        inicio_xref = escrito[0]
+        escribir(b"xref\n0 %d\n0000000000 65535 f \n" % (catalogo + 1))
+        for offset in offsets:
+            escribir(b"%010d 00000 n \n" % offset)
+        escribir(b"trailer\n<</Size %d\n/Root %d 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (catalogo + 1, catalogo, inicio_xref))
+    finally:
+        if propio:
+            destino.close()
+    return len(kids)
+
+
+def memoria_proyecto(tableros, salida, proyecto="Proyecto", trabajadores=1, circuitos_por_bloque=CIRCUITOS_POR_BLOQUE):
+    # tableros: iterable de (nombre, cuadro de cargas[, (material, aislamiento)]), puede ser un generador que
+    # los cargue de a uno.
+    # salida: ruta o archivo binario abierto. Devuelve el resumen por tablero.
+    resumen = []
+    tareas = _tareas_proyecto(proyecto, tableros, circuitos_por_bloque, resumen)
+    with tempfile.TemporaryDirectory(prefix="memoria_cen_") as carpeta, medir("pdf_memoria_proyecto_s"):
+        rutas, paginas = [], []
+        primera_tarea = [] # indice de la tarea "resumen" de cada tablero
+
+        def nueva_ruta(tarea=None):
+            if tarea is not None and tarea[1] == "resumen":
+                primera_tarea.append(len(rutas))
+            rutas.append(os.path.join(carpeta, f"{len(rutas):06d}.pdf"))
+            return rutas[-1]
+
+        if trabajadores <= 1:
+            for tarea in tareas:
+                paginas.append(renderizar_bloque(tarea, nueva_ruta(tarea)))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=trabajadores) as pool:
+                en_vuelo = collections.deque()
+                for tarea in tareas:
+                    en_vuelo.append(pool.submit(renderizar_bloque, tarea, nueva_ruta(tarea)))
+                    if len(en_vuelo) >= trabajadores * EN_VUELO_POR_TRABAJADOR:
+                        paginas.append(en_vuelo.popleft().result())
+                while en_vuelo:
+                    paginas.append(en_vuelo.popleft().result())
+
+        # Pagina (sin contar la portada) en que empieza cada tablero
+        for t, i in zip(resumen, primera_tarea):
+            t["pagina"] = 1 + sum(paginas[:i])
+
+        # La portada puede ocupar mas de una pagina con muchos tableros: se re-renderiza con el desplazamiento real
+        portada = _portada(proyecto, resumen)
+        if portada.page_no() > 1:
+            portada = _portada(proyecto, resumen, portada.page_no())
+        nueva_ruta()
+        portada.output(rutas[-1], 'F')
+
+        _concatenar_pdf(rutas[-1:] + rutas[:-1], salida)
+    registrar("pdf_memoria_paginas", sum(paginas) + portada.page_no())
+    return resumen
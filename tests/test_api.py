@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+from api import Servidor
+
+
+async def conversar(*peticiones):
+    # Envia las peticiones por una sola conexion y devuelve las respuestas (estado, cabeceras, cuerpo)
+    listo = asyncio.get_running_loop().create_future()
+    servidor = asyncio.create_task(Servidor(procesos_pdf=1).servir("127.0.0.1", 0, listo.set_result))
+    puerto = (await listo).sockets[0].getsockname()[1]
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    respuestas = []
+    try:
+        for peticion in peticiones:
+            escritor.write(peticion)
+            linea = await lector.readline()
+            if not linea:
+                break
+            cabeceras = {}
+            while (cab := await lector.readline()) != b"\r\n":
+                nombre, _, valor = cab.decode("latin-1").partition(":")
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            cuerpo = await lector.readexactly(int(cabeceras["content-length"]))
+            respuestas.append((int(linea.split()[1]), cabeceras, json.loads(cuerpo)))
+    finally:
+        escritor.close()
+        servidor.cancel()
+        await asyncio.gather(servidor, return_exceptions=True)
+    return respuestas
+
+
+def peticion(cuerpo, largo=None):
+    cuerpo = json.dumps(cuerpo).encode()
+    largo = len(cuerpo) if largo is None else largo
+    return f"POST /voltage-drop HTTP/1.1\r\nContent-Length: {largo}\r\n\r\n".encode() + cuerpo
+
+
+CAIDA = {"carga_va": 1260, "voltaje": 120, "distancia": 20, "k_factor": 2, "fp": 0.9, "calibre": "12 AWG"}
+
+
+def test_conexion_persistente():
+    respuestas = asyncio.run(conversar(peticion(CAIDA), peticion(CAIDA)))
+    assert [r[0] for r in respuestas] == [200, 200]
+    assert respuestas[0][1]["connection"] == "keep-alive"
+    assert respuestas[0][2] == respuestas[1][2]
+
+
+@pytest.mark.parametrize("largo", ["abc", "-5", "1e3", ""])
+def test_content_length_invalido_cierra_la_conexion(largo):
+    respuestas = asyncio.run(conversar(peticion(CAIDA, largo), peticion(CAIDA)))
+    # La segunda peticion no se atiende: el servidor no puede saber donde empieza
+    assert len(respuestas) == 1
+    estado, cabeceras, cuerpo = respuestas[0]
+    assert estado == 400 and cabeceras["connection"] == "close"
+    assert "Content-Length" in cuerpo["error"]
+
+
+def test_error_de_datos_mantiene_la_conexion():
+    respuestas = asyncio.run(conversar(peticion({**CAIDA, "calibre": "99 AWG"}), peticion(CAIDA)))
+    assert [r[0] for r in respuestas] == [400, 200]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import red
+from coordinacion import TOLERANCIA_AJUSTE, indice_interruptor, selectividad, tiempos_disparo
+
+
+def test_ajuste_instantaneo_usa_banda_de_tolerancia():
+    ajuste, in_a = 5.0, 100.0
+    bajo, alto = ajuste * (1 - TOLERANCIA_AJUSTE) * in_a, ajuste * (1 + TOLERANCIA_AJUSTE) * in_a
+    t_min, t_max = tiempos_disparo(in_a, [bajo * 0.99, bajo * 1.01, alto * 0.99, alto * 1.01], ajuste)
+    instantaneo_min, instantaneo_max = t_min[1], t_max[3]
+    # Bajo la banda solo dispara el termico; dentro de ella la curva minima ya es instantanea
+    assert t_min[0] > 1.0 and instantaneo_min < 0.1 and t_min[2] == instantaneo_min
+    # La curva maxima solo pasa a instantanea sobre el borde superior de la banda
+    assert t_max[2] > 1.0 and instantaneo_max < 0.1
+
+
+def test_sin_ajuste_usa_banda_del_catalogo():
+    # 6.5 In queda bajo la banda instantanea del catalogo (7..13 In) pero sobre la ajustada a 5 In (4..6 In)
+    t_min, t_max = tiempos_disparo(100, 650.0)
+    assert t_min > 1.0 and t_max > 1.0
+    t_min, t_max = tiempos_disparo(100, 650.0, 5.0)
+    assert t_min < 0.1 and t_max < 0.1
+
+
+def test_interruptor_no_reconocido():
+    with pytest.raises(ValueError, match="33 A"):
+        indice_interruptor([20, 33])
+
+
+def test_selectividad_hasta_la_falla():
+    # 20 A bajo 100 A: selectivos mientras la falla no llegue al instantaneo del de 100 A (7 In)
+    sel = selectividad([100, 100, 100], [20, 20, 100], [500.0, 5000.0, 5000.0])
+    assert sel["selectivo"].tolist() == [True, False, False]
+    assert np.isnan(sel["i_perdida_a"][0])
+    assert 700.0 <= sel["i_perdida_a"][1] < 800.0
+
+
+def red_con_tablero_sin_interruptor(**cambios):
+    nodos = pd.DataFrame([
+        {"id": "AC", "padre": "", "tipo": "acometida"},
+        {"id": "TP", "padre": "AC", "tipo": "tablero", "longitud_m": 10.0, "carga_va": 20000.0, "breaker_a": 100.0},
+        {"id": "TS", "padre": "TP", "tipo": "tablero", "longitud_m": 10.0, "carga_va": 10000.0, "t_despeje": 0.2},
+        {"id": "C1", "padre": "TS", "longitud_m": 5.0, "carga_va": 5000.0, "breaker_a": 100.0},
+        {"id": "C2", "padre": "TS", "longitud_m": 5.0, "carga_va": 1000.0, "calibre": "12 AWG",
+         "sistema": "Monofásico (1F)", "voltaje": 120.0, "breaker_a": 20.0},
+    ])
+    for columna, valor in cambios.items():
+        nodos[columna] = valor
+    return red.normalizar_red(nodos)
+
+
+def test_interruptor_aguas_arriba_salta_nodos_sin_interruptor():
+    nodos = red_con_tablero_sin_interruptor()
+    arbol = red.indexar_red(nodos)
+    arriba = red.interruptor_aguas_arriba(arbol, nodos["breaker_a"].to_numpy() > 0)
+    tp = arbol["ids"].get_loc("TP")
+    assert arriba.tolist() == [-1, -1, tp, tp, tp]
+
+
+def test_selectividad_a_traves_de_tablero_sin_interruptor():
+    r = red.evaluar_red(red_con_tablero_sin_interruptor()).set_index("id")
+    # C1 y C2 se comparan con el 100 A de TP aunque TS no tenga interruptor
+    assert not r.loc["C1", "selectivo"] and not r.loc["C2", "selectivo"]
+    assert r.loc[["AC", "TP", "TS"], "selectivo"].all()
+    # TS sin interruptor conserva el t_despeje indicado
+    assert r.loc["TS", "t_despeje_s"] == 0.2
+
+
+def test_red_sin_interruptores_conserva_t_despeje():
+    r = red.evaluar_red(red_con_tablero_sin_interruptor(breaker_a=0.0, t_despeje=0.3))
+    assert (r["t_despeje_s"] == 0.3).all()
+    assert r["selectivo"].all() and r["i_perdida_selectividad_ka"].isna().all()
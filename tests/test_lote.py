@@ -0,0 +1,30 @@
+import importlib.util
+
+import pandas as pd
+import pytest
+
+import lote
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    ruta = tmp_path / "circuitos.csv"
+    pd.DataFrame({"circuito": [f"C{i}" for i in range(5)], "carga_va": [1260.0, 2000.0, 3000.0, 500.0, 9000.0]}).to_csv(ruta, index=False)
+    return ruta
+
+
+def test_procesar_por_bloques_conserva_el_orden(tmp_path, entrada):
+    salida = tmp_path / "resultados.csv"
+    totales = lote.procesar(entrada, salida, trabajadores=1, tamano_bloque=2)
+    resultado = pd.read_csv(salida)
+    assert totales["bloques"] == 3 and totales["escritos"] == 5
+    assert resultado["circuito"].tolist() == [f"C{i}" for i in range(5)]
+
+
+def test_parquet_sin_pyarrow_avisa_antes_de_escribir(tmp_path, entrada, monkeypatch, capsys):
+    buscar = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda nombre, *a: None if nombre == "pyarrow" else buscar(nombre, *a))
+    salida = tmp_path / "resultados.parquet"
+    assert lote.main([str(entrada), str(salida), "--trabajadores", "1"]) == 2
+    assert "requiere pyarrow" in capsys.readouterr().err
+    assert not salida.exists()
@@ -0,0 +1,34 @@
+import pytest
+
+import metricas
+
+
+@pytest.fixture(autouse=True)
+def activas(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVO", True)
+    monkeypatch.setattr(metricas, "_muestras", type(metricas._muestras)(metricas._muestras.default_factory))
+
+
+def test_corridas_atribuidas_al_widget_que_las_disparo():
+    estado = {"a": 1, "b": 1, "c": 1}
+    assert metricas.cambio_detectado(estado, ["a", "b", "c"]) == "inicio"
+    # Re-ejecucion parcial de un fragmento que depende de b
+    estado["b"] = 2
+    assert metricas.refrescar_previos(estado, ["b"]) == "b"
+    # La corrida completa siguiente se atribuye a c, no al b que ya atendio el fragmento
+    estado["c"] = 2
+    assert metricas.cambio_detectado(estado, ["a", "b", "c"]) == "c"
+    assert metricas.cambio_detectado(estado, ["a", "b", "c"]) == "ninguno"
+
+
+def test_refrescar_antes_de_la_primera_corrida():
+    assert metricas.refrescar_previos({"a": 1}, ["a"]) == "inicio"
+
+
+def test_medir_no_registra_si_el_bloque_falla():
+    with metricas.medir("bloque_s", widget="a"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metricas.medir("bloque_s", widget="a"):
+            raise RuntimeError
+    assert len(metricas.series()[("bloque_s", (("widget", "a"),))]) == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+import montecarlo
+from calculos import db_temp_factors, normalizar_cuadro
+
+INCERTIDUMBRE = {**montecarlo.INCERTIDUMBRE_DEFECTO, "temperatura_c": ("uniforme", 20.0, 52.0)}
+
+
+def circuito():
+    return normalizar_cuadro(pd.DataFrame({"circuito": ["C1"], "carga_va": [1800.0], "calibre": ["10 AWG"]})).to_dict("records")[0]
+
+
+def test_bandas_de_temperatura_del_catalogo():
+    factores = list(db_temp_factors.values())
+    fc = montecarlo.factor_temperatura(np.array([10.0, 25.0, 25.5, 30.0, 48.0, 60.0]))
+    assert fc.tolist() == [factores[0], factores[0], factores[1], factores[1], factores[5], factores[5]]
+
+
+def test_misma_semilla_mismo_resultado():
+    a = montecarlo.simular_circuito(circuito(), INCERTIDUMBRE, 50_000, 7, tamano_bloque=7_000)
+    b = montecarlo.simular_circuito(circuito(), INCERTIDUMBRE, 50_000, 7, tamano_bloque=7_000)
+    assert a == b and a["muestras"] == 50_000
+
+
+def test_percentiles_con_submuestra_acotada():
+    completo = montecarlo.simular_circuito(circuito(), INCERTIDUMBRE, 60_000, 3, tamano_bloque=7_000)
+    acotado = montecarlo.simular_circuito(circuito(), INCERTIDUMBRE, 60_000, 3, tamano_bloque=7_000, muestras_percentiles=20_000)
+    # Las probabilidades cuentan todas las muestras; los percentiles salen de las primeras 20 000
+    for clave in ("p_falla_ampacidad", "p_falla_caida", "p_falla_cortocircuito", "p_falla_alguna"):
+        assert acotado[clave] == completo[clave]
+    assert abs(acotado["caida_pct_p50"] / completo["caida_pct_p50"] - 1) < 0.01
+    assert abs(acotado["margen_amp_a_p95"] / completo["margen_amp_a_p95"] - 1) < 0.02
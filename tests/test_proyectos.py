@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+import proyectos
+from calculos import evaluar_cuadro, normalizar_cuadro
+
+
+@pytest.fixture
+def con(tmp_path):
+    with proyectos.conexion(tmp_path / "proyectos.db") as con:
+        yield con
+
+
+def cuadro(n=4):
+    return normalizar_cuadro(pd.DataFrame({
+        "circuito": [f"C{i}" for i in range(1, n + 1)],
+        "carga_va": [1260.0 + 500 * i for i in range(n)],
+    }))
+
+
+def test_guardar_revalida_solo_las_filas_cambiadas(con):
+    original = cuadro()
+    assert proyectos.guardar_tablero(con, "P", "TP", original) == 4
+    assert proyectos.guardar_tablero(con, "P", "TP", original) == 0
+
+    editado = original.copy()
+    editado.loc[1, "carga_va"] = 3000.0
+    editado.loc[3, "longitud_m"] = 60.0
+    assert proyectos.guardar_tablero(con, "P", "TP", editado) == 2
+
+    # Lo almacenado coincide con evaluar todo el cuadro desde cero
+    guardado = proyectos.cargar_tablero(con, "P", "TP")
+    esperado = evaluar_cuadro(editado)
+    for columna in ("caida_pct", "ok_caida", "ok_ampacidad", "cumple_todo", "calibre_min"):
+        assert guardado[columna].tolist() == esperado[columna].tolist()
+
+
+def test_guardar_borra_filas_quitadas_y_agrega_nuevas(con):
+    proyectos.guardar_tablero(con, "P", "TP", cuadro(4))
+    assert proyectos.guardar_tablero(con, "P", "TP", cuadro(5).iloc[2:]) == 1
+    assert proyectos.cargar_tablero(con, "P", "TP")["circuito"].tolist() == ["C3", "C4", "C5"]
+
+
+def test_otra_tabla_de_conductores_revalida_todo(con):
+    proyectos.guardar_tablero(con, "P", "TP", cuadro())
+    assert proyectos.tabla_tablero(con, "P", "TP") == ("CEN", "THHN")
+    assert proyectos.guardar_tablero(con, "P", "TP", cuadro(), tabla=("Cu", "XHHW")) == 4
+    assert proyectos.tabla_tablero(con, "P", "TP") == ("Cu", "XHHW")
+    # Sin tabla se conserva la guardada
+    assert proyectos.guardar_tablero(con, "P", "TP", cuadro()) == 0
@@ -0,0 +1,42 @@
+import io
+import re
+
+import pandas as pd
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from calculos import normalizar_cuadro
+from reporte import _concatenar_pdf, memoria_proyecto
+
+
+def cuadro(n, prefijo):
+    return normalizar_cuadro(pd.DataFrame({
+        "circuito": [f"{prefijo}{i}" for i in range(1, n + 1)],
+        "carga_va": [1260.0 + 500 * i for i in range(n)],
+    }))
+
+
+@pytest.mark.parametrize("trabajadores", [1, 2])
+def test_memoria_se_lee_con_lector_estricto(tmp_path, trabajadores):
+    ruta = tmp_path / "memoria.pdf"
+    tableros = [("TA", cuadro(5, "A")), ("TB", cuadro(3, "B")), ("TC", cuadro(1, "C"))]
+    resumen = memoria_proyecto(tableros, ruta, "Prueba", trabajadores=trabajadores, circuitos_por_bloque=2)
+
+    lector = PdfReader(ruta, strict=True)
+    # portada + por tablero: una pagina de resumen y una por circuito
+    assert len(lector.pages) == 1 + sum(1 + t["circuitos"] for t in resumen)
+    portada = lector.pages[0].extract_text()
+    for t in resumen:
+        # el numero de pagina de la portada apunta al resumen de ese tablero
+        pagina = int(re.search(rf"^{t['tablero']} .* (\d+)$", portada, re.M).group(1))
+        assert f"RESUMEN DEL TABLERO {t['tablero']}" in lector.pages[pagina - 1].extract_text()
+        assert f"Circuito {t['tablero'][1]}1" in lector.pages[pagina].extract_text()
+
+
+def test_concatenar_rechaza_pdf_que_no_es_de_fpdf(tmp_path):
+    escritor = PdfWriter()
+    escritor.add_blank_page(100, 100)
+    ruta = tmp_path / "otro.pdf"
+    escritor.write(ruta)
+    with pytest.raises(ValueError, match="fpdf 1.7.2"):
+        _concatenar_pdf([ruta], io.BytesIO())